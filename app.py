@@ -1,12 +1,16 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from datetime import datetime, date
+from collections import deque
+from datetime import datetime, date, timedelta
+import hashlib
 import json
-from typing import Dict, List, Tuple, Optional, Any
+import logging
+import os
+import re
+import time
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Any, Callable
 
 # ==================== Configuration ====================
 st.set_page_config(
@@ -16,10 +20,43 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# ==================== Démarrage ====================
+# Streamlit re-executes this script on every interaction, so anything that should
+# only be built once per process lives behind st.cache_resource.
+COLD_START_BUDGET_MS = float(os.environ.get('NBA_DRAFT_COLD_START_BUDGET_MS', 2500))
+SCRIPT_RUN_STARTED = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+@st.cache_resource
+def get_startup_clock() -> Dict[str, Optional[float]]:
+    """Process-wide record of the first script run, used for the cold-start budget"""
+    # Only executed on the first script run of the process
+    return {'process_start': SCRIPT_RUN_STARTED, 'first_paint_ms': None}
+
+def record_first_paint() -> Dict[str, Optional[float]]:
+    """Record time-to-first-paint once per process and return the startup timings"""
+    clock = get_startup_clock()
+    if clock['first_paint_ms'] is None:
+        clock['first_paint_ms'] = (time.perf_counter() - clock['process_start']) * 1000
+        if clock['first_paint_ms'] > COLD_START_BUDGET_MS:
+            logger.warning("Cold start took %.0f ms (budget %.0f ms)",
+                           clock['first_paint_ms'], COLD_START_BUDGET_MS)
+    return {
+        'first_paint_ms': clock['first_paint_ms'],
+        'rerun_ms': (time.perf_counter() - SCRIPT_RUN_STARTED) * 1000,
+        'budget_ms': COLD_START_BUDGET_MS
+    }
+
 # ==================== Styles CSS ====================
 def inject_custom_css():
     """Inject custom CSS for styling"""
-    st.markdown("""<style>
+    st.markdown(get_custom_css(), unsafe_allow_html=True)
+
+@st.cache_resource
+def get_custom_css() -> str:
+    """Build the custom stylesheet once per process"""
+    return """<style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
         
         .main { font-family: 'Inter', sans-serif; }
@@ -92,7 +129,7 @@ def inject_custom_css():
             font-size: 0.8rem;
             color: #666;
         }
-    </style>""", unsafe_allow_html=True)
+    </style>"""
 
 # ==================== Utilitaires ====================
 def safe_numeric(value: Any, default: float = 0.0) -> float:
@@ -113,33 +150,18 @@ def safe_string(value: Any, default: str = 'N/A') -> str:
     except (ValueError, TypeError, AttributeError):
         return default
 
-def format_height(height_decimal: float) -> str:
-    """Convert decimal height to feet'inches format"""
-    if height_decimal == 0:
+def format_height(height_inches: float) -> str:
+    """Convert a length in inches to feet'inches format"""
+    if not height_inches or pd.isna(height_inches):
         return "N/A"
-    feet = int(height_decimal)
-    inches = int((height_decimal - feet) * 12)
-    return f"{feet}'{inches}\""
+    feet, inches = divmod(round(height_inches * 4) / 4, 12)
+    return f"{int(feet)}'{inches:g}\""
  
 def calculate_draft_grade_average(df: pd.DataFrame) -> str:
     """Calculate average draft grade from letter grades"""
     
     # Mapping des grades vers des valeurs numériques
-    grade_mapping = {
-        'A+': 4.3,
-        'A': 4.0,
-        'A-': 3.7,
-        'B+': 3.3,
-        'B': 3.0,
-        'B-': 2.7,
-        'C+': 2.3,
-        'C': 2.0,
-        'C-': 1.7,
-        'D+': 1.3,
-        'D': 1.0,
-        'D-': 0.7,
-        'F': 0.0
-    }
+    grade_mapping = SCOUT_GRADE_POINTS
     
     # Mapping inverse pour reconvertir en lettres
     reverse_mapping = {
@@ -170,187 +192,120 @@ def calculate_draft_grade_average(df: pd.DataFrame) -> str:
     
     return "B"  # Grade par défaut
 
+# ==================== Cache des figures ====================
+FIGURE_CACHE_MAX_ENTRIES = 128
+
+def get_dataset_version(df: pd.DataFrame) -> str:
+    """Return the content hash identifying the loaded dataset"""
+    # load_data() stamps the version once; frames derived from it inherit the stamp
+    version = df.attrs.get('dataset_version')
+    if version:
+        return version
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values.tobytes())
+    digest.update(','.join(map(str, df.columns)).encode())
+    return digest.hexdigest()[:16]
+
+@st.cache_data(max_entries=FIGURE_CACHE_MAX_ENTRIES, show_spinner=False)
+def _build_figure_json(chart_id: str, params_key: str, dataset_version: str,
+                       _builder: Callable[[], Any]) -> str:
+    """Build and serialize a figure, cached on (chart id, parameters, dataset version)"""
+    return _builder().to_json()
+
+def render_cached_figure(chart_id: str, params: Dict[str, Any], dataset_version: str,
+                         builder: Callable[[], Any], **chart_kwargs):
+    """Render a Plotly figure, rebuilding it only when its inputs change"""
+    params_key = json.dumps(params, sort_keys=True, default=str)
+    fig_json = _build_figure_json(chart_id, params_key, dataset_version, builder)
+    st.plotly_chart(json.loads(fig_json), **chart_kwargs)
+
+def get_index_key(df: pd.DataFrame) -> str:
+    """Short key identifying which rows of the dataset a view is showing"""
+    return hashlib.sha1(np.asarray(df.index).tobytes()).hexdigest()[:16]
+
+# ==================== Données de référence ====================
+REFERENCE_DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'reference_data')
+REFERENCE_MANIFEST = os.path.join(REFERENCE_DATA_DIR, 'manifest.json')
+
+def freeze_reference(value: Any) -> Any:
+    """Recursively convert parsed JSON into read-only mappings and tuples"""
+    if isinstance(value, dict):
+        # JSON object keys are always strings; restore numeric keys (draft years, ages)
+        return MappingProxyType({
+            (int(key) if key.isdigit() else key): freeze_reference(item)
+            for key, item in value.items()
+        })
+    if isinstance(value, list):
+        return tuple(freeze_reference(item) for item in value)
+    return value
+
+@st.cache_resource(max_entries=1)
+def _load_reference_registry(manifest_stamp: int) -> MappingProxyType:
+    """Load every reference file listed in the manifest into frozen, shared structures"""
+    with open(REFERENCE_MANIFEST, encoding='utf-8') as f:
+        manifest = json.load(f)
+    
+    datasets = {}
+    for name, filename in manifest['files'].items():
+        with open(os.path.join(REFERENCE_DATA_DIR, filename), encoding='utf-8') as f:
+            datasets[name] = freeze_reference(json.load(f))
+    
+    return MappingProxyType({
+        'version': str(manifest['version']),
+        'datasets': MappingProxyType(datasets)
+    })
+
+def get_reference_registry() -> MappingProxyType:
+    """Return the process-wide registry, reloading it when the manifest changes on disk"""
+    return _load_reference_registry(os.stat(REFERENCE_MANIFEST).st_mtime_ns)
+
+def get_reference_data(name: str) -> Any:
+    """Return one frozen reference dataset by name"""
+    return get_reference_registry()['datasets'][name]
+
+def get_reference_version() -> str:
+    """Version of the reference data, for use in cache keys"""
+    return get_reference_registry()['version']
+
 # ==================== Constantes ====================
-NBA_TEAMS_ANALYSIS = {
-    # Atlantic Division
-    'Boston Celtics': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.4, 'SF': 0.2, 'PF': 0.4, 'C': 0.6},
-        'skill_needs': {'scoring': 0.4, 'shooting': 0.5, 'playmaking': 0.4, 'defense': 0.5, 'rebounding': 0.5},
-        'team_context': 'Championship team looking for depth'
-    },
-    'Brooklyn Nets': {
-        'positional_needs': {'PG': 0.5, 'SG': 0.6, 'SF': 0.8, 'PF': 0.4, 'C': 0.5},
-        'skill_needs': {'scoring': 0.8, 'shooting': 0.7, 'playmaking': 0.5, 'defense': 0.6, 'rebounding': 0.4},
-        'team_context': 'Rebuilding with focus on young talent'
-    },
-    'New York Knicks': {
-        'positional_needs': {'PG': 0.5, 'SG': 0.4, 'SF': 0.6, 'PF': 0.3, 'C': 0.5},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.6, 'defense': 0.6, 'rebounding': 0.4},
-        'team_context': 'Looking for versatile contributors'
-    },
-    'Philadelphia 76ers': {
-        'positional_needs': {'PG': 0.8, 'SG': 0.6, 'SF': 0.4, 'PF': 0.3, 'C': 0.2},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.8, 'playmaking': 0.9, 'defense': 0.5, 'rebounding': 0.3},
-        'team_context': 'Need playmaking and shooting around stars'
-    },
-    'Toronto Raptors': {
-        'positional_needs': {'PG': 0.6, 'SG': 0.5, 'SF': 0.4, 'PF': 0.7, 'C': 0.3},
-        'skill_needs': {'scoring': 0.7, 'shooting': 0.6, 'playmaking': 0.6, 'defense': 0.7, 'rebounding': 0.5},
-        'team_context': 'Young core needs complementary pieces'
-    },
-    # Central Division
-    'Chicago Bulls': {
-        'positional_needs': {'PG': 0.7, 'SG': 0.3, 'SF': 0.6, 'PF': 0.5, 'C': 0.4},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.8, 'playmaking': 0.8, 'defense': 0.5, 'rebounding': 0.4},
-        'team_context': 'Need floor general and outside shooting'
-    },
-    'Cleveland Cavaliers': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.6, 'SF': 0.7, 'PF': 0.5, 'C': 0.4},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.4, 'defense': 0.6, 'rebounding': 0.4},
-        'team_context': 'Need wing depth and perimeter shooting'
-    },
-    'Detroit Pistons': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.8, 'SF': 0.7, 'PF': 0.3, 'C': 0.4},
-        'skill_needs': {'scoring': 0.8, 'shooting': 0.9, 'playmaking': 0.4, 'defense': 0.6, 'rebounding': 0.3},
-        'team_context': 'Need perimeter scoring and shooting'
-    },
-    'Indiana Pacers': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.5, 'SF': 0.6, 'PF': 0.4, 'C': 0.7},
-        'skill_needs': {'scoring': 0.5, 'shooting': 0.6, 'playmaking': 0.4, 'defense': 0.7, 'rebounding': 0.8},
-        'team_context': 'Need interior defense and rebounding'
-    },
-    'Milwaukee Bucks': {
-        'positional_needs': {'PG': 0.7, 'SG': 0.5, 'SF': 0.3, 'PF': 0.4, 'C': 0.6},
-        'skill_needs': {'scoring': 0.5, 'shooting': 0.8, 'playmaking': 0.7, 'defense': 0.6, 'rebounding': 0.4},
-        'team_context': 'Need secondary playmaker and shooting'
-    },
-    # Southeast Division
-    'Atlanta Hawks': {
-        'positional_needs': {'PG': 0.2, 'SG': 0.6, 'SF': 0.7, 'PF': 0.8, 'C': 0.6},
-        'skill_needs': {'scoring': 0.5, 'shooting': 0.6, 'playmaking': 0.3, 'defense': 0.9, 'rebounding': 0.7},
-        'team_context': 'Need defense and size around Trae Young'
-    },
-    'Charlotte Hornets': {
-        'positional_needs': {'PG': 0.2, 'SG': 0.4, 'SF': 0.5, 'PF': 0.6, 'C': 0.9},
-        'skill_needs': {'scoring': 0.4, 'shooting': 0.5, 'playmaking': 0.3, 'defense': 0.8, 'rebounding': 0.9},
-        'team_context': 'Need interior presence and defense'
-    },
-    'Miami Heat': {
-        'positional_needs': {'PG': 0.6, 'SG': 0.4, 'SF': 0.5, 'PF': 0.7, 'C': 0.5},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.5, 'defense': 0.8, 'rebounding': 0.5},
-        'team_context': 'Culture fit and two-way players preferred'
-    },
-    'Orlando Magic': {
-        'positional_needs': {'PG': 0.4, 'SG': 0.8, 'SF': 0.3, 'PF': 0.4, 'C': 0.2},
-        'skill_needs': {'scoring': 0.8, 'shooting': 0.9, 'playmaking': 0.4, 'defense': 0.4, 'rebounding': 0.3},
-        'team_context': 'Need perimeter scoring and shooting'
-    },
-    'Washington Wizards': {
-        'positional_needs': {'PG': 0.4, 'SG': 0.5, 'SF': 0.8, 'PF': 0.7, 'C': 0.3},
-        'skill_needs': {'scoring': 0.7, 'shooting': 0.6, 'playmaking': 0.5, 'defense': 0.8, 'rebounding': 0.6},
-        'team_context': 'Rebuilding - need versatile two-way players'
-    },
-    # Northwest Division
-    'Denver Nuggets': {
-        'positional_needs': {'PG': 0.5, 'SG': 0.6, 'SF': 0.4, 'PF': 0.3, 'C': 0.2},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.4, 'defense': 0.6, 'rebounding': 0.3},
-        'team_context': 'Need perimeter depth around Jokic'
-    },
-    'Minnesota Timberwolves': {
-        'positional_needs': {'PG': 0.6, 'SG': 0.7, 'SF': 0.3, 'PF': 0.2, 'C': 0.3},
-        'skill_needs': {'scoring': 0.7, 'shooting': 0.8, 'playmaking': 0.6, 'defense': 0.4, 'rebounding': 0.3},
-        'team_context': 'Need perimeter scoring and playmaking'
-    },
-    'Oklahoma City Thunder': {
-        'positional_needs': {'PG': 0.2, 'SG': 0.4, 'SF': 0.5, 'PF': 0.6, 'C': 0.8},
-        'skill_needs': {'scoring': 0.4, 'shooting': 0.5, 'playmaking': 0.3, 'defense': 0.6, 'rebounding': 0.8},
-        'team_context': 'Need veteran presence and interior size'
-    },
-    'Portland Trail Blazers': {
-        'positional_needs': {'PG': 0.9, 'SG': 0.3, 'SF': 0.6, 'PF': 0.4, 'C': 0.2},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.9, 'defense': 0.5, 'rebounding': 0.3},
-        'team_context': 'Desperate need for franchise point guard'
-    },
-    'Utah Jazz': {
-        'positional_needs': {'PG': 0.4, 'SG': 0.7, 'SF': 0.6, 'PF': 0.5, 'C': 0.3},
-        'skill_needs': {'scoring': 0.8, 'shooting': 0.7, 'playmaking': 0.5, 'defense': 0.6, 'rebounding': 0.4},
-        'team_context': 'Rebuilding with young core'
-    },
-    # Pacific Division
-    'Golden State Warriors': {
-        'positional_needs': {'PG': 0.4, 'SG': 0.3, 'SF': 0.7, 'PF': 0.6, 'C': 0.5},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.8, 'playmaking': 0.4, 'defense': 0.7, 'rebounding': 0.5},
-        'team_context': 'Need youth and athleticism'
-    },
-    'Los Angeles Clippers': {
-        'positional_needs': {'PG': 0.5, 'SG': 0.6, 'SF': 0.4, 'PF': 0.5, 'C': 0.6},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.5, 'defense': 0.6, 'rebounding': 0.5},
-        'team_context': 'Need depth and versatility'
-    },
-    'Los Angeles Lakers': {
-        'positional_needs': {'PG': 0.6, 'SG': 0.5, 'SF': 0.4, 'PF': 0.3, 'C': 0.7},
-        'skill_needs': {'scoring': 0.5, 'shooting': 0.8, 'playmaking': 0.6, 'defense': 0.7, 'rebounding': 0.6},
-        'team_context': 'Need role players around aging stars'
-    },
-    'Phoenix Suns': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.4, 'SF': 0.6, 'PF': 0.7, 'C': 0.5},
-        'skill_needs': {'scoring': 0.5, 'shooting': 0.6, 'playmaking': 0.4, 'defense': 0.7, 'rebounding': 0.6},
-        'team_context': 'Need complementary pieces around core'
-    },
-    'Sacramento Kings': {
-        'positional_needs': {'PG': 0.2, 'SG': 0.4, 'SF': 0.6, 'PF': 0.7, 'C': 0.8},
-        'skill_needs': {'scoring': 0.4, 'shooting': 0.5, 'playmaking': 0.3, 'defense': 0.9, 'rebounding': 0.8},
-        'team_context': 'Need frontcourt defense and size'
-    },
-    # Southwest Division
-    'Dallas Mavericks': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.6, 'SF': 0.5, 'PF': 0.4, 'C': 0.7},
-        'skill_needs': {'scoring': 0.5, 'shooting': 0.7, 'playmaking': 0.4, 'defense': 0.8, 'rebounding': 0.6},
-        'team_context': 'Need defense and complementary pieces'
-    },
-    'Houston Rockets': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.5, 'SF': 0.8, 'PF': 0.6, 'C': 0.4},
-        'skill_needs': {'scoring': 0.7, 'shooting': 0.8, 'playmaking': 0.4, 'defense': 0.6, 'rebounding': 0.5},
-        'team_context': 'Young team building around core'
-    },
-    'Memphis Grizzlies': {
-        'positional_needs': {'PG': 0.2, 'SG': 0.6, 'SF': 0.7, 'PF': 0.4, 'C': 0.5},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.8, 'playmaking': 0.3, 'defense': 0.7, 'rebounding': 0.5},
-        'team_context': 'Need shooting and wing depth'
-    },
-    'New Orleans Pelicans': {
-        'positional_needs': {'PG': 0.4, 'SG': 0.5, 'SF': 0.6, 'PF': 0.3, 'C': 0.4},
-        'skill_needs': {'scoring': 0.6, 'shooting': 0.7, 'playmaking': 0.5, 'defense': 0.6, 'rebounding': 0.4},
-        'team_context': 'Need consistency and depth'
-    },
-    'San Antonio Spurs': {
-        'positional_needs': {'PG': 0.3, 'SG': 0.7, 'SF': 0.4, 'PF': 0.2, 'C': 0.6},
-        'skill_needs': {'scoring': 0.8, 'shooting': 0.9, 'playmaking': 0.4, 'defense': 0.6, 'rebounding': 0.5},
-        'team_context': 'Need shooting and scoring around Wembanyama'
-    }
-}
+def get_nba_teams_analysis() -> Dict[str, Dict]:
+    """Team needs for all 30 franchises (read-only, shared across sessions)"""
+    return get_reference_data('nba_teams')
+
+NBA_TEAMS_ANALYSIS = get_nba_teams_analysis()
 
 # ==================== Chargement des données ====================
-@st.cache_data
 def load_data() -> pd.DataFrame:
     """Load and clean NBA draft data"""
+    # Cleaning reads reference data (scout keywords): a manifest bump reloads the dataset
+    return _load_data(get_reference_version())
+
+@st.cache_data
+def _load_data(reference_version: str) -> pd.DataFrame:
+    """Load and clean NBA draft data, once per reference-data version"""
     try:
         # Try loading from multiple possible sources
         for filename in ['complete_nba_draft_rankings.csv', 'final_nba_draft_rankings.csv', 'ml_nba_draft_predictions.csv']:
             try:
                 df = pd.read_csv(filename)
                 st.success(f"✅ Data loaded from {filename}")
-                return clean_dataframe(df)
+                df = clean_dataframe(df)
+                df.attrs['dataset_version'] = get_dataset_version(df)
+                return df
             except FileNotFoundError:
                 continue
         
         # If no file found, create demo data
         st.info("📋 Using demonstration data")
-        return create_demo_data()
+        df = create_demo_data()
         
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return create_demo_data()
+        df = create_demo_data()
+    
+    # Random demo prospects are never published as a board snapshot
+    df.attrs['demo_data'] = True
+    df.attrs['dataset_version'] = get_dataset_version(df)
+    return df
 
 def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     """Clean dataframe with proper type conversions"""
@@ -359,7 +314,8 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
     # Numeric columns
     numeric_cols = ['ppg', 'rpg', 'apg', 'spg', 'bpg', 'age', 'final_rank', 
                    'final_gen_probability', 'fg_pct', 'three_pt_pct', 'ft_pct', 
-                   'ts_pct', 'height', 'weight', 'usage_rate', 'ortg', 'drtg']
+                   'ts_pct', 'weight', 'usage_rate', 'ortg', 'drtg',
+                   'fga', 'fta', 'turnovers', 'minutes', 'team_pace', 'games_played']
     
     for col in numeric_cols:
         if col in df_clean.columns:
@@ -372,17 +328,31 @@ def clean_dataframe(df: pd.DataFrame) -> pd.DataFrame:
         if col in df_clean.columns:
             df_clean[col] = df_clean[col].astype(str).fillna('N/A')
     
+    # Lengths ("6-8", 7'0", 8'10.5") to numeric inches
+    df_clean = parse_measurement_columns(df_clean)
+    
+    # "PG/SG" -> PG | SG bitmask
+    df_clean = add_position_mask_column(df_clean)
+    
+    # Stable join key for board snapshots
+    df_clean = add_player_id_column(df_clean)
+    
+    # Derived columns computed once at load time
+    df_clean = add_normalized_stat_columns(df_clean)
+    df_clean = add_archetype_column(df_clean)
+    df_clean = add_scout_sentiment_columns(df_clean)
+    
     return df_clean
 
 def create_demo_data() -> pd.DataFrame:
     """Create comprehensive demo data with 60 prospects"""
     # Top prospects with realistic stats
     top_prospects = [
-        {'name': 'Cooper Flagg', 'position': 'PF', 'college': 'Duke', 'ppg': 16.5, 'rpg': 8.2, 'apg': 4.1, 'spg': 1.8, 'bpg': 1.4, 'fg_pct': 0.478, 'three_pt_pct': 0.352, 'ft_pct': 0.765, 'ts_pct': 0.589, 'age': 18.0, 'height': 6.9, 'weight': 220, 'usage_rate': 22.5, 'ortg': 115, 'drtg': 98, 'scout_grade': 'A+', 'archetype': 'Two-Way Wing'},
-        {'name': 'Ace Bailey', 'position': 'SF', 'college': 'Rutgers', 'ppg': 15.8, 'rpg': 6.1, 'apg': 2.3, 'spg': 1.2, 'bpg': 0.8, 'fg_pct': 0.445, 'three_pt_pct': 0.385, 'ft_pct': 0.825, 'ts_pct': 0.612, 'age': 18.0, 'height': 6.8, 'weight': 200, 'usage_rate': 28.2, 'ortg': 118, 'drtg': 105, 'scout_grade': 'A+', 'archetype': 'Elite Scorer'},
-        {'name': 'Dylan Harper', 'position': 'SG', 'college': 'Rutgers', 'ppg': 19.2, 'rpg': 4.8, 'apg': 4.6, 'spg': 1.6, 'bpg': 0.3, 'fg_pct': 0.512, 'three_pt_pct': 0.345, 'ft_pct': 0.792, 'ts_pct': 0.595, 'age': 19.0, 'height': 6.6, 'weight': 195, 'usage_rate': 25.8, 'ortg': 112, 'drtg': 102, 'scout_grade': 'A+', 'archetype': 'Versatile Guard'},
-        {'name': 'VJ Edgecombe', 'position': 'SG', 'college': 'Baylor', 'ppg': 12.1, 'rpg': 4.9, 'apg': 2.8, 'spg': 1.9, 'bpg': 0.6, 'fg_pct': 0.432, 'three_pt_pct': 0.298, 'ft_pct': 0.712, 'ts_pct': 0.501, 'age': 19.0, 'height': 6.5, 'weight': 180, 'usage_rate': 19.5, 'ortg': 105, 'drtg': 95, 'scout_grade': 'A', 'archetype': 'Athletic Defender'},
-        {'name': 'Boogie Fland', 'position': 'PG', 'college': 'Arkansas', 'ppg': 14.6, 'rpg': 3.2, 'apg': 5.1, 'spg': 1.4, 'bpg': 0.2, 'fg_pct': 0.465, 'three_pt_pct': 0.368, 'ft_pct': 0.856, 'ts_pct': 0.578, 'age': 18.0, 'height': 6.2, 'weight': 175, 'usage_rate': 24.1, 'ortg': 114, 'drtg': 108, 'scout_grade': 'A', 'archetype': 'Floor General'},
+        {'name': 'Cooper Flagg', 'position': 'PF', 'college': 'Duke', 'ppg': 16.5, 'rpg': 8.2, 'apg': 4.1, 'spg': 1.8, 'bpg': 1.4, 'fg_pct': 0.478, 'three_pt_pct': 0.352, 'ft_pct': 0.765, 'ts_pct': 0.589, 'age': 18.0, 'height': '6-9', 'weight': 220, 'usage_rate': 22.5, 'ortg': 115, 'drtg': 98, 'scout_grade': 'A+', 'archetype': 'Two-Way Wing'},
+        {'name': 'Ace Bailey', 'position': 'SF', 'college': 'Rutgers', 'ppg': 15.8, 'rpg': 6.1, 'apg': 2.3, 'spg': 1.2, 'bpg': 0.8, 'fg_pct': 0.445, 'three_pt_pct': 0.385, 'ft_pct': 0.825, 'ts_pct': 0.612, 'age': 18.0, 'height': '6-8', 'weight': 200, 'usage_rate': 28.2, 'ortg': 118, 'drtg': 105, 'scout_grade': 'A+', 'archetype': 'Elite Scorer'},
+        {'name': 'Dylan Harper', 'position': 'SG', 'college': 'Rutgers', 'ppg': 19.2, 'rpg': 4.8, 'apg': 4.6, 'spg': 1.6, 'bpg': 0.3, 'fg_pct': 0.512, 'three_pt_pct': 0.345, 'ft_pct': 0.792, 'ts_pct': 0.595, 'age': 19.0, 'height': '6-6', 'weight': 195, 'usage_rate': 25.8, 'ortg': 112, 'drtg': 102, 'scout_grade': 'A+', 'archetype': 'Versatile Guard'},
+        {'name': 'VJ Edgecombe', 'position': 'SG', 'college': 'Baylor', 'ppg': 12.1, 'rpg': 4.9, 'apg': 2.8, 'spg': 1.9, 'bpg': 0.6, 'fg_pct': 0.432, 'three_pt_pct': 0.298, 'ft_pct': 0.712, 'ts_pct': 0.501, 'age': 19.0, 'height': '6-5', 'weight': 180, 'usage_rate': 19.5, 'ortg': 105, 'drtg': 95, 'scout_grade': 'A', 'archetype': 'Athletic Defender'},
+        {'name': 'Boogie Fland', 'position': 'PG', 'college': 'Arkansas', 'ppg': 14.6, 'rpg': 3.2, 'apg': 5.1, 'spg': 1.4, 'bpg': 0.2, 'fg_pct': 0.465, 'three_pt_pct': 0.368, 'ft_pct': 0.856, 'ts_pct': 0.578, 'age': 18.0, 'height': '6-2', 'weight': 175, 'usage_rate': 24.1, 'ortg': 114, 'drtg': 108, 'scout_grade': 'A', 'archetype': 'Floor General'},
     ]
     
     # Generate remaining prospects
@@ -403,7 +373,7 @@ def create_demo_data() -> pd.DataFrame:
             'ft_pct': np.random.normal(0.75, 0.12),
             'ts_pct': np.random.normal(0.55, 0.08),
             'age': np.random.normal(19, 1.2),
-            'height': np.random.normal(6.5, 0.5),
+            'height': np.random.normal(78, 3),
             'weight': np.random.normal(200, 25),
             'usage_rate': np.random.normal(22, 5),
             'ortg': np.random.normal(110, 8),
@@ -419,6 +389,589 @@ def create_demo_data() -> pd.DataFrame:
     
     return clean_dataframe(df)
 
+# ==================== Normalisation des stats ====================
+# Counting stats available per game, per 40 minutes and per 100 possessions
+COUNTING_STATS = ('ppg', 'rpg', 'apg', 'spg', 'bpg', 'fga', 'fta', 'turnovers')
+STAT_BASES = {
+    'per_game': 'Per Game',
+    'per40': 'Per 40 Minutes',
+    'per100': 'Per 100 Possessions'
+}
+STAT_UNITS = {
+    'ppg': 'PTS', 'rpg': 'REB', 'apg': 'AST', 'spg': 'STL', 'bpg': 'BLK',
+    'fga': 'FGA', 'fta': 'FTA', 'turnovers': 'TOV', 'stocks': 'STL+BLK'
+}
+PER_GAME_UNITS = {'ppg': 'PPG', 'rpg': 'RPG', 'apg': 'APG', 'spg': 'SPG', 'bpg': 'BPG'}
+BASIS_SUFFIXES = {'per40': '/40', 'per100': '/100'}
+
+def add_normalized_stat_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add <stat>_per40 and <stat>_per100 columns for every counting stat"""
+    if 'minutes' not in df.columns:
+        return df
+    
+    df_norm = df.copy()
+    minutes = df_norm['minutes'].to_numpy(dtype=float)
+    stats = [stat for stat in COUNTING_STATS if stat in df_norm.columns]
+    values = df_norm[stats].to_numpy(dtype=float)
+    
+    # team_pace is possessions per 40 minutes: a player is on the floor for pace * minutes / 40 of them
+    factors = {'per40': np.divide(40.0, minutes, out=np.zeros_like(minutes), where=minutes > 0)}
+    if 'team_pace' in df_norm.columns:
+        possessions = df_norm['team_pace'].to_numpy(dtype=float) * minutes / 40
+        factors['per100'] = np.divide(100.0, possessions, out=np.zeros_like(possessions), where=possessions > 0)
+    
+    for basis, factor in factors.items():
+        normalized = values * factor[:, None]
+        for j, stat in enumerate(stats):
+            df_norm[f'{stat}_{basis}'] = normalized[:, j]
+    
+    return df_norm
+
+def get_stat_column(stat: str, basis: str) -> str:
+    """Column holding a counting stat on a given basis"""
+    return stat if basis == 'per_game' else f'{stat}_{basis}'
+
+def get_available_stat_bases(df: pd.DataFrame) -> List[str]:
+    """Bases the dataset has columns for (per game is always available)"""
+    return [basis for basis in STAT_BASES if get_stat_column('ppg', basis) in df.columns]
+
+def stat_unit(stat: str, basis: str) -> str:
+    """Display unit, e.g. PPG, PTS/40, PTS/100"""
+    if basis == 'per_game':
+        return PER_GAME_UNITS.get(stat, STAT_UNITS[stat])
+    return f"{STAT_UNITS[stat]}{BASIS_SUFFIXES[basis]}"
+
+def apply_stat_basis(df: pd.DataFrame, basis: str) -> pd.DataFrame:
+    """Same frame with the counting-stat columns swapped for the chosen basis"""
+    if basis == 'per_game':
+        return df
+    return df.assign(**{
+        stat: df[get_stat_column(stat, basis)]
+        for stat in COUNTING_STATS if get_stat_column(stat, basis) in df.columns
+    })
+
+def get_stat_basis_scale(df: pd.DataFrame, basis: str) -> Dict[str, float]:
+    """Class-median ratio basis / per game, used to carry per-game thresholds over to other bases"""
+    scale = {}
+    for stat in COUNTING_STATS:
+        column = get_stat_column(stat, basis)
+        if basis == 'per_game' or column not in df.columns:
+            scale[stat] = 1.0
+            continue
+        per_game, normalized = df[stat].median(), df[column].median()
+        scale[stat] = float(normalized / per_game) if per_game > 0 else 1.0
+    return scale
+
+def select_stat_basis(df: pd.DataFrame, key: str) -> str:
+    """Basis selector for views comparing counting stats"""
+    bases = get_available_stat_bases(df)
+    if len(bases) == 1:
+        return bases[0]
+    return st.radio(
+        "Stat basis:", bases, format_func=lambda basis: STAT_BASES[basis],
+        horizontal=True, key=key
+    )
+
+# ==================== Mesures ====================
+# Plausible ranges in inches; anything outside is reported and left unknown
+MEASUREMENT_RANGES = {
+    'height': (66, 92),
+    'wingspan': (66, 100),
+    'standing_reach': (90, 125)
+}
+# 6-8 | 7'0" | 8'10.5" | 6 ft 9 in | 80 (inches) | 6.75 (decimal feet)
+LENGTH_PATTERN = (
+    r"^\s*(?:(?P<feet>\d+)\s*(?:'|’|-|ft\.?)\s*(?P<inches>\d+(?:\.\d+)?)?\s*(?:\"|”|''|in\.?)?"
+    r"|(?P<number>\d+(?:\.\d+)?))\s*$"
+)
+
+def parse_length_inches(values: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Parse a column of lengths to inches in one regex pass; returns (inches, status)"""
+    text = values.astype('string').str.strip()
+    parts = text.str.extract(LENGTH_PATTERN)
+    feet, inches, number = (pd.to_numeric(parts[group], errors='coerce').astype(float)
+                            for group in ('feet', 'inches', 'number'))
+    
+    # Bare numbers below 10 are decimal feet (legacy exports), otherwise inches
+    parsed = (feet * 12 + inches.fillna(0)).where(feet.notna(), number.where(number >= 10, number * 12))
+    
+    missing = (text.isna() | (text == '')).fillna(True).astype(bool)
+    status = pd.Series('ok', index=values.index, dtype=object)
+    status[parsed.isna() & ~missing] = 'invalid'
+    status[missing] = 'missing'
+    status[inches >= 12] = 'invalid'
+    return parsed.where(status == 'ok'), status
+
+def parse_measurement_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Convert height, wingspan and standing reach to inches and record a validation report"""
+    df_parsed = df.copy()
+    report = []
+    
+    for col, (low, high) in MEASUREMENT_RANGES.items():
+        if col not in df_parsed.columns:
+            continue
+        inches, status = parse_length_inches(df_parsed[col])
+        out_of_range = inches.notna() & ~inches.between(low, high)
+        status[out_of_range] = 'out_of_range'
+        
+        flagged = status.isin(['invalid', 'out_of_range'])
+        report.append({
+            'column': col,
+            'parsed': int((status == 'ok').sum()),
+            'missing': int((status == 'missing').sum()),
+            'invalid': int((status == 'invalid').sum()),
+            'out_of_range': int(out_of_range.sum()),
+            'examples': df_parsed.loc[flagged, col].astype(str).head(5).tolist()
+        })
+        # 0 = unknown, like the other numeric columns
+        df_parsed[col] = inches.where(status == 'ok').astype(float).fillna(0)
+    
+    df_parsed.attrs['measurement_report'] = report
+    return df_parsed
+
+def get_measurement_report(df: pd.DataFrame) -> pd.DataFrame:
+    """Validation report of the measurement parsing done at load time"""
+    return pd.DataFrame(df.attrs.get('measurement_report', []),
+                        columns=['column', 'parsed', 'missing', 'invalid', 'out_of_range', 'examples'])
+
+# ==================== Positions ====================
+# One bit per position: "PG/SG" -> PG | SG, so position filters are a single integer AND
+POSITION_BITS = {'PG': 1, 'SG': 2, 'SF': 4, 'PF': 8, 'C': 16}
+POSITION_ALIASES = {'G': ('PG', 'SG'), 'F': ('SF', 'PF'), 'W': ('SG', 'SF')}
+POSITION_GROUPS = {
+    'Guards': ('PG', 'SG'),
+    'Wings': ('SG', 'SF'),
+    'Bigs': ('PF', 'C'),
+    'Perimeter': ('PG', 'SG', 'SF')
+}
+POSITION_SEPARATORS = re.compile(r'[/,\-]')
+
+def position_mask(positions) -> int:
+    """Bitmask of a list of positions (aliases like 'G' or 'F' expand to their positions)"""
+    mask = 0
+    for position in positions:
+        position = str(position).strip().upper()
+        for base in POSITION_ALIASES.get(position, (position,)):
+            mask |= POSITION_BITS.get(base, 0)
+    return mask
+
+def encode_positions(positions: pd.Series) -> np.ndarray:
+    """'PG/SG', 'SF-PF', 'C' ... -> uint8 bitmasks (0 = unknown), encoded once per distinct value"""
+    codes, values = pd.factorize(positions.astype(str))
+    masks = np.array([position_mask(POSITION_SEPARATORS.split(value)) for value in values] + [0],
+                     dtype=np.uint8)
+    # Code -1 (missing) picks the trailing 0
+    return masks[codes]
+
+def decode_positions(mask: int) -> List[str]:
+    """Bitmask -> positions in PG..C order"""
+    return [position for position, bit in POSITION_BITS.items() if int(mask) & bit]
+
+def add_position_mask_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the position_mask column used by position filters and fit scoring"""
+    if 'position' not in df.columns:
+        return df
+    df_encoded = df.copy()
+    df_encoded['position_mask'] = encode_positions(df_encoded['position'])
+    return df_encoded
+
+def get_position_masks(df: pd.DataFrame) -> np.ndarray:
+    """position_mask column, encoded on the fly for frames that skipped clean_dataframe"""
+    if 'position_mask' in df.columns:
+        return df['position_mask'].to_numpy(dtype=np.uint8)
+    if 'position' in df.columns:
+        return encode_positions(df['position'])
+    return np.zeros(len(df), dtype=np.uint8)
+
+def plays_position(df: pd.DataFrame, positions) -> np.ndarray:
+    """Rows listing any of the positions (or a POSITION_GROUPS name), combos included"""
+    if isinstance(positions, str):
+        positions = POSITION_GROUPS.get(positions, (positions,))
+    return (get_position_masks(df) & position_mask(positions)) != 0
+
+def positional_need_scores(masks: np.ndarray, positional_needs: Dict[str, float]) -> Tuple[np.ndarray, List[Optional[str]]]:
+    """Largest team need over each player's positions, and the position that carries it"""
+    bits = np.array(list(POSITION_BITS.values()), dtype=np.uint8)
+    needs = np.array([positional_needs.get(position, 0.0) for position in POSITION_BITS], dtype=float)
+    covered = (np.asarray(masks, dtype=np.uint8)[:, None] & bits) != 0
+    scores = np.where(covered, needs, -np.inf)
+    best = scores.argmax(axis=1)
+    has_position = covered.any(axis=1)
+    best_scores = np.where(has_position, scores[np.arange(len(best)), best], 0.0)
+    positions = list(POSITION_BITS)
+    return best_scores, [positions[b] if ok else None for b, ok in zip(best, has_position)]
+
+# ==================== Archétypes ====================
+# Standardized stat space used to place prospects; height 0 (unknown) is imputed like a missing stat
+ARCHETYPE_FEATURES = ['ppg', 'rpg', 'apg', 'spg', 'bpg', 'three_pt_pct', 'ts_pct', 'height']
+# Seed centroids in z-units (feature order above). Mini-batch k-means refines them on the class,
+# and each cluster keeps the label of the seed it started from.
+ARCHETYPE_SEEDS = {
+    'Elite Scorer':      [1.6, 0.0, 0.0, 0.0, -0.2, 0.3, 0.6, 0.0],
+    'Floor General':     [0.3, -0.6, 1.8, 0.4, -0.5, 0.3, 0.0, -1.0],
+    'Versatile Guard':   [0.8, 0.2, 0.9, 0.3, -0.3, 0.0, 0.2, -0.5],
+    'Elite Shooter':     [0.3, -0.4, -0.1, -0.2, -0.4, 1.6, 0.8, 0.0],
+    'Two-Way Wing':      [0.7, 0.5, 0.2, 0.8, 0.3, 0.3, 0.1, 0.4],
+    'Athletic Defender': [-0.3, 0.2, -0.2, 1.4, 0.5, -0.6, -0.4, 0.2],
+    'Rim Protector':     [-0.1, 1.4, -0.8, -0.3, 1.9, -1.2, 0.3, 1.3],
+    'Role Player':       [-0.8, -0.5, -0.6, -0.5, -0.5, -0.3, -0.5, -0.2]
+}
+ARCHETYPE_BATCH_SIZE = 256
+ARCHETYPE_ITERATIONS = 50
+
+def standardize_features(df: pd.DataFrame, features: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Z-score matrix of the features (missing -> column median), with the center and scale used"""
+    X = np.column_stack([
+        pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float) if col in df.columns
+        else np.full(len(df), np.nan)
+        for col in features
+    ])
+    if 'height' in features:
+        # Measurements use 0 for unknown
+        height = X[:, features.index('height')]
+        height[height == 0] = np.nan
+    center = np.array([np.nanmedian(col) if np.isfinite(col).any() else 0.0 for col in X.T])
+    X = np.where(np.isnan(X), center, X)
+    scale = X.std(axis=0)
+    scale[scale == 0] = 1.0
+    return (X - center) / scale, center, scale
+
+def nearest_centroids(X: np.ndarray, centroids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index of and squared distance to the nearest centroid, for every row at once"""
+    d2 = (X ** 2).sum(axis=1)[:, None] - 2 * X @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+    labels = d2.argmin(axis=1)
+    return labels, np.maximum(d2[np.arange(len(X)), labels], 0.0)
+
+def fit_minibatch_kmeans(X: np.ndarray, centroids: np.ndarray, batch_size: int = ARCHETYPE_BATCH_SIZE,
+                         iterations: int = ARCHETYPE_ITERATIONS, seed: int = 0) -> np.ndarray:
+    """Mini-batch k-means (per-centroid learning rate 1/count), started from the given centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = centroids.astype(float).copy()
+    counts = np.zeros(len(centroids))
+    for _ in range(iterations):
+        batch = X[rng.choice(len(X), size=min(batch_size, len(X)), replace=False)]
+        labels, _ = nearest_centroids(batch, centroids)
+        for k in np.unique(labels):
+            members = batch[labels == k]
+            counts[k] += len(members)
+            centroids[k] += (members.sum(axis=0) - len(members) * centroids[k]) / counts[k]
+    return centroids
+
+def derive_archetypes(df: pd.DataFrame) -> Dict[str, Any]:
+    """Cluster the class in standardized stat space and label each prospect with its archetype"""
+    names = list(ARCHETYPE_SEEDS)
+    X, center, scale = standardize_features(df, ARCHETYPE_FEATURES)
+    seeds = np.array([ARCHETYPE_SEEDS[name] for name in names], dtype=float)
+    centroids = fit_minibatch_kmeans(X, seeds) if len(X) else seeds
+    labels, distance = nearest_centroids(X, centroids)
+    return {
+        'labels': np.array(names, dtype=object)[labels],
+        'distance': np.sqrt(distance),
+        # Centroids back in stat units, for display
+        'centroids': pd.DataFrame(centroids * scale + center, index=names, columns=ARCHETYPE_FEATURES),
+        'counts': pd.Series(labels).value_counts().reindex(range(len(names)), fill_value=0).set_axis(names)
+    }
+
+def add_archetype_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Fill archetype where the source has none (real rankings files ship without it)"""
+    df_labeled = df.copy()
+    existing = df_labeled['archetype'].astype(str) if 'archetype' in df_labeled.columns \
+        else pd.Series('nan', index=df_labeled.index)
+    missing = existing.isin(['nan', 'None', 'N/A', '']).to_numpy()
+    if not missing.any():
+        return df_labeled
+    
+    model = derive_archetypes(df_labeled)
+    df_labeled['archetype'] = np.where(missing, model['labels'], existing.to_numpy())
+    # Plain dicts: attrs travel with every derived frame and must compare cleanly
+    df_labeled.attrs['archetype_model'] = {
+        'derived': int(missing.sum()),
+        'centroids': model['centroids'].round(3).to_dict(orient='index'),
+        'counts': {name: int(n) for name, n in model['counts'].items()}
+    }
+    return df_labeled
+
+def get_archetype_model(df: pd.DataFrame) -> pd.DataFrame:
+    """Centroid profile and size of each derived archetype (empty if the source had archetypes)"""
+    model = df.attrs.get('archetype_model')
+    if not model:
+        return pd.DataFrame(columns=['prospects'] + ARCHETYPE_FEATURES)
+    centroids = pd.DataFrame.from_dict(model['centroids'], orient='index')
+    centroids.insert(0, 'prospects', pd.Series(model['counts']))
+    return centroids
+
+# ==================== Analyse des rapports de scouting ====================
+# Which keyword group is scored against which free-text column
+SCOUT_TEXT_FIELDS = {'strengths': 'positive', 'weaknesses': 'negative', 'nba_comparison': 'comparison'}
+
+def build_keyword_automaton(keywords: List[str]) -> Dict[str, Any]:
+    """Compile keywords into an Aho–Corasick automaton (goto, fail and output tables)"""
+    goto: List[Dict[str, int]] = [{}]
+    fail: List[int] = [0]
+    output: List[List[int]] = [[]]
+    
+    # Trie of all keywords
+    for keyword_id, keyword in enumerate(keywords):
+        node = 0
+        for char in keyword:
+            if char not in goto[node]:
+                goto[node][char] = len(goto)
+                goto.append({})
+                fail.append(0)
+                output.append([])
+            node = goto[node][char]
+        output[node].append(keyword_id)
+    
+    # Failure links, breadth-first
+    queue = deque(goto[0].values())
+    while queue:
+        node = queue.popleft()
+        for char, child in goto[node].items():
+            queue.append(child)
+            fallback = fail[node]
+            while fallback and char not in goto[fallback]:
+                fallback = fail[fallback]
+            fail[child] = goto[fallback].get(char, 0)
+            output[child] = output[child] + output[fail[child]]
+    
+    return {
+        'keywords': tuple(keywords),
+        'lengths': tuple(len(k) for k in keywords),
+        'goto': goto,
+        'fail': fail,
+        'output': output
+    }
+
+def scan_keywords(automaton: Dict[str, Any], text: str) -> List[Tuple[int, int]]:
+    """Return (start offset, keyword id) for every whole-word keyword occurrence in text"""
+    goto, fail, output, lengths = automaton['goto'], automaton['fail'], automaton['output'], automaton['lengths']
+    hits = []
+    node = 0
+    
+    for i, char in enumerate(text):
+        while node and char not in goto[node]:
+            node = fail[node]
+        node = goto[node].get(char, 0)
+        for keyword_id in output[node]:
+            start = i + 1 - lengths[keyword_id]
+            # Only whole words: 'raw' must not match inside 'drawn'
+            if (start == 0 or not text[start - 1].isalnum()) and \
+               (i + 1 == len(text) or not text[i + 1].isalnum()):
+                hits.append((start, keyword_id))
+    
+    return hits
+
+@st.cache_resource
+def get_scout_matcher(reference_version: str) -> Dict[str, Any]:
+    """Compile the scout keyword automaton and its impact tables once per reference version"""
+    scout_keywords = get_reference_data('scout_keywords')
+    groups = list(scout_keywords.keys())
+    keywords = sorted({keyword for group in groups for keyword in scout_keywords[group]})
+    categories = sorted({data['category'] for group in groups for data in scout_keywords[group].values()})
+    
+    # impact[group, keyword] and category[group, keyword]; keywords outside a group score 0
+    impact = np.zeros((len(groups), len(keywords)))
+    category = np.zeros((len(groups), len(keywords)), dtype=int)
+    for g, group in enumerate(groups):
+        for k, keyword in enumerate(keywords):
+            if keyword in scout_keywords[group]:
+                impact[g, k] = scout_keywords[group][keyword]['impact']
+                category[g, k] = categories.index(scout_keywords[group][keyword]['category'])
+    
+    return {
+        'automaton': build_keyword_automaton(keywords),
+        'groups': groups,
+        'categories': categories,
+        'impact': impact,
+        'category': category
+    }
+
+def match_scout_phrase(phrase: str, group: str) -> List[Dict[str, Any]]:
+    """Keywords of one group found in a single scouting phrase"""
+    matcher = get_scout_matcher(get_reference_version())
+    g = matcher['groups'].index(group)
+    scout_keywords = get_reference_data('scout_keywords')[group]
+    matches = []
+    for _, keyword_id in scan_keywords(matcher['automaton'], phrase.lower()):
+        keyword = matcher['automaton']['keywords'][keyword_id]
+        if matcher['impact'][g, keyword_id] != 0:
+            matches.append({'keyword': keyword, **scout_keywords[keyword]})
+    return matches
+
+def add_scout_sentiment_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Score every prospect's scouting text in one pass and add per-category sentiment columns"""
+    matcher = get_scout_matcher(get_reference_version())
+    fields = list(SCOUT_TEXT_FIELDS)
+    field_groups = [matcher['groups'].index(SCOUT_TEXT_FIELDS[field]) for field in fields]
+    texts = {
+        field: (df[field].fillna('').astype(str).str.lower().tolist() if field in df.columns else [''] * len(df))
+        for field in fields
+    }
+    
+    # One corpus, one scan: row-major segments (row 0 strengths, row 0 weaknesses, ...)
+    segments = [texts[field][row] for row in range(len(df)) for field in fields]
+    lengths = np.array([len(segment) + 1 for segment in segments], dtype=np.int64)
+    segment_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    hits = scan_keywords(matcher['automaton'], '\n'.join(segments))
+    
+    n_categories = len(matcher['categories'])
+    category_scores = np.zeros((len(df), n_categories))
+    group_scores = np.zeros((len(df), len(fields)))
+    hit_counts = np.zeros(len(df), dtype=int)
+    
+    if hits:
+        starts, keyword_ids = np.array(hits).T
+        segment_ids = np.searchsorted(segment_starts, starts, side='right') - 1
+        rows, field_ids = np.divmod(segment_ids, len(fields))
+        groups = np.array(field_groups)[field_ids]
+        impacts = matcher['impact'][groups, keyword_ids]
+        scored = impacts != 0
+        rows, field_ids, impacts = rows[scored], field_ids[scored], impacts[scored]
+        categories = matcher['category'][groups[scored], keyword_ids[scored]]
+        
+        np.add.at(category_scores, (rows, categories), impacts)
+        np.add.at(group_scores, (rows, field_ids), impacts)
+        np.add.at(hit_counts, rows, 1)
+    
+    df_scored = df.copy()
+    for c, category in enumerate(matcher['categories']):
+        df_scored[f'scout_{category}'] = category_scores[:, c]
+    df_scored['scout_positive'] = group_scores[:, fields.index('strengths')]
+    df_scored['scout_negative'] = group_scores[:, fields.index('weaknesses')]
+    # The 'comparison' group maps to its own category, so scout_comparison already holds it
+    df_scored['scout_keyword_hits'] = hit_counts
+    
+    # Same normalisation as the hand-written reports: net impact per scouting phrase
+    phrase_counts = sum(
+        np.array([len([p for p in text.split(',') if p.strip()]) for text in texts[field]])
+        for field in ('strengths', 'weaknesses')
+    )
+    df_scored['scout_sentiment'] = (
+        (df_scored['scout_positive'] + df_scored['scout_negative']) / np.maximum(phrase_counts, 1)
+    )
+    
+    return df_scored
+
+# ==================== Recherche textuelle ====================
+# Sparse TF-IDF over the scouting text, stored as CSR arrays (indptr / indices / data)
+SCOUT_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'as', 'at', 'for', 'in', 'is', 'of', 'on', 'or', 'the', 'to', 'with', 'jr'
+})
+SCOUT_TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+def tokenize_scout_text(text: str) -> List[str]:
+    """Unigrams and within-phrase bigrams of a comma-separated scouting text"""
+    terms = []
+    for phrase in str(text).lower().split(','):
+        words = [w for w in SCOUT_TOKEN_PATTERN.findall(phrase) if w not in SCOUT_STOPWORDS]
+        terms.extend(words)
+        terms.extend(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return terms
+
+def build_text_index(documents: List[str]) -> Dict[str, Any]:
+    """Build an L2-normalised TF-IDF matrix in CSR form"""
+    vocabulary: Dict[str, int] = {}
+    doc_ids, term_ids = [], []
+    for doc_id, document in enumerate(documents):
+        for term in tokenize_scout_text(document):
+            doc_ids.append(doc_id)
+            term_ids.append(vocabulary.setdefault(term, len(vocabulary)))
+    
+    n_docs, n_terms = len(documents), max(len(vocabulary), 1)
+    # (doc, term) pairs -> unique sorted keys with term frequencies: rows come out in CSR order
+    keys, tf = np.unique(np.array(doc_ids, dtype=np.int64) * n_terms + np.array(term_ids, dtype=np.int64),
+                         return_counts=True)
+    rows, indices = np.divmod(keys, n_terms)
+    indptr = np.searchsorted(rows, np.arange(n_docs + 1))
+    
+    # Smoothed idf, as in the usual sklearn formulation
+    doc_freq = np.bincount(indices, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+    data = tf * idf[indices]
+    norms = np.sqrt(np.bincount(rows, weights=data ** 2, minlength=n_docs))
+    data = data / np.where(norms > 0, norms, 1)[rows]
+    
+    return {
+        'vocabulary': vocabulary,
+        'terms': np.array(list(vocabulary), dtype=object),
+        'idf': idf,
+        'indptr': indptr,
+        'indices': indices,
+        'data': data,
+        'rows': rows,
+        'n_docs': n_docs
+    }
+
+def vectorize_text_query(index: Dict[str, Any], text: str) -> np.ndarray:
+    """Dense, normalised query vector over the index vocabulary (unknown terms are dropped)"""
+    query = np.zeros(len(index['idf']))
+    for term in tokenize_scout_text(text):
+        term_id = index['vocabulary'].get(term)
+        if term_id is not None:
+            query[term_id] += index['idf'][term_id]
+    norm = np.linalg.norm(query)
+    return query / norm if norm > 0 else query
+
+def get_document_vector(index: Dict[str, Any], doc_id: int) -> np.ndarray:
+    """Dense copy of one CSR row"""
+    vector = np.zeros(len(index['idf']))
+    start, end = index['indptr'][doc_id], index['indptr'][doc_id + 1]
+    vector[index['indices'][start:end]] = index['data'][start:end]
+    return vector
+
+def cosine_top_k(index: Dict[str, Any], query: np.ndarray, k: int = 5,
+                 exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Top-k (doc id, cosine) for a query vector: one sparse matrix-vector product"""
+    scores = np.bincount(index['rows'], weights=index['data'] * query[index['indices']],
+                         minlength=index['n_docs'])
+    if exclude is not None:
+        scores[exclude] = -1
+    k = min(k, index['n_docs'])
+    if k <= 0:
+        return []
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind='stable')]
+    return [(int(doc_id), float(scores[doc_id])) for doc_id in top if scores[doc_id] > 0]
+
+def shared_terms(index: Dict[str, Any], query: np.ndarray, doc_id: int, limit: int = 3) -> List[str]:
+    """Terms contributing most to a document's score, for display"""
+    start, end = index['indptr'][doc_id], index['indptr'][doc_id + 1]
+    term_ids = index['indices'][start:end]
+    contributions = index['data'][start:end] * query[term_ids]
+    order = np.argsort(-contributions)[:limit]
+    return [index['terms'][term_ids[i]] for i in order if contributions[i] > 0]
+
+@st.cache_resource(max_entries=4)
+def get_scout_text_index(_df: pd.DataFrame, dataset_version: str) -> Dict[str, Any]:
+    """TF-IDF index over strengths, weaknesses and NBA comparisons, built once per dataset version"""
+    fields = [field for field in SCOUT_TEXT_FIELDS if field in _df.columns]
+    documents = (
+        _df[fields].fillna('').astype(str).agg(', '.join, axis=1).tolist()
+        if fields else [''] * len(_df)
+    )
+    return build_text_index(documents)
+
+def find_similar_prospects(df: pd.DataFrame, player_name: Optional[str] = None,
+                           query: Optional[str] = None, k: int = 5) -> pd.DataFrame:
+    """Prospects whose scouting text best matches a player's reports or a free-text query"""
+    index = get_scout_text_index(df, get_dataset_version(df))
+    exclude = None
+    
+    if player_name is not None:
+        positions = np.flatnonzero(df['name'].to_numpy() == player_name)
+        if len(positions) == 0:
+            return df.iloc[0:0].assign(text_similarity=[], shared_terms=[])
+        exclude = int(positions[0])
+        query_vector = get_document_vector(index, exclude)
+    else:
+        query_vector = vectorize_text_query(index, query or '')
+    
+    matches = cosine_top_k(index, query_vector, k, exclude=exclude)
+    result = df.iloc[[doc_id for doc_id, _ in matches]].copy()
+    result['text_similarity'] = [score for _, score in matches]
+    result['shared_terms'] = [', '.join(shared_terms(index, query_vector, doc_id)) for doc_id, _ in matches]
+    return result
+
 # ==================== Composants UI ====================
 def display_hero_header():
     """Display hero header section"""
@@ -462,45 +1015,138 @@ def display_draft_countdown():
         </div>
         """, unsafe_allow_html=True)
 
+# ==================== Métriques dérivées ====================
+LEADER_TOP_K = 5
+LEADER_METRICS = {
+    'projected_scorer': 'Scoring',
+    'projected_shooter': 'Shooting',
+    'projected_rebounder': 'Rebounding',
+    'projected_playmaker': 'Playmaking',
+    'projected_defender': 'Defense',
+    'final_gen_probability': 'Ceiling',
+    'immediate_impact': 'Immediate Impact'
+}
+
+def compute_derived_metrics(df: pd.DataFrame, basis: str) -> Dict[str, np.ndarray]:
+    """Projected-potential metrics for every prospect on a stat basis"""
+    scale = get_stat_basis_scale(df, basis)
+    stats = apply_stat_basis(df, basis)
+    gen_prob = stats['final_gen_probability'].to_numpy(dtype=float)
+    
+    def col(name: str) -> np.ndarray:
+        return stats[name].to_numpy(dtype=float)
+    
+    return {
+        'projected_scorer': np.minimum(col('ppg') * (1 + gen_prob * 0.3), 32 * scale['ppg']),
+        'projected_shooter': np.minimum(col('three_pt_pct') * (1 + gen_prob * 0.15), 0.43),
+        'projected_rebounder': np.minimum(col('rpg') * (1 + gen_prob * 0.3), 15 * scale['rpg']),
+        'projected_playmaker': np.minimum(col('apg') * (1 + gen_prob * 0.35), 12 * scale['apg']),
+        'projected_defender': np.minimum((col('spg') + col('bpg')) * (1 + gen_prob * 0.25),
+                                         4 * (scale['spg'] + scale['bpg']) / 2),
+        'final_gen_probability': gen_prob,
+        'immediate_impact': formula_scores(formula_matrix(stats, 'immediate_impact'),
+                                           formula_weight_vector('immediate_impact'))
+    }
+
+@st.cache_resource(max_entries=8)
+def get_derived_metrics(_df: pd.DataFrame, dataset_version: str, basis: str) -> Dict[str, Any]:
+    """Derived metrics and their top-k positions, once per dataset version and basis (shared, read-only)"""
+    metrics = compute_derived_metrics(_df, basis)
+    top_k = {}
+    for name, values in metrics.items():
+        # Stable descending order: the leader is the first maximum, as with idxmax
+        order = np.argsort(-np.nan_to_num(values, nan=-np.inf), kind='stable')[:LEADER_TOP_K]
+        top_k[name] = order
+        values.flags.writeable = False
+        order.flags.writeable = False
+    return {'metrics': metrics, 'top_k': top_k}
+
+# ==================== Index de classement ====================
+# Metric -> ascending? Sorted once per dataset version, then every top-k / rank / range query is a slice
+LEADERBOARD_METRICS = {
+    'final_rank': True, 'name': True, 'age': True,
+    'ppg': False, 'rpg': False, 'apg': False, 'spg': False, 'bpg': False,
+    'three_pt_pct': False, 'ts_pct': False, 'final_gen_probability': False, 'scout_sentiment': False
+}
+
+def sorted_permutation(values: pd.Series, ascending: bool) -> np.ndarray:
+    """Stable sort order of a column (ties keep row order, missing values last)"""
+    if values.dtype == object or pd.api.types.is_string_dtype(values):
+        # Sorted codes of the case-folded strings, missing = -1; descending inverts the codes, not the order
+        codes, _ = pd.factorize(values.map(lambda v: str(v).lower(), na_action='ignore'), sort=True)
+        keys = codes if ascending else -codes
+        return np.argsort(np.where(codes < 0, np.iinfo(np.int64).max, keys), kind='stable')
+    numeric = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+    keys = numeric if ascending else -numeric
+    return np.argsort(np.where(np.isnan(keys), np.inf, keys), kind='stable')
+
+@st.cache_resource(max_entries=4)
+def get_leaderboard_index(_df: pd.DataFrame, dataset_version: str) -> Dict[str, Any]:
+    """Per-metric sorted permutations, overall and per position (shared, read-only)"""
+    masks = get_position_masks(_df)
+    position_masks = {position: (masks & bit) != 0 for position, bit in POSITION_BITS.items()
+                      if ((masks & bit) != 0).any()}
+    
+    orders, ranks, by_position = {}, {}, {}
+    for metric, ascending in LEADERBOARD_METRICS.items():
+        if metric not in _df.columns:
+            continue
+        order = sorted_permutation(_df[metric], ascending)
+        rank = np.empty(len(order), dtype=np.int64)
+        rank[order] = np.arange(1, len(order) + 1)
+        orders[metric], ranks[metric] = order, rank
+        by_position[metric] = {position: order[mask[order]] for position, mask in position_masks.items()}
+        for array in [order, rank, *by_position[metric].values()]:
+            array.flags.writeable = False
+    
+    return {'order': orders, 'rank': ranks, 'by_position': by_position,
+            'position_masks': position_masks, 'size': len(_df)}
+
+def leaderboard_slice(index: Dict[str, Any], metric: str, start: int = 0, stop: Optional[int] = None,
+                      position: Optional[str] = None, mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """Row positions ranked start..stop on a metric, optionally within a position or a row mask"""
+    if position is not None:
+        order = index['by_position'][metric].get(position, np.array([], dtype=np.int64))
+    else:
+        order = index['order'][metric]
+    if mask is not None:
+        order = order[mask[order]]
+    return order[start:stop]
+
+def leaderboard_rank(index: Dict[str, Any], metric: str, row: int, position: Optional[str] = None) -> int:
+    """1-based rank of a row on a metric, overall or within a position"""
+    if position is None:
+        return int(index['rank'][metric][row])
+    return int(np.flatnonzero(index['by_position'][metric][position] == row)[0]) + 1
+
+def get_row_mask(df: pd.DataFrame, subset: pd.DataFrame) -> np.ndarray:
+    """Boolean mask over df's rows for a filtered subset of it"""
+    return df.index.isin(subset.index)
+
 def create_leaders_section(df: pd.DataFrame):
 
     """Display category leaders based on potential projections"""
     st.markdown("### 🏆 Category Leaders (Projected Potential)")
     
     try:
-        # Calculate projections
-        df['projected_scorer'] = df['ppg'] * (1 + df['final_gen_probability'] * 0.3)
-        df['projected_scorer'] = df['projected_scorer'].clip(upper=32)
-        
-        df['projected_shooter'] = df['three_pt_pct'] * (1 + df['final_gen_probability'] * 0.15)
-        df['projected_shooter'] = df['projected_shooter'].clip(upper=0.43)
-        
-        df['projected_rebounder'] = df['rpg'] * (1 + df['final_gen_probability'] * 0.3)
-        df['projected_rebounder'] = df['projected_rebounder'].clip(upper=15)
-        
-        df['projected_playmaker'] = df['apg'] * (1 + df['final_gen_probability'] * 0.35)
-        df['projected_playmaker'] = df['projected_playmaker'].clip(upper=12)
-        
-        df['projected_defender'] = (df['spg'] + df['bpg']) * (1 + df['final_gen_probability'] * 0.25)
-        df['projected_defender'] = df['projected_defender'].clip(upper=4)
+        # Counting stats on the selected basis (per game / per 40 / per 100); caps follow the basis
+        basis = select_stat_basis(df, key="leaders_basis")
+        derived = get_derived_metrics(df, get_dataset_version(df), basis)
+        metrics, top_k = derived['metrics'], derived['top_k']
+        stats = apply_stat_basis(df, basis)
         
-        df['immediate_impact'] = (
-            df['ppg'] * 0.25 +
-            df['rpg'] * 0.15 +
-            df['apg'] * 0.20 +
-            (df['three_pt_pct'] * 100) * 0.15 +
-            (22 - df['age']) * 2 +
-            df['final_gen_probability'] * 30
-        )
+        def leader(metric: str) -> Tuple[pd.Series, float]:
+            position = top_k[metric][0]
+            return stats.iloc[position], metrics[metric][position]
         
         # Find leaders
-        best_scorer = df.loc[df['projected_scorer'].idxmax()]
-        best_shooter = df.loc[df['projected_shooter'].idxmax()]
-        best_rebounder = df.loc[df['projected_rebounder'].idxmax()]
-        best_playmaker = df.loc[df['projected_playmaker'].idxmax()]
-        best_defender = df.loc[df['projected_defender'].idxmax()]
-        best_potential = df.loc[df['final_gen_probability'].idxmax()]
-        most_immediate_impact = df.loc[df['immediate_impact'].idxmax()]
+        best_scorer, best_scorer_value = leader('projected_scorer')
+        best_shooter, best_shooter_value = leader('projected_shooter')
+        best_rebounder, best_rebounder_value = leader('projected_rebounder')
+        best_playmaker, best_playmaker_value = leader('projected_playmaker')
+        best_defender, best_defender_value = leader('projected_defender')
+        best_potential, _ = leader('final_gen_probability')
+        most_immediate_impact, _ = leader('immediate_impact')
         
         # Display with streamlit only
         col1, col2, col3 = st.columns(3)
@@ -508,35 +1154,35 @@ def create_leaders_section(df: pd.DataFrame):
         with col1:
             st.info("🎯 **Best Scoring Potential**")
             st.write(f"**{safe_string(best_scorer['name'])}**")
-            st.caption(f"Projected {safe_numeric(best_scorer['projected_scorer']):.1f} PPG peak")
-            st.caption(f"Current: {safe_numeric(best_scorer['ppg']):.1f} PPG")
+            st.caption(f"Projected {best_scorer_value:.1f} {stat_unit('ppg', basis)} peak")
+            st.caption(f"Current: {safe_numeric(best_scorer['ppg']):.1f} {stat_unit('ppg', basis)}")
             
             st.info("🏀 **Best Rebounding Potential**")
             st.write(f"**{safe_string(best_rebounder['name'])}**")
-            st.caption(f"Projected {safe_numeric(best_rebounder['projected_rebounder']):.1f} RPG peak")
-            st.caption(f"Current: {safe_numeric(best_rebounder['rpg']):.1f} RPG")
+            st.caption(f"Projected {best_rebounder_value:.1f} {stat_unit('rpg', basis)} peak")
+            st.caption(f"Current: {safe_numeric(best_rebounder['rpg']):.1f} {stat_unit('rpg', basis)}")
         
         with col2:
             st.info("🎯 **Best Shooting Potential**")
             st.write(f"**{safe_string(best_shooter['name'])}**")
-            st.caption(f"Projected {safe_numeric(best_shooter['projected_shooter']):.1%} 3P% peak")
+            st.caption(f"Projected {best_shooter_value:.1%} 3P% peak")
             st.caption(f"Current: {safe_numeric(best_shooter['three_pt_pct']):.1%} 3P%")
             
             st.info("🛡️ **Best Defensive Potential**")
             st.write(f"**{safe_string(best_defender['name'])}**")
-            st.caption(f"Projected {safe_numeric(best_defender['projected_defender']):.1f} STL+BLK peak")
-            st.caption(f"Current: {safe_numeric(best_defender['spg'] + best_defender['bpg']):.1f} STL+BLK")
+            st.caption(f"Projected {best_defender_value:.1f} {stat_unit('stocks', basis)} peak")
+            st.caption(f"Current: {safe_numeric(best_defender['spg'] + best_defender['bpg']):.1f} {stat_unit('stocks', basis)}")
         
         with col3:
             st.info("🎯 **Best Playmaking Potential**")
             st.write(f"**{safe_string(best_playmaker['name'])}**")
-            st.caption(f"Projected {safe_numeric(best_playmaker['projected_playmaker']):.1f} APG peak")
-            st.caption(f"Current: {safe_numeric(best_playmaker['apg']):.1f} APG")
+            st.caption(f"Projected {best_playmaker_value:.1f} {stat_unit('apg', basis)} peak")
+            st.caption(f"Current: {safe_numeric(best_playmaker['apg']):.1f} {stat_unit('apg', basis)}")
             
             st.success("⚡ **Most Immediate Impact**")
             st.write(f"**{safe_string(most_immediate_impact['name'])}**")
             st.caption("Ready to contribute Year 1")
-            st.caption(f"{safe_numeric(most_immediate_impact['ppg']):.1f} PPG • Age {safe_numeric(most_immediate_impact['age']):.0f}")
+            st.caption(f"{safe_numeric(most_immediate_impact['ppg']):.1f} {stat_unit('ppg', basis)} • Age {safe_numeric(most_immediate_impact['age']):.0f}")
         
         # Highest Ceiling centrée
         st.markdown("---")
@@ -546,6 +1192,14 @@ def create_leaders_section(df: pd.DataFrame):
             st.write(f"**{safe_string(best_potential['name'])}**")
             st.caption(f"{safe_numeric(best_potential['final_gen_probability']):.1%} Generational Talent Probability")
         
+        # Runners-up from the precomputed top-k positions
+        with st.expander(f"📋 Top {LEADER_TOP_K} by category"):
+            names = df['name'].to_numpy()
+            st.dataframe(pd.DataFrame({
+                label: [f"{names[p]} ({metrics[metric][p]:.2f})" for p in top_k[metric]]
+                for metric, label in LEADER_METRICS.items()
+            }, index=range(1, len(top_k['final_gen_probability']) + 1)), use_container_width=True)
+        
     except Exception as e:
         st.error(f"Error in leaders section: {e}")
 
@@ -559,6 +1213,10 @@ def create_enhanced_search_with_stats(df: pd.DataFrame):
         placeholder="Search by name, college, or keywords...",
         help="Search across player names, colleges, and archetypes"
     )
+    search_reports = st.checkbox(
+        "Also match scouting reports (strengths, weaknesses, NBA comparisons)",
+        key="search_reports"
+    )
     
     # Filtres en ligne
     col1, col2, col3, col4 = st.columns([3, 2, 2, 2])
@@ -617,11 +1275,14 @@ def create_enhanced_search_with_stats(df: pd.DataFrame):
         )
         if 'archetype' in filtered_df.columns:
             mask |= filtered_df['archetype'].str.contains(search_term, case=False, na=False)
+        if search_reports:
+            report_matches = find_similar_prospects(df, query=search_term, k=len(df))
+            mask |= filtered_df.index.isin(report_matches.index)
         filtered_df = filtered_df[mask]
     
     # Position filter
     if selected_positions:
-        filtered_df = filtered_df[filtered_df['position'].isin(selected_positions)]
+        filtered_df = filtered_df[plays_position(filtered_df, selected_positions)]
     
     # Stats filters
     filtered_df = filtered_df[filtered_df['ppg'] >= min_ppg]
@@ -645,16 +1306,12 @@ def create_enhanced_search_with_stats(df: pd.DataFrame):
                 key="sort_select"
             )
     
-    # Apply sorting
+    # Apply sorting: slice the precomputed order instead of re-sorting
     if len(filtered_df) > 0:
-        if sort_by == "Draft Rank":
-            filtered_df = filtered_df.sort_values('final_rank')
-        elif sort_by == "PPG":
-            filtered_df = filtered_df.sort_values('ppg', ascending=False)
-        elif sort_by == "Potential":
-            filtered_df = filtered_df.sort_values('final_gen_probability', ascending=False)
-        elif sort_by == "Name":
-            filtered_df = filtered_df.sort_values('name')
+        sort_metrics = {"Draft Rank": 'final_rank', "PPG": 'ppg', "Potential": 'final_gen_probability', "Name": 'name'}
+        leaderboard = get_leaderboard_index(df, get_dataset_version(df))
+        rows = leaderboard_slice(leaderboard, sort_metrics[sort_by], 0, 50, mask=get_row_mask(df, filtered_df))
+        filtered_df = filtered_df.loc[df.index[rows]]
     
     # Display results in clean table format
     display_search_results_table(filtered_df.head(50))  # Limite à 50 résultats
@@ -753,6 +1410,8 @@ def display_search_results_table(df: pd.DataFrame):
 
 def show_quick_stats_viz(df: pd.DataFrame):
     """Show quick stats visualization for search results"""
+    import plotly.express as px
+    
     col1, col2 = st.columns(2)
     
     with col1:
@@ -905,21 +1564,20 @@ def display_player_card(player: pd.Series):
     </div>
     """, unsafe_allow_html=True)
 
-def create_realistic_projections(df: pd.DataFrame):
-    """Create more realistic 5-year projections with varied growth curves"""
-    st.markdown("### 🔮 Realistic Development Projections")
-    
-    selected_player = st.selectbox("Select a player for projection:", df['name'].head(20).tolist())
-    player_data = df[df['name'] == selected_player].iloc[0]
-    
+def project_player_development(player: pd.Series, player_name: str) -> Dict[str, Any]:
+    """5-year stat projections and headline outcomes for one player"""
     # Extract player attributes
-    current_ppg = safe_numeric(player_data.get('ppg', 0))
-    current_rpg = safe_numeric(player_data.get('rpg', 0))
-    current_apg = safe_numeric(player_data.get('apg', 0))
-    age = safe_numeric(player_data.get('age', 19))
-    position = safe_string(player_data.get('position', 'N/A'))
-    archetype = safe_string(player_data.get('archetype', 'N/A'))
-    gen_probability = safe_numeric(player_data.get('final_gen_probability', 0.5))
+    current_ppg = safe_numeric(player.get('ppg', 0))
+    current_rpg = safe_numeric(player.get('rpg', 0))
+    current_apg = safe_numeric(player.get('apg', 0))
+    age = safe_numeric(player.get('age', 19))
+    position = safe_string(player.get('position', 'N/A'))
+    archetype = safe_string(player.get('archetype', 'N/A'))
+    gen_probability = safe_numeric(player.get('final_gen_probability', 0.5))
+    
+    # Variance is seeded per player so the projection (and its cached chart) is stable across reruns
+    seed = int(hashlib.md5(player_name.encode()).hexdigest()[:8], 16)
+    rng = np.random.default_rng(seed)
     
     def project_stat_growth(current: float, stat_type: str, position: str, age: float, 
                            gen_prob: float, archetype: str) -> List[float]:
@@ -968,7 +1626,7 @@ def create_realistic_projections(df: pd.DataFrame):
         projected_values = []
         for i, base_mult in enumerate(base_curve):
             # Add slight randomness to make projections unique
-            random_factor = 1.0 + (np.random.random() - 0.5) * 0.1
+            random_factor = 1.0 + (rng.random() - 0.5) * 0.1
             
             # Calculate final value
             final_mult = base_mult * age_factor * talent_factor * arch_adjustment * random_factor
@@ -992,90 +1650,129 @@ def create_realistic_projections(df: pd.DataFrame):
     projected_rpg = project_stat_growth(current_rpg, 'rpg', position, age, gen_probability, archetype)
     projected_apg = project_stat_growth(current_apg, 'apg', position, age, gen_probability, archetype)
     
+    # Headline outcomes
+    ppg_growth = ((projected_ppg[-1] - projected_ppg[0]) / projected_ppg[0] * 100) if projected_ppg[0] > 0 else 0
+    peak_year = years[projected_ppg.index(max(projected_ppg))]
+    
+    # More nuanced All-Star probability
+    peak_stats_sum = max(projected_ppg) + max(projected_rpg) + max(projected_apg)
+    all_star_base = min(80, max(5, (peak_stats_sum - 20) * 2.5))
+    all_star_prob = all_star_base * (0.7 + gen_probability * 0.6)
+    all_star_prob = min(95, max(5, all_star_prob))
+    
+    # MVP probability with more realistic calculation
+    mvp_threshold = max(projected_ppg) * 1.2 + max(projected_rpg) * 0.8 + max(projected_apg) * 1.0
+    mvp_base = max(0, (mvp_threshold - 35) * 1.5)
+    mvp_prob = mvp_base * gen_probability
+    mvp_prob = min(30, max(0, mvp_prob))
+    
+    return {
+        'years': years,
+        'ppg': projected_ppg,
+        'rpg': projected_rpg,
+        'apg': projected_apg,
+        'overall': [(p*1.5 + r + a*1.2) / 3.7 for p, r, a in zip(projected_ppg, projected_rpg, projected_apg)],
+        'ppg_growth': ppg_growth,
+        'peak_year': peak_year,
+        'all_star_prob': all_star_prob,
+        'mvp_prob': mvp_prob,
+        'age': age,
+        'position': position,
+        'archetype': archetype,
+        'gen_probability': gen_probability
+    }
+
+def create_realistic_projections(df: pd.DataFrame):
+    """Create more realistic 5-year projections with varied growth curves"""
+    st.markdown("### 🔮 Realistic Development Projections")
+    
+    selected_player = st.selectbox("Select a player for projection:", df['name'].head(20).tolist())
+    player_data = df[df['name'] == selected_player].iloc[0]
+    
+    # Projection math lives in project_player_development (shared with the dossier generator)
+    projection = project_player_development(player_data, selected_player)
+    years = projection['years']
+    projected_ppg, projected_rpg, projected_apg = projection['ppg'], projection['rpg'], projection['apg']
+    age, position = projection['age'], projection['position']
+    archetype, gen_probability = projection['archetype'], projection['gen_probability']
+    
     # Create visualization
-    fig = make_subplots(
-        rows=2, cols=2,
-        subplot_titles=('Points Per Game', 'Rebounds Per Game', 'Assists Per Game', 'Overall Development'),
-        vertical_spacing=0.15,
-        horizontal_spacing=0.1
-    )
+    def build_projection_figure():
+        import plotly.graph_objects as go
+        from plotly.subplots import make_subplots
+        fig = make_subplots(
+            rows=2, cols=2,
+            subplot_titles=('Points Per Game', 'Rebounds Per Game', 'Assists Per Game', 'Overall Development'),
+            vertical_spacing=0.15,
+            horizontal_spacing=0.1
+        )
     
-    # Add traces
-    fig.add_trace(
-        go.Scatter(x=years, y=projected_ppg, mode='lines+markers', name='PPG',
-                  line=dict(color='#FF6B35', width=4), marker=dict(size=12)),
-        row=1, col=1
-    )
+        # Add traces
+        fig.add_trace(
+            go.Scatter(x=years, y=projected_ppg, mode='lines+markers', name='PPG',
+                      line=dict(color='#FF6B35', width=4), marker=dict(size=12)),
+            row=1, col=1
+        )
     
-    fig.add_trace(
-        go.Scatter(x=years, y=projected_rpg, mode='lines+markers', name='RPG',
-                  line=dict(color='#4361EE', width=4), marker=dict(size=12)),
-        row=1, col=2
-    )
+        fig.add_trace(
+            go.Scatter(x=years, y=projected_rpg, mode='lines+markers', name='RPG',
+                      line=dict(color='#4361EE', width=4), marker=dict(size=12)),
+            row=1, col=2
+        )
     
-    fig.add_trace(
-        go.Scatter(x=years, y=projected_apg, mode='lines+markers', name='APG',
-                  line=dict(color='#10B981', width=4), marker=dict(size=12)),
-        row=2, col=1
-    )
+        fig.add_trace(
+            go.Scatter(x=years, y=projected_apg, mode='lines+markers', name='APG',
+                      line=dict(color='#10B981', width=4), marker=dict(size=12)),
+            row=2, col=1
+        )
     
-    # Overall impact
-    overall_impact = [(p*1.5 + r + a*1.2) / 3.7 for p, r, a in zip(projected_ppg, projected_rpg, projected_apg)]
-    fig.add_trace(
-        go.Scatter(x=years, y=overall_impact, mode='lines+markers', name='Overall',
-                  line=dict(color='#8B5CF6', width=4), marker=dict(size=12)),
-        row=2, col=2
-    )
+        # Overall impact
+        overall_impact = projection['overall']
+        fig.add_trace(
+            go.Scatter(x=years, y=overall_impact, mode='lines+markers', name='Overall',
+                      line=dict(color='#8B5CF6', width=4), marker=dict(size=12)),
+            row=2, col=2
+        )
     
-    fig.update_layout(
-        height=600, 
-        title=f"{selected_player} - Realistic 5-Year Development Projection",
-        showlegend=False
-    )
-    fig.update_xaxes(title_text="NBA Season", tickvals=years, ticktext=[f"Year {y}" for y in years])
+        fig.update_layout(
+            height=600, 
+            title=f"{selected_player} - Realistic 5-Year Development Projection",
+            showlegend=False
+        )
+        fig.update_xaxes(title_text="NBA Season", tickvals=years, ticktext=[f"Year {y}" for y in years])
+        return fig
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_cached_figure("projection_subplots", {'player': selected_player}, get_dataset_version(df),
+                         build_projection_figure, use_container_width=True)
     
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        ppg_growth = ((projected_ppg[-1] - projected_ppg[0]) / projected_ppg[0] * 100) if projected_ppg[0] > 0 else 0
         st.metric(
             "5-Year PPG Growth", 
-            f"+{ppg_growth:.1f}%",
+            f"+{projection['ppg_growth']:.1f}%",
             f"{projected_ppg[0]:.1f} → {projected_ppg[-1]:.1f}"
         )
     
     with col2:
-        peak_year = years[projected_ppg.index(max(projected_ppg))]
         st.metric(
             "Projected Peak", 
-            f"Year {peak_year}",
+            f"Year {projection['peak_year']}",
             f"{max(projected_ppg):.1f} PPG"
         )
     
     with col3:
-        # More nuanced All-Star probability
-        peak_stats_sum = max(projected_ppg) + max(projected_rpg) + max(projected_apg)
-        all_star_base = min(80, max(5, (peak_stats_sum - 20) * 2.5))
-        all_star_prob = all_star_base * (0.7 + gen_probability * 0.6)
-        all_star_prob = min(95, max(5, all_star_prob))
         st.metric(
             "All-Star Probability", 
-            f"{all_star_prob:.0f}%",
+            f"{projection['all_star_prob']:.0f}%",
             "Peak Years"
         )
     
     with col4:
-        # MVP probability with more realistic calculation
-        mvp_threshold = max(projected_ppg) * 1.2 + max(projected_rpg) * 0.8 + max(projected_apg) * 1.0
-        mvp_base = max(0, (mvp_threshold - 35) * 1.5)
-        mvp_prob = mvp_base * gen_probability
-        mvp_prob = min(30, max(0, mvp_prob))
         st.metric(
             "MVP Candidate Chance",
-            f"{mvp_prob:.0f}%",
+            f"{projection['mvp_prob']:.0f}%",
             "Career Peak"
         )
     
@@ -1101,15 +1798,16 @@ def create_team_fit_analysis(df: pd.DataFrame):
         ["Team Perspective", "Player Perspective", "Best Fits Matrix"], 
         horizontal=True
     )
+    basis = select_stat_basis(df, key="team_fit_basis")
     
     if analysis_mode == "Team Perspective":
-        display_team_perspective_analysis(df)
+        display_team_perspective_analysis(df, basis)
     elif analysis_mode == "Player Perspective":
-        display_player_perspective_analysis(df)
+        display_player_perspective_analysis(df, basis)
     else:
-        display_team_player_matrix(df)
+        display_team_player_matrix(df, basis)
 
-def display_team_perspective_analysis(df: pd.DataFrame):
+def display_team_perspective_analysis(df: pd.DataFrame, basis: str = 'per_game'):
     """Display team-focused fit analysis"""
     selected_team = st.selectbox("Select Team:", sorted(list(NBA_TEAMS_ANALYSIS.keys())))
     team_data = NBA_TEAMS_ANALYSIS[selected_team]
@@ -1118,7 +1816,8 @@ def display_team_perspective_analysis(df: pd.DataFrame):
     st.info(f"**Team Context:** {team_data['team_context']}")
     
     # Calculate fits
-    player_fits = calculate_team_fits(df.head(30), team_data)
+    player_fits = calculate_team_fits(apply_stat_basis(df, basis).head(30), team_data,
+                                      basis, get_stat_basis_scale(df, basis))
     player_fits.sort(key=lambda x: x['fit_score'], reverse=True)
     
     # Display best fits
@@ -1155,15 +1854,17 @@ def display_team_perspective_analysis(df: pd.DataFrame):
         </div>
         """, unsafe_allow_html=True)
 
-def display_player_perspective_analysis(df: pd.DataFrame):
+def display_player_perspective_analysis(df: pd.DataFrame, basis: str = 'per_game'):
     """Display player-focused fit analysis"""
     selected_player = st.selectbox("Select Player:", df['name'].head(20).tolist())
-    player_data = df[df['name'] == selected_player].iloc[0]
+    basis_df = apply_stat_basis(df, basis)
+    player_data = basis_df[basis_df['name'] == selected_player].iloc[0]
+    scale = get_stat_basis_scale(df, basis)
     
     # Calculate fits for all teams
     team_fits = []
     for team, team_data in NBA_TEAMS_ANALYSIS.items():
-        fit_data = calculate_player_team_fit(player_data, team_data)
+        fit_data = calculate_player_team_fit(player_data, team_data, basis, scale)
         team_fits.append({
             'team': team,
             'fit_score': fit_data['score'],
@@ -1209,7 +1910,7 @@ def display_player_perspective_analysis(df: pd.DataFrame):
         </div>
         """, unsafe_allow_html=True)
 
-def display_team_player_matrix(df: pd.DataFrame):
+def display_team_player_matrix(df: pd.DataFrame, basis: str = 'per_game'):
     """Display team-player fit matrix"""
     st.markdown("### 🎯 Team-Player Fit Matrix")
     
@@ -1229,34 +1930,40 @@ def display_team_player_matrix(df: pd.DataFrame):
     # Get top 10 players
     players = df['name'].head(10).tolist()
     
-    # Calculate matrix
-    matrix_data = []
-    for player_name in players:
-        player_data = df[df['name'] == player_name].iloc[0]
-        row = []
-        
-        for team in selected_teams:
-            team_data = NBA_TEAMS_ANALYSIS[team]
-            fit_data = calculate_player_team_fit(player_data, team_data)
-            row.append(fit_data['score'])
+    def build_fit_heatmap():
+        import plotly.express as px
+        # Calculate matrix
+        basis_df = apply_stat_basis(df, basis)
+        scale = get_stat_basis_scale(df, basis)
+        matrix_data = []
+        for player_name in players:
+            player_data = basis_df[basis_df['name'] == player_name].iloc[0]
+            row = []
+            
+            for team in selected_teams:
+                team_data = NBA_TEAMS_ANALYSIS[team]
+                fit_data = calculate_player_team_fit(player_data, team_data, basis, scale)
+                row.append(fit_data['score'])
+            
+            matrix_data.append(row)
         
-        matrix_data.append(row)
-    
-    # Create heatmap
-    fig = px.imshow(
-        matrix_data,
-        labels=dict(x="Team", y="Player", color="Fit Score"),
-        x=[team.split()[-1] for team in selected_teams],
-        y=players,
-        color_continuous_scale="RdYlGn",
-        title=f"{selected_division} Division - Team/Player Fit Matrix (%)",
-        aspect="auto"
-    )
-    
-    fig.update_layout(height=500, font=dict(size=12))
-    fig.update_coloraxes(colorbar_title="Fit Score %")
+        # Create heatmap
+        fig = px.imshow(
+            matrix_data,
+            labels=dict(x="Team", y="Player", color="Fit Score"),
+            x=[team.split()[-1] for team in selected_teams],
+            y=players,
+            color_continuous_scale="RdYlGn",
+            title=f"{selected_division} Division - Team/Player Fit Matrix (%)",
+            aspect="auto"
+        )
+        fig.update_layout(height=500, font=dict(size=12))
+        fig.update_coloraxes(colorbar_title="Fit Score %")
+        return fig
     
-    st.plotly_chart(fig, use_container_width=True)
+    render_cached_figure("team_fit_matrix", {'division': selected_division, 'players': players, 'basis': basis},
+                         f"{get_dataset_version(df)}|{get_reference_version()}", build_fit_heatmap,
+                         use_container_width=True)
     
     st.markdown("""
     **Matrix Legend:**
@@ -1265,12 +1972,17 @@ def display_team_player_matrix(df: pd.DataFrame):
     - 🔴 **Red (0-39%)**: Poor fit - player doesn't match team priorities
     """)
 
-def calculate_team_fits(players_df: pd.DataFrame, team_data: Dict) -> List[Dict]:
+def calculate_team_fits(players_df: pd.DataFrame, team_data: Dict, basis: str = 'per_game',
+                        scale: Optional[Dict[str, float]] = None) -> List[Dict]:
     """Calculate fit scores for multiple players with a team"""
     player_fits = []
+    # Positional need for the whole list in one bitwise pass
+    need_scores, need_positions = positional_need_scores(get_position_masks(players_df),
+                                                         team_data['positional_needs'])
     
-    for _, player in players_df.iterrows():
-        fit_data = calculate_player_team_fit(player, team_data)
+    for i, (_, player) in enumerate(players_df.iterrows()):
+        fit_data = calculate_player_team_fit(player, team_data, basis, scale,
+                                             position_need=(need_scores[i], need_positions[i]))
         player_fits.append({
             'name': safe_string(player['name']),
             'position': safe_string(player['position']),
@@ -1281,15 +1993,23 @@ def calculate_team_fits(players_df: pd.DataFrame, team_data: Dict) -> List[Dict]
     
     return player_fits
 
-def calculate_player_team_fit(player: pd.Series, team_data: Dict) -> Dict:
+def calculate_player_team_fit(player: pd.Series, team_data: Dict, basis: str = 'per_game',
+                              scale: Optional[Dict[str, float]] = None,
+                              position_need: Optional[Tuple[float, Optional[str]]] = None) -> Dict:
     """Calculate detailed fit score between a player and team"""
     fit_score = 0
     fit_reasons = []
-    
-    # Position fit
-    position = safe_string(player['position'])
-    if position in team_data['positional_needs']:
-        pos_score = team_data['positional_needs'][position] * 40
+    # Thresholds are per game; scale carries them over to the per-40 / per-100 columns
+    scale = scale or {stat: 1.0 for stat in COUNTING_STATS}
+    
+    # Position fit: best need over every listed position ("SF/PF" counts as SF and as PF)
+    if position_need is None:
+        need_scores, need_positions = positional_need_scores(get_position_masks(player.to_frame().T),
+                                                             team_data['positional_needs'])
+        position_need = (need_scores[0], need_positions[0])
+    need, position = position_need
+    if position is not None:
+        pos_score = float(need) * 40
         fit_score += pos_score
         if pos_score > 20:
             fit_reasons.append(f"Fills {position} need")
@@ -1303,10 +2023,10 @@ def calculate_player_team_fit(player: pd.Series, team_data: Dict) -> Dict:
     rpg = safe_numeric(player.get('rpg', 0))
     
     # Scoring
-    if ppg > 15 and team_data['skill_needs']['scoring'] > 0.6:
+    if ppg > 15 * scale['ppg'] and team_data['skill_needs']['scoring'] > 0.6:
         skill_score = team_data['skill_needs']['scoring'] * 15
         fit_score += skill_score
-        fit_reasons.append(f"Elite scorer ({ppg:.1f} PPG)")
+        fit_reasons.append(f"Elite scorer ({ppg:.1f} {stat_unit('ppg', basis)})")
     
     # Shooting
     if three_pt > 0.35 and team_data['skill_needs']['shooting'] > 0.6:
@@ -1315,23 +2035,23 @@ def calculate_player_team_fit(player: pd.Series, team_data: Dict) -> Dict:
         fit_reasons.append(f"Good shooter ({three_pt:.1%})")
     
     # Playmaking
-    if apg > 5 and team_data['skill_needs']['playmaking'] > 0.6:
+    if apg > 5 * scale['apg'] and team_data['skill_needs']['playmaking'] > 0.6:
         skill_score = team_data['skill_needs']['playmaking'] * 15
         fit_score += skill_score
-        fit_reasons.append(f"Elite playmaker ({apg:.1f} APG)")
+        fit_reasons.append(f"Elite playmaker ({apg:.1f} {stat_unit('apg', basis)})")
     
     # Defense
     defense_impact = spg + bpg
-    if defense_impact > 2 and team_data['skill_needs']['defense'] > 0.6:
+    if defense_impact > 2 * (scale['spg'] + scale['bpg']) / 2 and team_data['skill_needs']['defense'] > 0.6:
         skill_score = team_data['skill_needs']['defense'] * 15
         fit_score += skill_score
-        fit_reasons.append(f"Defensive impact ({defense_impact:.1f} STL+BLK)")
+        fit_reasons.append(f"Defensive impact ({defense_impact:.1f} {stat_unit('stocks', basis)})")
     
     # Rebounding
-    if rpg > 7 and team_data['skill_needs']['rebounding'] > 0.6:
+    if rpg > 7 * scale['rpg'] and team_data['skill_needs']['rebounding'] > 0.6:
         skill_score = team_data['skill_needs']['rebounding'] * 15
         fit_score += skill_score
-        fit_reasons.append(f"Strong rebounder ({rpg:.1f} RPG)")
+        fit_reasons.append(f"Strong rebounder ({rpg:.1f} {stat_unit('rpg', basis)})")
     
     # Normalize score
     fit_score = min(100, max(0, fit_score))
@@ -1340,23 +2060,7 @@ def calculate_player_team_fit(player: pd.Series, team_data: Dict) -> Dict:
 
 def get_latest_draft_intel():
     """Get latest draft intelligence (could be web-scraped)"""
-    return {
-        'last_updated': 'June 25, 2025',
-        'major_moves': [
-            "Cooper Flagg dominant in Hawks workout",
-            "Ace Bailey impresses with improved shot selection",
-            "International prospect surge continues"
-        ],
-        'team_intel': {
-            'Portland Trail Blazers': 'Desperately seeking PG, considering trade up',
-            'Charlotte Hornets': 'Miller twins getting serious looks',
-            'Detroit Pistons': 'May package multiple picks'
-        },
-        'workout_standouts': [
-            {'name': 'VJ Edgecombe', 'note': 'Athletic testing off the charts'},
-            {'name': 'Tre Johnson', 'note': 'Shooting 47% from NBA 3P line'},
-        ]
-    }
+    return get_reference_data('draft_intel')
 
 def display_real_time_updates():
     """Display real-time draft updates"""
@@ -1419,83 +2123,7 @@ def create_what_if_simulator(df: pd.DataFrame):
 
 def get_historical_draft_data():
     """Get historical draft context and adjustment factors"""
-    return {
-        2003: {
-            'description': 'LeBron Era - Athletic Potential Premium',
-            'context': 'Post-Jordan era seeking the next superstar. High school players allowed.',
-            'adjustments': {
-                'athleticism_weight': 1.4,
-                'potential_over_production': 1.3,
-                'size_premium': 1.2,
-                'three_point_devalue': 0.6,
-                'age_bonus': 1.2,  # Younger players valued more
-                'college_production_weight': 0.8
-            },
-            'era_priorities': ['Athletic upside', 'Size', 'Raw potential', 'Defensive length'],
-            'era_deemphasize': ['Three-point shooting', 'Advanced metrics', 'College efficiency'],
-            'notable_picks': ['LeBron James #1', 'Carmelo Anthony #3', 'Chris Bosh #4']
-        },
-        2009: {
-            'description': 'Traditional Big Man Era',
-            'context': 'Centers still highly valued. Analytics revolution beginning.',
-            'adjustments': {
-                'center_premium': 1.3,
-                'traditional_skills': 1.2,
-                'three_point_devalue': 0.7,
-                'post_skills_bonus': 1.3,
-                'defensive_anchor_bonus': 1.2,
-                'pace_space_penalty': 0.8
-            },
-            'era_priorities': ['Post skills', 'Defensive anchors', 'Traditional positions', 'College success'],
-            'era_deemphasize': ['Pace and space', 'Positionless basketball', 'High three-point volume'],
-            'notable_picks': ['Blake Griffin #1', 'Hasheem Thabeet #2', 'James Harden #3']
-        },
-        2014: {
-            'description': 'International/Potential Revolution',
-            'context': 'International players surge. Teams swing for upside over safety.',
-            'adjustments': {
-                'international_bonus': 1.2,
-                'upside_over_floor': 1.4,
-                'skill_over_athleticism': 1.1,
-                'three_point_emerging': 0.9,
-                'versatility_bonus': 1.1,
-                'college_safety_penalty': 0.9
-            },
-            'era_priorities': ['International skill', 'Positional versatility', 'Shooting upside', 'High ceiling'],
-            'era_deemphasize': ['Safe college picks', 'Traditional archetypes', 'Low ceiling players'],
-            'notable_picks': ['Andrew Wiggins #1', 'Jabari Parker #2', 'Joel Embiid #3 (injured)']
-        },
-        2018: {
-            'description': 'Pace & Space Revolution',
-            'context': 'Warriors dynasty peak. Three-point shooting and versatility paramount.',
-            'adjustments': {
-                'three_point_premium': 1.3,
-                'pace_space_fit': 1.4,
-                'versatility_premium': 1.3,
-                'switching_defense': 1.2,
-                'traditional_center_penalty': 0.7,
-                'analytics_heavy': 1.2
-            },
-            'era_priorities': ['Three-point shooting', 'Defensive switching', 'Pace and space fit', 'Versatility'],
-            'era_deemphasize': ['Traditional centers', 'Non-shooters', 'Defensive specialists only'],
-            'notable_picks': ['Deandre Ayton #1', 'Marvin Bagley #2', 'Luka Dončić #3']
-        },
-        2021: {
-            'description': 'Modern Positionless Era',
-            'context': 'COVID-impacted scouting. Two-way versatility and shooting at premium.',
-            'adjustments': {
-                'two_way_premium': 1.4,
-                'shooting_critical': 1.3,
-                'positional_flexibility': 1.3,
-                'limited_scouting_uncertainty': 0.9,
-                'nba_readiness_bonus': 1.1,
-                'defensive_versatility': 1.2
-            },
-            'era_priorities': ['Two-way impact', 'Shooting at size', 'Positional flexibility', 'NBA readiness'],
-            'era_deemphasize': ['One-dimensional players', 'Poor shooters', 'Defensive-only specialists'],
-            'notable_picks': ['Cade Cunningham #1', 'Jalen Green #2', 'Evan Mobley #3']
-        }
-    }
+    return get_reference_data('historical_drafts')
 
 def display_historical_context(year: int, draft_data: dict):
     """Display historical draft context"""
@@ -1524,26 +2152,18 @@ def display_historical_context(year: int, draft_data: dict):
 def simulate_historical_draft(df: pd.DataFrame, year: int, era_data: dict) -> List[dict]:
     """Simulate how prospects would be drafted in historical era"""
     historical_rankings = []
+    # Era-adjusted scores for the whole class in one pass
+    historical_scores, _ = historical_score_steps(historical_score_inputs(df), era_data['adjustments'])
     
-    for _, player in df.iterrows():
+    for i, (_, player) in enumerate(df.iterrows()):
         # Base stats
         name = safe_string(player['name'])
         position = safe_string(player['position'])
-        age = safe_numeric(player.get('age', 20))
-        ppg = safe_numeric(player.get('ppg', 0))
-        rpg = safe_numeric(player.get('rpg', 0))
-        apg = safe_numeric(player.get('apg', 0))
         three_pt = safe_numeric(player.get('three_pt_pct', 0))
-        height = safe_numeric(player.get('height', 0))
         current_rank = int(safe_numeric(player.get('final_rank', 30)))
-        gen_prob = safe_numeric(player.get('final_gen_probability', 0.5))
         archetype = safe_string(player.get('archetype', 'N/A'))
         
-        # Calculate historical score
-        historical_score = calculate_historical_draft_score(
-            position, age, ppg, rpg, apg, three_pt, height, 
-            gen_prob, archetype, era_data['adjustments']
-        )
+        historical_score = float(historical_scores[i])
         
         # Determine movement direction and reasoning
         movement, reasoning = analyze_historical_movement(
@@ -1569,75 +2189,120 @@ def simulate_historical_draft(df: pd.DataFrame, year: int, era_data: dict) -> Li
     
     return historical_rankings
 
-def calculate_historical_draft_score(position: str, age: float, ppg: float, rpg: float, 
+def calculate_historical_draft_score(position: str, age: float, ppg: float, rpg: float,
                                    apg: float, three_pt: float, height: float,
-                                   gen_prob: float, archetype: str, adjustments: dict) -> float:
+                                   gen_prob: float, archetype: str, adjustments: dict,
+                                   player_name: str = '') -> float:
     """Calculate draft score adjusted for historical era"""
+    inputs = {
+        'name': np.array([player_name], dtype=object), 'position': np.array([position], dtype=object),
+        'archetype': np.array([archetype], dtype=object), 'age': np.array([age], dtype=float),
+        'ppg': np.array([ppg], dtype=float), 'rpg': np.array([rpg], dtype=float),
+        'apg': np.array([apg], dtype=float), 'three_pt': np.array([three_pt], dtype=float),
+        'height': np.array([height], dtype=float), 'gen_prob': np.array([gen_prob], dtype=float)
+    }
+    score, _ = historical_score_steps(inputs, adjustments)
+    return float(score[0])
+
+def historical_score_inputs(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Arrays calculate_historical_draft_score reads, for every prospect"""
+    def text(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), 'N/A', dtype=object)
+        return df[col].astype(object).where(df[col].notna(), 'N/A').astype(str).to_numpy(dtype=object)
     
-    # Base score from current metrics
-    base_score = (
-        ppg * 2.0 +
-        rpg * 1.5 +
-        apg * 1.8 +
-        three_pt * 20 +
-        gen_prob * 30 +
-        (22 - age) * 2  # Age bonus
-    )
+    return {
+        'name': text('name'), 'position': text('position'), 'archetype': text('archetype'),
+        'age': numeric_column(df, 'age', 20), 'ppg': numeric_column(df, 'ppg'), 'rpg': numeric_column(df, 'rpg'),
+        'apg': numeric_column(df, 'apg'), 'three_pt': numeric_column(df, 'three_pt_pct'),
+        'height': numeric_column(df, 'height'), 'gen_prob': numeric_column(df, 'final_gen_probability', 0.5)
+    }
+
+def historical_score_steps(x: Dict[str, np.ndarray], adjustments: dict) -> Tuple[np.ndarray, List[Tuple[str, np.ndarray]]]:
+    """Era-adjusted draft score for every prospect, and what each term and adjustment added to it.
+    
+    Steps are recorded in the order they are applied, so they always sum to the final score."""
+    steps = []
+    
+    # Base score from current metrics (weights: SCORING_FORMULAS)
+    w = SCORING_FORMULAS['historical_draft_score']['weights']
+    base_terms = [
+        ('ppg', x['ppg'] * w['ppg']),
+        ('rpg', x['rpg'] * w['rpg']),
+        ('apg', x['apg'] * w['apg']),
+        ('three_pt', x['three_pt'] * w['three_pt']),
+        ('gen_prob', x['gen_prob'] * w['gen_prob']),
+        ('youth', (22 - x['age']) * w['youth'])  # Age bonus
+    ]
+    steps.extend(base_terms)
+    base_score = base_terms[0][1]
+    for _, term in base_terms[1:]:
+        base_score = base_score + term
     
     # Apply era-specific adjustments
     historical_score = base_score
     
+    def apply(adjustment: str, new_score: np.ndarray):
+        nonlocal historical_score
+        steps.append((adjustment, new_score - historical_score))
+        historical_score = new_score
+    
+    def scale_where(adjustment: str, condition: np.ndarray):
+        apply(adjustment, np.where(condition, historical_score * adjustments[adjustment], historical_score))
+    
+    is_center = x['position'] == 'C'
+    
     # Athleticism/potential adjustments
     if 'athleticism_weight' in adjustments:
-        if archetype in ['Athletic Defender', 'Two-Way Wing']:
-            historical_score *= adjustments['athleticism_weight']
+        scale_where('athleticism_weight', np.isin(x['archetype'], ['Athletic Defender', 'Two-Way Wing']))
     
     if 'potential_over_production' in adjustments:
-        potential_factor = gen_prob * adjustments['potential_over_production']
-        production_factor = (ppg / 20) * (2 - adjustments['potential_over_production'])
-        historical_score = historical_score * 0.5 + (potential_factor + production_factor) * 25
+        potential_factor = x['gen_prob'] * adjustments['potential_over_production']
+        production_factor = (x['ppg'] / 20) * (2 - adjustments['potential_over_production'])
+        apply('potential_over_production', historical_score * 0.5 + (potential_factor + production_factor) * 25)
     
     # Position-specific adjustments
-    if 'center_premium' in adjustments and position == 'C':
-        historical_score *= adjustments['center_premium']
+    if 'center_premium' in adjustments:
+        scale_where('center_premium', is_center)
     
-    if 'traditional_center_penalty' in adjustments and position == 'C' and three_pt < 0.25:
-        historical_score *= adjustments['traditional_center_penalty']
+    if 'traditional_center_penalty' in adjustments:
+        scale_where('traditional_center_penalty', is_center & (x['three_pt'] < 0.25))
     
     # Size premium
-    if 'size_premium' in adjustments and height > 6.8:
-        historical_score *= adjustments['size_premium']
+    if 'size_premium' in adjustments:
+        scale_where('size_premium', x['height'] > 80)  # taller than 6'8"
     
     # Three-point adjustments
     if 'three_point_devalue' in adjustments:
-        three_pt_impact = three_pt * 20 * (1 - adjustments['three_point_devalue'])
-        historical_score = historical_score - (three_pt * 20) + three_pt_impact
+        three_pt_impact = x['three_pt'] * w['three_pt'] * (1 - adjustments['three_point_devalue'])
+        apply('three_point_devalue', historical_score - (x['three_pt'] * w['three_pt']) + three_pt_impact)
     
-    if 'three_point_premium' in adjustments and three_pt > 0.35:
-        historical_score *= adjustments['three_point_premium']
+    if 'three_point_premium' in adjustments:
+        scale_where('three_point_premium', x['three_pt'] > 0.35)
     
     # Age adjustments
-    if 'age_bonus' in adjustments and age < 20:
-        historical_score *= adjustments['age_bonus']
+    if 'age_bonus' in adjustments:
+        scale_where('age_bonus', x['age'] < 20)
     
     # International bonus (simplified check)
     if 'international_bonus' in adjustments:
         international_indicators = ['ić', 'ov', 'ez', 'ão', 'é', 'ü']
-        if 'international_bonus' in adjustments and player_name:
-            if any(indicator in player_name.lower() for indicator in international_indicators):
-             historical_score *= adjustments['international_bonus']
+        names = pd.Series(x['name'], dtype=object).astype(str).str.lower()
+        scale_where('international_bonus', names.apply(
+            lambda name: any(indicator in name for indicator in international_indicators)).to_numpy(dtype=bool))
     
     # Versatility adjustments
     if 'versatility_premium' in adjustments:
-        if archetype in ['Two-Way Wing', 'Versatile Guard'] or (apg > 3 and rpg > 5):
-            historical_score *= adjustments['versatility_premium']
+        scale_where('versatility_premium', np.isin(x['archetype'], ['Two-Way Wing', 'Versatile Guard'])
+                    | ((x['apg'] > 3) & (x['rpg'] > 5)))
     
     # Two-way premium
     if 'two_way_premium' in adjustments:
-        if archetype == 'Two-Way Wing' or (ppg > 12 and rpg > 5 and (apg > 3 or three_pt > 0.33)):
-            historical_score *= adjustments['two_way_premium']
+        scale_where('two_way_premium', (x['archetype'] == 'Two-Way Wing')
+                    | ((x['ppg'] > 12) & (x['rpg'] > 5) & ((x['apg'] > 3) | (x['three_pt'] > 0.33))))
     
-    return max(0, historical_score)
+    apply('floor', np.maximum(0, historical_score))
+    return historical_score, steps
 
 def analyze_historical_movement(current_rank: int, historical_score: float, 
                               position: str, archetype: str, era_data: dict) -> tuple:
@@ -1862,6 +2527,8 @@ def display_movement_analysis(current_df: pd.DataFrame, historical_rankings: Lis
 
 def display_movement_visualization(current_df: pd.DataFrame, historical_rankings: List[dict], year: int):
     """Create interactive visualization of rank movements"""
+    import plotly.graph_objects as go
+    
     st.markdown("### 📊 Movement Visualization")
     
     # Prepare data for visualization
@@ -2067,374 +2734,15 @@ def create_complete_smart_historical_comparisons(df: pd.DataFrame, historical_da
         dynamic_comp = generate_dynamic_comparison(player_data, comp_data)
         display_enhanced_player_comparison(selected_player, player_data, dynamic_comp)
     
+    # Real outcomes of comparable picks, from the draft archive
+    display_archive_precedents(player_data)
+    
     # Add comparison insights section
     display_comparison_insights_section(df, comp_data)
 
 def get_accurate_comparison_database():
-    """Base de données de comparaisons historiques CORRIGÉE basée sur les vraies données du dataset"""
-    return {
-       'Cooper Flagg': {
-            'primary_comp': 'Jalen Johnson',
-            'secondary_comp': 'Kevin Garnett',
-            'similarity': 0.87,
-            'trajectory_match': 0.82,
-            'reasoning': 'Versatile 18-year-old PF (19.2/7.5/4.2) with elite two-way impact and leadership. Rare profile combining size, basketball IQ, and impact on both ends of the floor.',
-            'career_path': 'ROTY contender → All-Star by Year 3 → All-NBA candidate',
-            'style_notes': 'Versatile forward who impacts winning through versatility rather than dominant scoring',
-            'development_timeline': '2-3 years to reach All-Star level',
-            'real_data': 'PF, 18 years old, Duke, 19.2 PPG/7.5 RPG/4.2 APG'
-        },
-        
-        'Dylan Harper': {
-            'primary_comp': 'Cade Cunningham',
-            'secondary_comp': 'Jalen Brunson',
-            'similarity': 0.85,
-            'trajectory_match': 0.78,
-            'reasoning': 'Large combo guard (PG/SG, 19 years old) with 19.4/4.6/4.0 stats. NBA-ready size with advanced basketball IQ and strong two-way potential.',
-            'career_path': 'Day 1 starter → All-Star by Year 3 → Franchise cornerstone',
-            'style_notes': 'Big guard who controls tempo and creates for others while being a scoring threat',
-            'development_timeline': '2-3 years to become elite point guard',
-            'real_data': 'PG/SG, 19 years old, Rutgers, 19.4 PPG/4.6 RPG/4.0 APG'
-        },
-        
-        'Ace Bailey': {
-            'primary_comp': 'Brandon Miller',
-            'secondary_comp': 'Michael Porter Jr.',
-            'similarity': 0.82,
-            'trajectory_match': 0.75,
-            'reasoning': 'Scoring wing at 18 years old (SF, 17.6/7.2/1.3) with dynamic scoring potential and good size. Elite shot-making ability with improving all-around game.',
-            'career_path': 'Immediate offense → All-Star by Year 4 → All-NBA peak',
-            'style_notes': 'Scoring wing with potential to score at all three levels',
-            'development_timeline': '3-4 years for All-NBA consideration',
-            'real_data': 'SF, 18 years old, Rutgers, 17.6 PPG/7.2 RPG/1.3 APG'
-        },
-        
-        'Tre Johnson': {
-            'primary_comp': 'Tyler Herro',
-            'secondary_comp': 'Bradley Beal',
-            'similarity': 0.80,
-            'trajectory_match': 0.74,
-            'reasoning': 'Pure scoring guard at 19 years old (SG, 19.9/3.1/2.7) with elite scoring instincts. Excellent shooter with ability to create offense.',
-            'career_path': 'Sixth man → Starter → All-Star consideration',
-            'style_notes': 'Elite shooter who can score in bunches with improving playmaking',
-            'development_timeline': '3-4 years to reach All-Star conversation',
-            'real_data': 'SG, 19 years old, Texas, 19.9 PPG/3.1 RPG/2.7 APG'
-        },
-        
-        'Jeremiah Fears': {
-            'primary_comp': 'Dejounte Murray',
-            'secondary_comp': 'Damian Lillard',
-            'similarity': 0.73,
-            'trajectory_match': 0.70,
-            'reasoning': 'Explosive 18-year-old point guard (PG, 17.1/4.1/4.1) with scoring ability and leadership qualities. Strong rim pressure and clutch gene.',
-            'career_path': 'Instant offense → Starting PG → All-Star potential',
-            'style_notes': 'Aggressive point guard with rim pressure and clutch instincts',
-            'development_timeline': '2-3 years to become elite scoring PG',
-            'real_data': 'PG, 18 years old, Oklahoma, 17.1 PPG/4.1 RPG/4.1 APG'
-        },
-        
-        # LOTTERY TIER (6-14)
-        'VJ Edgecombe': {
-            'primary_comp': 'Andrew Wiggins',
-            'secondary_comp': 'Victor Oladipo',
-            'similarity': 0.78,
-            'trajectory_match': 0.72,
-            'reasoning': 'Athletic wing from Bahamas (SG/SF, 19 years old, 15.0/5.6/3.2) with explosiveness and defensive quickness. High-level athleticism with two-way potential.',
-            'career_path': 'Role player → Key contributor → All-Defense candidate',
-            'style_notes': 'Athletic wing with explosiveness and defensive projection',
-            'development_timeline': '3-4 years to reach peak two-way impact',
-            'real_data': 'SG/SF, 19 years old, Bahamas, Baylor, 15.0 PPG/5.6 RPG/3.2 APG'
-        },
-        
-        'Noa Essengue': {
-            'primary_comp': 'Jerami Grant',
-            'secondary_comp': 'Nicolas Batum',
-            'similarity': 0.72,
-            'trajectory_match': 0.68,
-            'reasoning': 'French forward at 18 years old (PF, 9.7/4.5/1.1) with size, shooting touch, and international experience. Raw but intriguing upside.',
-            'career_path': 'Development → Role player → Solid contributor',
-            'style_notes': 'French forward with shooting touch and versatility in development',
-            'development_timeline': '3-4 years to become solid contributor',
-            'real_data': 'PF, 18 years old, France, Ratiopharm Ulm, 9.7 PPG/4.5 RPG/1.1 APG'
-        },
-        
-        'Kasparas Jakucionis': {
-            'primary_comp': 'Coby White',
-            'secondary_comp': 'Darius Garland',
-            'similarity': 0.76,
-            'trajectory_match': 0.72,
-            'reasoning': 'Lithuanian combo guard at 18 years old (PG/SG, 15.0/5.7/4.7) with size, court vision, and versatility. Modern combo guard with good feel.',
-            'career_path': 'Development → Backup guard → Starting combo guard',
-            'style_notes': 'Versatile guard who can score and facilitate, fits modern combo guard mold',
-            'development_timeline': '2-3 years to become solid NBA contributor',
-            'real_data': 'PG/SG, 18 years old, Lithuania, Illinois, 15.0 PPG/5.7 RPG/4.7 APG'
-        },
-        
-        'Kon Knueppel': {
-            'primary_comp': 'Cameron Johnson',
-            'secondary_comp': 'Duncan Robinson',
-            'similarity': 0.75,
-            'trajectory_match': 0.70,
-            'reasoning': 'Duke shooting wing (SF, 19 years old, 14.4/4.0/2.7) with elite shooting and basketball IQ. Clutch performer with winning background.',
-            'career_path': 'Role player → Solid starter → Reliable contributor',
-            'style_notes': 'Smart wing with elite shooting and clutch gene',
-            'development_timeline': '2-3 years to become reliable starter',
-            'real_data': 'SF, 19 years old, Duke, 14.4 PPG/4.0 RPG/2.7 APG'
-        },
-        
-        'Khaman Maluach': {
-            'primary_comp': 'Dereck Lively',
-            'secondary_comp': 'Clint Capela',
-            'similarity': 0.77,
-            'trajectory_match': 0.73,
-            'reasoning': '18-year-old center from South Sudan (C, 8.6/6.6/0.5) with elite size and rim protection ability. Athletic big with mobility.',
-            'career_path': 'Development → Backup C → Starting rim protector',
-            'style_notes': 'Athletic rim protector with elite size and mobility',
-            'development_timeline': '3-4 years to become elite rim protector',
-            'real_data': 'C, 18 years old, South Sudan, Duke, 8.6 PPG/6.6 RPG/0.5 APG'
-        },
-        
-        'Collin Murray-Boyles': {
-            'primary_comp': 'Julius Randle',
-            'secondary_comp': 'Anthony Mason',
-            'similarity': 0.76,
-            'trajectory_match': 0.71,
-            'reasoning': 'Physical forward at 19 years old (PF, 16.8/8.3/2.4) with physicality and rebounding. Strong face-up game with toughness.',
-            'career_path': 'Role player → Key contributor → Potential All-Star',
-            'style_notes': 'Physical forward with rebounding and developing face-up game',
-            'development_timeline': '2-3 years to become key contributor',
-            'real_data': 'PF, 19 years old, South Carolina, 16.8 PPG/8.3 RPG/2.4 APG'
-        },
-        
-        'Derik Queen': {
-            'primary_comp': 'Alperen Şengün',
-            'secondary_comp': 'Nikola Vučević',
-            'similarity': 0.74,
-            'trajectory_match': 0.70,
-            'reasoning': 'Skilled 20-year-old center (C, 16.5/9.0/1.9) with post skills and passing feel. Good scoring touch with developing range.',
-            'career_path': 'Role player → Solid starter → All-Star consideration',
-            'style_notes': 'Center with post skills and passing ability, good scoring touch',
-            'development_timeline': '3-4 years for All-Star conversation',
-            'real_data': 'C, 20 years old, Maryland, 16.5 PPG/9.0 RPG/1.9 APG'
-        },
-        
-        'Asa Newell': {
-            'primary_comp': 'John Collins',
-            'secondary_comp': 'Aaron Gordon',
-            'similarity': 0.72,
-            'trajectory_match': 0.68,
-            'reasoning': 'Athletic forward at 19 years old (PF/C, 15.4/6.8/0.9) with athleticism and finishing ability. Potential shooting development.',
-            'career_path': 'Development → Role player → Athletic contributor',
-            'style_notes': 'Athletic forward with finishing ability and potential shooting',
-            'development_timeline': '3-4 years to maximize athletic potential',
-            'real_data': 'PF/C, 19 years old, Georgia, 15.4 PPG/6.8 RPG/0.9 APG'
-        },
-        
-        'Liam McNeeley': {
-            'primary_comp': 'Keegan Murray',
-            'secondary_comp': 'Harrison Barnes',
-            'similarity': 0.75,
-            'trajectory_match': 0.70,
-            'reasoning': 'UConn wing (SF/PF, 19 years old, 14.3/6.0/2.3) with winning program background and versatility. High basketball IQ.',
-            'career_path': 'Role player → Solid starter → Reliable contributor',
-            'style_notes': 'Smart wing from winning program with basketball IQ',
-            'development_timeline': '2-3 years to become reliable starter',
-            'real_data': 'SF/PF, 19 years old, UConn, 14.3 PPG/6.0 RPG/2.3 APG'
-        },
-        
-        # FIRST ROUND DEPTH (15-30)
-        'Cedric Coward': {
-            'primary_comp': 'Jarace Walker',
-            'secondary_comp': 'Cam Reddish',
-            'similarity': 0.69,
-            'trajectory_match': 0.65,
-            'reasoning': '21-year-old wing (SF/PF, 11.8/6.2/1.9) with length and defensive tools. Experience and shooting development.',
-            'career_path': 'Role player → Defensive specialist → Key contributor',
-            'style_notes': 'Wing with length and defensive projection, developing shooting',
-            'development_timeline': '2-3 years to become defensive specialist',
-            'real_data': 'SF/PF, 21 years old, Washington State, 11.8 PPG/6.2 RPG/1.9 APG'
-        },
-        
-        'Carter Bryant': {
-            'primary_comp': 'Marcus Morris',
-            'secondary_comp': 'Robert Covington',
-            'similarity': 0.68,
-            'trajectory_match': 0.64,
-            'reasoning': 'Arizona wing (SF, 19 years old, 6.5/4.1/1.0) with athletic tools and defensive potential. 3&D development path.',
-            'career_path': 'Development → Role player → 3&D specialist',
-            'style_notes': 'Wing with athletic tools and 3&D projection',
-            'development_timeline': '3-4 years to develop NBA role',
-            'real_data': 'SF, 19 years old, Arizona, 6.5 PPG/4.1 RPG/1.0 APG'
-        },
-        
-        'Egor Demin': {
-            'primary_comp': 'Josh Giddey',
-            'secondary_comp': 'Deni Avdija',
-            'similarity': 0.74,
-            'trajectory_match': 0.69,
-            'reasoning': 'Russian guard/forward at 19 years old (PG/SF, 10.6/3.9/5.5) with size and exceptional court vision. Elite playmaking ability.',
-            'career_path': 'Development → Playmaker → Starting facilitator',
-            'style_notes': 'Tall facilitator with court vision and exceptional passing',
-            'development_timeline': '3-4 years to maximize playmaking skills',
-            'real_data': 'PG/SF, 19 years old, Russia, BYU, 10.6 PPG/3.9 RPG/5.5 APG'
-        },
-        
-        'Will Riley': {
-            'primary_comp': 'Kyshawn George',
-            'secondary_comp': 'RJ Barrett',
-            'similarity': 0.67,
-            'trajectory_match': 0.63,
-            'reasoning': 'Canadian wing at 19 years old (SF, 12.6/4.1/2.2) with length and developing shooting potential. Flashes of playmaking.',
-            'career_path': 'Development → Role player → Shooting specialist',
-            'style_notes': 'Canadian wing with length and playmaking flashes',
-            'development_timeline': '3-4 years to develop consistency',
-            'real_data': 'SF, 19 years old, Canada, Illinois, 12.6 PPG/4.1 RPG/2.2 APG'
-        },
-        
-        'Jase Richardson': {
-            'primary_comp': 'Reed Sheppard',
-            'secondary_comp': 'Austin Reaves',
-            'similarity': 0.71,
-            'trajectory_match': 0.68,
-            'reasoning': '19-year-old guard (SG, 12.1/3.3/1.9) with shooting and basketball IQ. NBA bloodline advantage with efficient play.',
-            'career_path': 'Development → Role player → Shooting specialist',
-            'style_notes': 'Smart shooter with efficiency and NBA bloodline advantage',
-            'development_timeline': '2-3 years to carve out NBA role',
-            'real_data': 'SG, 19 years old, Michigan State, 12.1 PPG/3.3 RPG/1.9 APG'
-        },
-        
-        'Rasheer Fleming': {
-            'primary_comp': 'Taylor Hendricks',
-            'secondary_comp': 'Jonathan Isaac',
-            'similarity': 0.70,
-            'trajectory_match': 0.66,
-            'reasoning': '20-year-old forward (PF, 10.6/7.1/1.3) with length and solid mid-major production. Shooting development potential.',
-            'career_path': 'Development → Role player → Stretch four',
-            'style_notes': 'Forward with length and shooting, consistent production',
-            'development_timeline': '3-4 years to become reliable stretch four',
-            'real_data': 'PF, 20 years old, Saint Joseph\'s, 10.6 PPG/7.1 RPG/1.3 APG'
-        },
-        
-        'Nique Clifford': {
-            'primary_comp': 'Cody Martin',
-            'secondary_comp': 'PJ Tucker',
-            'similarity': 0.68,
-            'trajectory_match': 0.64,
-            'reasoning': '23-year-old veteran (SF/PF, 10.1/5.9/2.4) with experience and versatility. Ready to contribute immediately.',
-            'career_path': 'Ready contributor → Role player → Veteran presence',
-            'style_notes': 'Experienced player with versatility and rebounding',
-            'development_timeline': 'Ready immediately for NBA role',
-            'real_data': 'SF/PF, 23 years old, Colorado State, 10.1 PPG/5.9 RPG/2.4 APG'
-        },
-        
-        'Maxime Raynaud': {
-            'primary_comp': 'Quentin Post',
-            'secondary_comp': 'Rudy Gobert',
-            'similarity': 0.71,
-            'trajectory_match': 0.67,
-            'reasoning': 'French center at 22 years old (C, 12.6/7.7/1.3) with size and post skills. Good production and passing ability.',
-            'career_path': 'Development → Backup C → Starting center',
-            'style_notes': 'French center with size and post skills, passing ability',
-            'development_timeline': '2-3 years for NBA adaptation',
-            'real_data': 'C, 22 years old, France, Stanford, 12.6 PPG/7.7 RPG/1.3 APG'
-        },
-        
-        'Walter Clayton Jr.': {
-            'primary_comp': 'Fred VanVleet',
-            'secondary_comp': 'Cole Anthony',
-            'similarity': 0.72,
-            'trajectory_match': 0.69,
-            'reasoning': '22-year-old combo guard (PG/SG, 18.3/3.4/4.2) with clutch shooting and fearless mentality. Experienced leader.',
-            'career_path': 'Ready contributor → Sixth man → Starting guard',
-            'style_notes': 'Experienced guard with clutch gene and leadership',
-            'development_timeline': 'Ready immediately for contribution',
-            'real_data': 'PG/SG, 22 years old, Florida, 18.3 PPG/3.4 RPG/4.2 APG'
-        },
-        
-        'Thomas Sorber': {
-            'primary_comp': 'Onyeka Okongwu',
-            'secondary_comp': 'Daniel Gafford',
-            'similarity': 0.70,
-            'trajectory_match': 0.66,
-            'reasoning': '19-year-old center (C, 14.5/8.5/2.4) with post skills and defensive activity. Good size and passing for position.',
-            'career_path': 'Development → Backup C → Solid starter',
-            'style_notes': 'Center with post skills and passing, defensive activity',
-            'development_timeline': '3-4 years to become solid starter',
-            'real_data': 'C, 19 years old, Georgetown, 14.5 PPG/8.5 RPG/2.4 APG'
-        },
-        
-        'Joan Beringer': {
-            'primary_comp': 'Nicolas Claxton',
-            'secondary_comp': 'Nic Claxton',
-            'similarity': 0.68,
-            'trajectory_match': 0.64,
-            'reasoning': 'French center at 18 years old (C, 4.7/4.6/0.4) with size and shot-blocking potential. Long-term development project.',
-            'career_path': 'Long development → Backup C → Rim protector',
-            'style_notes': 'Young French center with size and mobility, long-term project',
-            'development_timeline': '4-5 years for significant NBA contribution',
-            'real_data': 'C, 18 years old, France, Cedevita, 4.7 PPG/4.6 RPG/0.4 APG'
-        },
-        
-        'Drake Powell': {
-            'primary_comp': 'Will Barton',
-            'secondary_comp': 'Herb Jones',
-            'similarity': 0.69,
-            'trajectory_match': 0.65,
-            'reasoning': 'UNC wing (SG/SF, 19 years old, 7.4/3.4/1.1) with physical profile and defensive projection. Needs development.',
-            'career_path': 'Development → Role player → Two-way contributor',
-            'style_notes': 'Wing with physical profile and defensive projection',
-            'development_timeline': '3-4 years to develop consistency',
-            'real_data': 'SG/SF, 19 years old, North Carolina, 7.4 PPG/3.4 RPG/1.1 APG'
-        },
-        
-        'Nolan Traore': {
-            'primary_comp': 'Lonzo Ball',
-            'secondary_comp': 'Ricky Rubio',
-            'similarity': 0.74,
-            'trajectory_match': 0.69,
-            'reasoning': 'French point guard at 18 years old (PG, 11.4/1.7/5.2) with exceptional court vision. Elite passing ability.',
-            'career_path': 'Development → Backup PG → Starting floor general',
-            'style_notes': 'French point guard with court vision and elite passing',
-            'development_timeline': '3-4 years to become starting-caliber PG',
-            'real_data': 'PG, 18 years old, France, Saint-Quentin, 11.4 PPG/1.7 RPG/5.2 APG'
-        },
-        
-        'Danny Wolf': {
-            'primary_comp': 'Kelly Olynyk',
-            'secondary_comp': 'Lauri Markkanen',
-            'similarity': 0.71,
-            'trajectory_match': 0.67,
-            'reasoning': '21-year-old forward/center (PF/C, 11.1/7.9/2.5) with size and passing ability. Versatile big with basketball IQ.',
-            'career_path': 'Development → Role player → Stretch big',
-            'style_notes': 'Versatile big with passing and basketball IQ',
-            'development_timeline': '2-3 years for consistent NBA role',
-            'real_data': 'PF/C, 21 years old, Michigan, 11.1 PPG/7.9 RPG/2.5 APG'
-        },
-        
-        'Noah Penda': {
-            'primary_comp': 'Nicolas Batum',
-            'secondary_comp': 'Evan Fournier',
-            'similarity': 0.70,
-            'trajectory_match': 0.66,
-            'reasoning': 'French wing at 20 years old (SF/PF, 10.2/5.1/2.6) with size and versatility. Good basketball IQ and shooting development.',
-            'career_path': 'Development → Role player → Versatile contributor',
-            'style_notes': 'French wing with versatility and basketball IQ',
-            'development_timeline': '3-4 years to maximize versatility',
-            'real_data': 'SF/PF, 20 years old, France, Le Mans, 10.2 PPG/5.1 RPG/2.6 APG'
-        },
-        
-        'Ben Saraf': {
-            'primary_comp': 'Manu Ginóbili',
-            'secondary_comp': 'Goran Dragić',
-            'similarity': 0.68,
-            'trajectory_match': 0.64,
-            'reasoning': 'Israeli combo guard at 19 years old (PG/SG, 11.6/2.8/4.1) with ball-handling and competitiveness. Crafty player with court vision.',
-            'career_path': 'Development → Backup guard → Sixth man',
-            'style_notes': 'Crafty guard with handle and court vision, competitive spirit',
-            'development_timeline': '3-4 years for sixth man role',
-            'real_data': 'PG/SG, 19 years old, Israel, Ratiopharm Ulm, 11.6 PPG/2.8 RPG/4.1 APG'
-        }
-    }
+    """Base de données de comparaisons historiques basée sur les vraies données du dataset"""
+    return get_reference_data('comparison_database')
 
 def display_enhanced_player_comparison(player_name: str, player_data: pd.Series, comp_data: dict):
     """Display enhanced player comparison with real data validation"""
@@ -2538,6 +2846,203 @@ def display_comparison_insights_section(df: pd.DataFrame, comp_data: dict):
         • Comparaisons NBA existantes intégrées quand disponibles
         • Focus sur la précision des profils
         """)
+# ==================== Évaluation des modèles ====================
+# Scoring versions shipped in the rankings file, evaluated against the actual board ('rank')
+MODEL_VERSIONS = {
+    'v21': {'score': 'final_draft_score_v21', 'rank': 'predicted_rank_v21', 'error': 'error_v21'},
+    'v22': {'score': 'score_v22', 'rank': 'predicted_rank_v22', 'error': 'error_v22'}
+}
+EVALUATION_TARGET = 'rank'
+EVALUATION_GROUPS = {'position': 'Position', 'tier': 'Tier', 'class_year': 'Class'}
+RANK_TIERS = [(14, 'Lottery'), (30, 'Late First'), (np.inf, 'Second Round')]
+CALIBRATION_BINS = 5
+
+def get_evaluated_models(df: pd.DataFrame) -> List[str]:
+    """Model versions whose predicted rank (and the target) are present"""
+    if EVALUATION_TARGET not in df.columns:
+        return []
+    return [model for model, cols in MODEL_VERSIONS.items() if cols['rank'] in df.columns]
+
+def rank_tier(ranks: pd.Series) -> pd.Series:
+    """Lottery / Late First / Second Round from a rank"""
+    bounds = [-np.inf] + [bound for bound, _ in RANK_TIERS]
+    return pd.cut(ranks, bounds, labels=[label for _, label in RANK_TIERS]).astype(str)
+
+def build_evaluation_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Long format: one row per (prospect, model) with score, predicted rank and absolute rank error"""
+    models = get_evaluated_models(df)
+    if not models:
+        return pd.DataFrame()
+    target = pd.to_numeric(df[EVALUATION_TARGET], errors='coerce')
+    base = pd.DataFrame({
+        'name': df['name'].astype(str).to_numpy() if 'name' in df.columns else np.arange(len(df)).astype(str),
+        # Combo positions count under their first listed position
+        'position': [(decode_positions(mask) or ['N/A'])[0] for mask in get_position_masks(df)],
+        'tier': rank_tier(target).to_numpy(),
+        'class_year': df['class_year'].astype(str).to_numpy() if 'class_year' in df.columns else 'N/A',
+        'actual_rank': target.to_numpy()
+    }, index=df.index)
+    
+    frames = []
+    for model in models:
+        cols = MODEL_VERSIONS[model]
+        predicted = pd.to_numeric(df[cols['rank']], errors='coerce')
+        frames.append(base.assign(
+            model=model,
+            score=pd.to_numeric(df[cols['score']], errors='coerce') if cols['score'] in df.columns else np.nan,
+            predicted_rank=predicted,
+            # Signed: positive = model ranks the prospect later than the board
+            rank_error=predicted - target,
+            # The shipped error_vXX columns when present (same definition), recomputed otherwise
+            abs_error=pd.to_numeric(df[cols['error']], errors='coerce') if cols['error'] in df.columns
+            else (predicted - target).abs()
+        ))
+    return pd.concat(frames, ignore_index=True)
+
+def summarize_rank_errors(frame: pd.DataFrame, by: List[str]) -> pd.DataFrame:
+    """Error distribution and rank metrics per group, with one vectorized groupby"""
+    grouped = frame.assign(
+        sq_error=frame['abs_error'] ** 2,
+        exact=frame['abs_error'] == 0,
+        within_3=frame['abs_error'] <= 3,
+        within_5=frame['abs_error'] <= 5
+    ).groupby(by, observed=True)
+    summary = grouped.agg(
+        prospects=('abs_error', 'size'),
+        mae=('abs_error', 'mean'),
+        median_error=('abs_error', 'median'),
+        p90_error=('abs_error', lambda e: e.quantile(0.9)),
+        rmse=('sq_error', 'mean'),
+        bias=('rank_error', 'mean'),
+        exact=('exact', 'mean'),
+        within_3=('within_3', 'mean'),
+        within_5=('within_5', 'mean')
+    )
+    summary['rmse'] = np.sqrt(summary['rmse'])
+    return summary.reset_index()
+
+def summarize_rank_agreement(frame: pd.DataFrame) -> pd.DataFrame:
+    """Per model: rank correlation with the board and lottery hit rate"""
+    rows = []
+    for model, group in frame.groupby('model'):
+        valid = group.dropna(subset=['predicted_rank', 'actual_rank'])
+        x, y = valid['predicted_rank'].to_numpy(dtype=float), valid['actual_rank'].to_numpy(dtype=float)
+        lottery = (valid['actual_rank'] <= 14).to_numpy()
+        rows.append({
+            'model': model,
+            'spearman': spearman_rho(x, y),
+            'kendall_tau': kendall_tau(x, y),
+            # Share of the real lottery the model also puts in its top 14
+            'lottery_hit_rate': float((valid.loc[lottery, 'predicted_rank'] <= 14).mean()) if lottery.any() else np.nan
+        })
+    return pd.DataFrame(rows)
+
+def calibration_table(frame: pd.DataFrame, bins: int = CALIBRATION_BINS) -> pd.DataFrame:
+    """Score quantile bins per model: mean score vs mean predicted and actual rank"""
+    scored = frame.dropna(subset=['score'])
+    if scored.empty:
+        return pd.DataFrame()
+    scored = scored.assign(score_bin=scored.groupby('model')['score'].transform(
+        lambda s: pd.qcut(s.rank(method='first'), min(bins, len(s)), labels=False) + 1))
+    return scored.groupby(['model', 'score_bin']).agg(
+        prospects=('score', 'size'),
+        mean_score=('score', 'mean'),
+        mean_predicted_rank=('predicted_rank', 'mean'),
+        mean_actual_rank=('actual_rank', 'mean'),
+        mae=('abs_error', 'mean')
+    ).reset_index()
+
+@st.cache_data(show_spinner=False)
+def get_model_evaluation(_df: pd.DataFrame, dataset_version: str) -> Dict[str, pd.DataFrame]:
+    """Error distributions, rank metrics and calibration of every model version, once per dataset version"""
+    frame = build_evaluation_frame(_df)
+    if frame.empty:
+        return {'frame': frame}
+    return {
+        'frame': frame,
+        'overall': summarize_rank_errors(frame, ['model']),
+        'agreement': summarize_rank_agreement(frame),
+        'calibration': calibration_table(frame),
+        **{group: summarize_rank_errors(frame, [group, 'model']) for group in EVALUATION_GROUPS}
+    }
+
+def create_model_evaluation(df: pd.DataFrame):
+    """Compare the v21 and v22 scoring models against the actual board"""
+    st.markdown("### 📐 Model Evaluation")
+    dataset_version = get_dataset_version(df)
+    evaluation = get_model_evaluation(df, dataset_version)
+    if evaluation['frame'].empty:
+        st.info("No model predictions in this dataset (needs predicted_rank_v21 / predicted_rank_v22 and rank)")
+        return
+    
+    overall = evaluation['overall'].merge(evaluation['agreement'], on='model')
+    best = overall.loc[overall['mae'].idxmin(), 'model']
+    cols = st.columns(len(overall))
+    for col, (_, row) in zip(cols, overall.iterrows()):
+        with col:
+            st.metric(f"Model {row['model']} • MAE", f"{row['mae']:.2f} picks",
+                      delta="best" if row['model'] == best else None, delta_color="normal")
+            st.caption(f"Spearman {row['spearman']:.3f} • Kendall τ {row['kendall_tau']:.3f} • "
+                       f"Lottery hits {row['lottery_hit_rate']:.0%}")
+    
+    if 'improvement' in df.columns:
+        improvement = pd.to_numeric(df['improvement'], errors='coerce')
+        st.caption(f"Per prospect, v22 beats v21 on {int((improvement > 0).sum())}, "
+                   f"ties on {int((improvement == 0).sum())} and loses on {int((improvement < 0).sum())}")
+    
+    percent_cols = {col: st.column_config.NumberColumn(col, format="%.0f%%") for col in ['exact', 'within_3', 'within_5']}
+    st.dataframe(
+        overall.assign(**{col: overall[col] * 100 for col in percent_cols}).round(3),
+        use_container_width=True, hide_index=True, column_config=percent_cols
+    )
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        def build_error_distribution():
+            import plotly.express as px
+            fig = px.histogram(evaluation['frame'], x='rank_error', color='model', barmode='overlay',
+                               nbins=30, opacity=0.6, title="Rank error distribution (predicted − actual)")
+            fig.update_layout(height=350)
+            return fig
+        render_cached_figure("model_error_distribution", {}, dataset_version,
+                             build_error_distribution, use_container_width=True)
+    with col2:
+        def build_calibration_chart():
+            import plotly.express as px
+            fig = px.line(evaluation['calibration'], x='mean_score', y='mean_actual_rank', color='model',
+                          markers=True, title="Calibration: score bins vs actual rank")
+            fig.update_yaxes(autorange='reversed')
+            fig.update_layout(height=350)
+            return fig
+        if not evaluation['calibration'].empty:
+            render_cached_figure("model_calibration", {}, dataset_version,
+                                 build_calibration_chart, use_container_width=True)
+    
+    group = st.radio("Break down by:", list(EVALUATION_GROUPS), horizontal=True,
+                     format_func=EVALUATION_GROUPS.get, key="evaluation_group")
+    breakdown = evaluation[group]
+    def build_group_mae():
+        import plotly.express as px
+        fig = px.bar(breakdown, x=group, y='mae', color='model', barmode='group',
+                     title=f"Mean absolute rank error by {EVALUATION_GROUPS[group].lower()}",
+                     hover_data=['prospects', 'bias', 'within_5'])
+        fig.update_layout(height=350)
+        return fig
+    render_cached_figure("model_group_mae", {'group': group}, dataset_version,
+                         build_group_mae, use_container_width=True)
+    with st.expander("📋 Breakdown table"):
+        st.dataframe(breakdown.round(3), use_container_width=True, hide_index=True)
+
+def create_model_lab(df: pd.DataFrame):
+    """Model Lab: evaluate the scoring models behind the board"""
+    st.markdown("## 🧪 Model Lab")
+    st.caption("How the scoring models behind the board perform, and why they rank prospects where they do")
+    create_model_evaluation(df)
+    create_scoring_engine(df)
+    create_formula_weights_panel(df)
+    create_score_attribution(df)
+    create_rank_sensitivity(df)
+
 # ==================== Main Application ====================
 def main():
     """Main application function"""
@@ -2557,7 +3062,7 @@ def main():
     display_draft_countdown()
     
 # Navigation tabs - CORRIGÉ
-    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8 = st.tabs([
+    tab1, tab2, tab3, tab4, tab5, tab6, tab7, tab8, tab9 = st.tabs([
         "🏠 Dashboard",
         "📊 Compare Players", 
         "🔍 Enhanced Search",
@@ -2565,7 +3070,8 @@ def main():
         "💎 Steals & Busts",
         "📈 5-Year Projections", 
         "📊 Historical Intelligence",
-        "🎯 Team Fit Analysis"
+        "🎯 Team Fit Analysis",
+        "🧪 Model Lab"
     ])
     
     with tab1:
@@ -2602,11 +3108,16 @@ def main():
         st.markdown("### 📋 Draft Board Preview")
         
         # View selector
-        view_range = st.selectbox(
-            "View Range:",
-            ["Top 14 (Lottery)", "Top 30 (First Round)", "Full Draft (60)"],
-            key="bigboard_range"
-        )
+        col1, col2 = st.columns(2)
+        with col1:
+            view_range = st.selectbox(
+                "View Range:",
+                ["Top 14 (Lottery)", "Top 30 (First Round)", "Full Draft (60)"],
+                key="bigboard_range"
+            )
+        with col2:
+            movement_window = st.selectbox("Movement since:", list(MOVEMENT_WINDOWS), key="bigboard_movement_window")
+        baseline, movement = get_board_movement(df, MOVEMENT_WINDOWS[movement_window])
         
         # Determine display count
         if view_range == "Top 14 (Lottery)":
@@ -2621,7 +3132,12 @@ def main():
         available_cols = [col for col in display_cols if col in df.columns]
         
         if available_cols:
-            temp_df = df[available_cols].head(display_count).copy()
+            leaderboard = get_leaderboard_index(df, get_dataset_version(df))
+            board_rows = leaderboard_slice(leaderboard, 'final_rank', 0, display_count) \
+                if 'final_rank' in leaderboard['order'] else np.arange(min(display_count, len(df)))
+            temp_df = df.iloc[board_rows][available_cols].copy()
+            if 'player_id' in df.columns:
+                temp_df['movement'] = df['player_id'].iloc[board_rows].map(movement_labels(movement)).fillna('—').to_numpy()
             
             # Format columns
             if 'final_gen_probability' in temp_df.columns:
@@ -2643,7 +3159,8 @@ def main():
                 'rpg': 'RPG',
                 'apg': 'APG',
                 'scout_grade': 'Grade',
-                'final_gen_probability': 'Potential'
+                'final_gen_probability': 'Potential',
+                'movement': 'Movement'
             }
             
             temp_df = temp_df.rename(columns={k: v for k, v in column_rename.items() if k in temp_df.columns})
@@ -2662,11 +3179,19 @@ def main():
                     "RPG": st.column_config.NumberColumn("RPG", format="%.1f", width="small"),
                     "APG": st.column_config.NumberColumn("APG", format="%.1f", width="small"),
                     "Grade": st.column_config.TextColumn("Grade", width="small"),
-                    "Potential": st.column_config.TextColumn("Potential", width="small")
+                    "Potential": st.column_config.TextColumn("Potential", width="small"),
+                    "Movement": st.column_config.TextColumn("📊", width="small")
                 }
             )
+            if baseline is None:
+                st.caption("📸 No earlier board snapshot for this window yet: movement appears once the board changes")
+            else:
+                st.caption(f"📸 Movement vs the board of {baseline['taken_at']:%b %d, %Y %H:%M}")
         else:
             st.error("Unable to display draft board - data columns missing")
+        
+        create_custom_big_board(df, display_count)
+        create_consensus_board(df, display_count)
     
     with tab5:
         create_steals_busts_analysis(df)
@@ -2680,8 +3205,11 @@ def main():
     with tab8:
         create_team_fit_analysis(df)
     
+    with tab9:
+        create_model_lab(df)
+    
     # Footer
-    display_footer()
+    display_footer(record_first_paint())
 
 def display_dashboard(df: pd.DataFrame):
     """Display main dashboard"""
@@ -2720,72 +3248,166 @@ def display_dashboard(df: pd.DataFrame):
     filtered_df = create_interactive_filters(df)
     
     # Visualizations
+    dataset_version = get_dataset_version(df)
+    filter_params = {'rows': get_index_key(filtered_df)}
+    leaderboard = get_leaderboard_index(df, dataset_version)
     col1, col2 = st.columns(2)
     
     with col1:
         if 'position' in filtered_df.columns:
-            position_counts = filtered_df['position'].value_counts()
-            fig_pie = px.pie(
-                values=position_counts.values,
-                names=position_counts.index,
-                title="Distribution by Position",
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
+            def build_position_pie():
+                import plotly.express as px
+                position_counts = filtered_df['position'].value_counts()
+                return px.pie(
+                    values=position_counts.values,
+                    names=position_counts.index,
+                    title="Distribution by Position",
+                    color_discrete_sequence=px.colors.qualitative.Set3
+                )
+            render_cached_figure("dashboard_position_pie", filter_params, dataset_version,
+                                 build_position_pie, use_container_width=True)
     
     with col2:
         # Top prospects by potential
-        top_potential = filtered_df.nlargest(10, 'final_gen_probability')
-        fig_bar = px.bar(
-            top_potential,
-            x='name',
-            y='final_gen_probability',
-            title="Top 10 by Generational Talent Probability",
-            color='final_gen_probability',
-            color_continuous_scale='Viridis',
-            labels={'final_gen_probability': 'Potential'}
-        )
-        fig_bar.update_xaxes(tickangle=45)
-        fig_bar.update_yaxes(tickformat='.0%')
-        st.plotly_chart(fig_bar, use_container_width=True)
+        def build_top_potential_bar():
+            import plotly.express as px
+            top_potential = df.iloc[leaderboard_slice(leaderboard, 'final_gen_probability', 0, 10,
+                                                      mask=get_row_mask(df, filtered_df))]
+            fig_bar = px.bar(
+                top_potential,
+                x='name',
+                y='final_gen_probability',
+                title="Top 10 by Generational Talent Probability",
+                color='final_gen_probability',
+                color_continuous_scale='Viridis',
+                labels={'final_gen_probability': 'Potential'}
+            )
+            fig_bar.update_xaxes(tickangle=45)
+            fig_bar.update_yaxes(tickformat='.0%')
+            return fig_bar
+        render_cached_figure("dashboard_top_potential_bar", filter_params, dataset_version,
+                             build_top_potential_bar, use_container_width=True)
     
     # Prospects table
     display_prospects_table(filtered_df)
+    
+    # Data quality
+    measurement_report = get_measurement_report(df)
+    if len(measurement_report) > 0:
+        flagged = int(measurement_report[['invalid', 'out_of_range']].to_numpy().sum())
+        with st.expander(f"📏 Measurement validation ({flagged} flagged)"):
+            st.dataframe(measurement_report, use_container_width=True, hide_index=True)
+    
+    archetype_model = get_archetype_model(df)
+    if len(archetype_model) > 0:
+        with st.expander(f"🧬 Derived archetypes ({df.attrs['archetype_model']['derived']} prospects)"):
+            st.caption("No archetype in the source file: prospects were clustered in standardized stat space. "
+                       "Centroids are shown in stat units.")
+            st.dataframe(archetype_model.round(2), use_container_width=True)
+
+# ==================== Index des filtres ====================
+# Facet -> (label, options sorted descending?)
+FILTER_FACETS = {
+    'position': ("📍 Position", False),
+    'college': ("🏫 College", False),
+    'scout_grade': ("⭐ Scout Grade", True)
+}
+POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+def bitmap_from_mask(mask: np.ndarray) -> np.ndarray:
+    """Pack a boolean row mask into a bitmap (8 rows per byte)"""
+    return np.packbits(np.asarray(mask, dtype=bool), axis=-1)
+
+def bitmap_count(bitmap: np.ndarray) -> np.ndarray:
+    """Number of rows set in a bitmap (or in each row of a stack of bitmaps)"""
+    return POPCOUNT_TABLE[bitmap].sum(axis=-1)
+
+def bitmap_rows(bitmap: np.ndarray, size: int) -> np.ndarray:
+    """Row positions set in a bitmap"""
+    return np.flatnonzero(np.unpackbits(bitmap, count=size))
+
+@st.cache_resource(max_entries=4)
+def get_facet_index(_df: pd.DataFrame, dataset_version: str) -> Dict[str, Any]:
+    """Per-facet value -> row bitmaps, built once per dataset version (shared, read-only)"""
+    facets = {}
+    for facet, (_, descending) in FILTER_FACETS.items():
+        if facet not in _df.columns:
+            continue
+        if facet == 'position':
+            # One option per base position, from the position masks: "PG" also finds "PG/SG"
+            position_masks = get_position_masks(_df)
+            values = [position for position, bit in POSITION_BITS.items() if (position_masks & bit).any()]
+            masks = ((position_masks[None, :] & np.array([POSITION_BITS[p] for p in values], dtype=np.uint8)[:, None]) != 0)
+        else:
+            codes, values = pd.factorize(_df[facet].astype(str), sort=True)
+            if descending:
+                codes, values = len(values) - 1 - codes, values[::-1]
+            masks = np.zeros((len(values), len(_df)), dtype=bool)
+            masks[codes, np.arange(len(_df))] = True
+        bitmaps = bitmap_from_mask(masks)
+        bitmaps.flags.writeable = False
+        facets[facet] = {'values': tuple(values), 'bitmaps': bitmaps}
+    
+    all_rows = bitmap_from_mask(np.ones(len(_df), dtype=bool))
+    all_rows.flags.writeable = False
+    return {'size': len(_df), 'facets': facets, 'all': all_rows}
+
+def facet_selection_bitmap(index: Dict[str, Any], selections: Dict[str, str],
+                           exclude: Optional[str] = None) -> np.ndarray:
+    """AND of the selected values of every facet except `exclude` ('All' selects everything)"""
+    bitmap = index['all'].copy()
+    for facet, value in selections.items():
+        if facet == exclude or value == 'All' or facet not in index['facets']:
+            continue
+        values = index['facets'][facet]['values']
+        if value in values:
+            bitmap &= index['facets'][facet]['bitmaps'][values.index(value)]
+        else:
+            bitmap[:] = 0
+    return bitmap
+
+def facet_counts(index: Dict[str, Any], facet: str, context: np.ndarray) -> Dict[str, int]:
+    """Rows per option of a facet within the context bitmap"""
+    facet_data = index['facets'][facet]
+    counts = bitmap_count(facet_data['bitmaps'] & context)
+    return dict(zip(facet_data['values'], counts.tolist()))
 
 def create_interactive_filters(df: pd.DataFrame) -> pd.DataFrame:
     """Create interactive filters for the dashboard"""
     st.markdown("### 🔍 Interactive Filters")
     
-    col1, col2, col3, col4 = st.columns(4)
+    index = get_facet_index(df, get_dataset_version(df))
     
-    with col1:
-        positions = ['All'] + sorted(df['position'].unique().tolist())
-        selected_position = st.selectbox("📍 Position", positions)
+    # Current filter state (widgets keep their values in session_state between reruns)
+    prob_min = st.session_state.get('filter_potential', 0.0)
+    potential_bitmap = bitmap_from_mask(df['final_gen_probability'].to_numpy() >= prob_min)
+    selections = {facet: st.session_state.get(f'filter_{facet}', 'All') for facet in index['facets']}
     
-    with col2:
-        colleges = ['All'] + sorted(df['college'].unique().tolist())
-        selected_college = st.selectbox("🏫 College", colleges)
+    col1, col2, col3, col4 = st.columns(4)
     
-    with col3:
-        grades = ['All'] + sorted(df['scout_grade'].unique().tolist(), reverse=True)
-        selected_grade = st.selectbox("⭐ Scout Grade", grades)
+    for column, (facet, (label, _)) in zip((col1, col2, col3), FILTER_FACETS.items()):
+        if facet not in index['facets']:
+            continue
+        # Live counts: every other active filter applies, this facet's own choice does not
+        context = facet_selection_bitmap(index, selections, exclude=facet) & potential_bitmap
+        counts = facet_counts(index, facet, context)
+        total = int(bitmap_count(context))
+        with column:
+            selections[facet] = st.selectbox(
+                label,
+                ['All'] + list(index['facets'][facet]['values']),
+                format_func=lambda value, counts=counts, total=total:
+                    f"{value} ({total if value == 'All' else counts[value]})",
+                key=f'filter_{facet}'
+            )
     
     with col4:
-        prob_min = st.slider("🎯 Min Potential", 0.0, 1.0, 0.0, 0.1)
+        prob_min = st.slider("🎯 Min Potential", 0.0, 1.0, 0.0, 0.1, key='filter_potential')
     
-    # Apply filters
-    filtered_df = df.copy()
-    
-    if selected_position != 'All':
-        filtered_df = filtered_df[filtered_df['position'] == selected_position]
-    
-    if selected_college != 'All':
-        filtered_df = filtered_df[filtered_df['college'] == selected_college]
-    
-    if selected_grade != 'All':
-        filtered_df = filtered_df[filtered_df['scout_grade'] == selected_grade]
-    
-    filtered_df = filtered_df[filtered_df['final_gen_probability'] >= prob_min]
+    # Apply filters: bitmap ANDs, then one positional take
+    potential_bitmap = bitmap_from_mask(df['final_gen_probability'].to_numpy() >= prob_min)
+    selected = facet_selection_bitmap(index, selections) & potential_bitmap
+    filtered_df = df.iloc[bitmap_rows(selected, index['size'])]
     
     st.info(f"📊 {len(filtered_df)} prospects match your filters")
     return filtered_df
@@ -2834,35 +3456,60 @@ def create_player_comparison(df: pd.DataFrame):
     p1_data = df[df['name'] == player1].iloc[0]
     p2_data = df[df['name'] == player2].iloc[0]
     
-    # Create radar chart
-    create_comparison_radar(p1_data, p2_data, player1, player2)
+    # Create radar chart on the selected stat basis
+    basis = select_stat_basis(df, key="comparison_basis")
+    basis_df = apply_stat_basis(df, basis)
+    create_comparison_radar(basis_df[basis_df['name'] == player1].iloc[0],
+                            basis_df[basis_df['name'] == player2].iloc[0],
+                            player1, player2, get_stat_basis_scale(df, basis))
+    
+    # Class ranks (overall and within position) straight from the leaderboard index
+    leaderboard = get_leaderboard_index(df, get_dataset_version(df))
+    rank_lines = []
+    for player_name, player_data in ((player1, p1_data), (player2, p2_data)):
+        row = int(np.flatnonzero(df['name'].to_numpy() == player_name)[0])
+        position = (decode_positions(df['position_mask'].iat[row]) or [None])[0]
+        ranks = [
+            f"{label} #{leaderboard_rank(leaderboard, metric, row)}"
+            + (f" ({position} #{leaderboard_rank(leaderboard, metric, row, position)})" if position else "")
+            for metric, label in (('ppg', 'PPG'), ('rpg', 'RPG'), ('apg', 'APG'), ('final_gen_probability', 'Potential'))
+            if metric in leaderboard['rank']
+        ]
+        rank_lines.append(f"**{player_name}** — " + " • ".join(ranks))
+    st.caption(f"Class ranks out of {leaderboard['size']}:  \n" + "  \n".join(rank_lines))
     
     # Detailed stats comparison
     create_detailed_comparison_table(p1_data, p2_data, player1, player2)
 
 def create_comparison_radar(p1_data: pd.Series, p2_data: pd.Series, 
-                           player1: str, player2: str):
+                           player1: str, player2: str, scale: Optional[Dict[str, float]] = None):
     """Create radar chart for player comparison"""
+    import plotly.graph_objects as go
+    
     categories = ['Scoring', 'Shooting', 'Rebounding', 'Playmaking', 
                  'Defense', 'Efficiency', 'Potential']
     
+    # Per-game caps, carried over to the per-40 / per-100 basis when one is selected
+    scale = scale or {stat: 1.0 for stat in COUNTING_STATS}
+    stocks_scale = (scale['spg'] + scale['bpg']) / 2
+    
     # Calculate normalized values
     p1_values = [
-        min(100, safe_numeric(p1_data['ppg']) / 30 * 100),
+        min(100, safe_numeric(p1_data['ppg']) / (30 * scale['ppg']) * 100),
         safe_numeric(p1_data.get('three_pt_pct', 0)) * 200,
-        min(100, safe_numeric(p1_data['rpg']) / 15 * 100),
-        min(100, safe_numeric(p1_data['apg']) / 10 * 100),
-        min(100, (safe_numeric(p1_data.get('spg', 0)) + safe_numeric(p1_data.get('bpg', 0))) / 4 * 100),
+        min(100, safe_numeric(p1_data['rpg']) / (15 * scale['rpg']) * 100),
+        min(100, safe_numeric(p1_data['apg']) / (10 * scale['apg']) * 100),
+        min(100, (safe_numeric(p1_data.get('spg', 0)) + safe_numeric(p1_data.get('bpg', 0))) / (4 * stocks_scale) * 100),
         safe_numeric(p1_data.get('ts_pct', 0.5)) * 100,
         safe_numeric(p1_data.get('final_gen_probability', 0.5)) * 100
     ]
     
     p2_values = [
-        min(100, safe_numeric(p2_data['ppg']) / 30 * 100),
+        min(100, safe_numeric(p2_data['ppg']) / (30 * scale['ppg']) * 100),
         safe_numeric(p2_data.get('three_pt_pct', 0)) * 200,
-        min(100, safe_numeric(p2_data['rpg']) / 15 * 100),
-        min(100, safe_numeric(p2_data['apg']) / 10 * 100),
-        min(100, (safe_numeric(p2_data.get('spg', 0)) + safe_numeric(p2_data.get('bpg', 0))) / 4 * 100),
+        min(100, safe_numeric(p2_data['rpg']) / (15 * scale['rpg']) * 100),
+        min(100, safe_numeric(p2_data['apg']) / (10 * scale['apg']) * 100),
+        min(100, (safe_numeric(p2_data.get('spg', 0)) + safe_numeric(p2_data.get('bpg', 0))) / (4 * stocks_scale) * 100),
         safe_numeric(p2_data.get('ts_pct', 0.5)) * 100,
         safe_numeric(p2_data.get('final_gen_probability', 0.5)) * 100
     ]
@@ -2969,27 +3616,1358 @@ def create_detailed_comparison_table(p1: pd.Series, p2: pd.Series,
         st.dataframe(physical_stats, use_container_width=True, hide_index=True)
 
 
-def display_draft_summary(draft_order: pd.DataFrame):
-    """Display draft summary statistics"""
-    st.markdown("### 📊 Draft Summary")
-    
+def display_draft_summary(draft_order: pd.DataFrame):
+    """Display draft summary statistics"""
+    st.markdown("### 📊 Draft Summary")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        lottery_avg = draft_order.head(14)['final_gen_probability'].mean()
+        st.metric("Lottery Avg Potential", f"{lottery_avg:.1%}")
+    
+    with col2:
+        guards = int(plays_position(draft_order.head(30), 'Guards').sum())
+        st.metric("Guards in 1st Round", guards)
+    
+    with col3:
+        bigs = int(plays_position(draft_order.head(30), 'Bigs').sum())
+        st.metric("Bigs in 1st Round", bigs)
+    
+    with col4:
+        elite = len(draft_order.head(30)[draft_order.head(30)['final_gen_probability'] > 0.7])
+        st.metric("Elite Prospects Top 30", elite)
+
+# ==================== Big board personnalisé ====================
+SCOUT_GRADE_POINTS = {
+    'A+': 4.3, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
+    'F': 0.0
+}
+# Factor -> (label, columns averaged after standardization, higher is better?, default weight)
+BOARD_FACTORS = {
+    'scoring': ("🏀 Scoring", ['ppg'], True, 1.0),
+    'shooting': ("🎯 Shooting", ['three_pt_pct', 'ts_pct'], True, 1.0),
+    'playmaking': ("🧠 Playmaking", ['apg'], True, 0.5),
+    'rebounding': ("💪 Rebounding", ['rpg'], True, 0.5),
+    'defense': ("🛡️ Defense", ['spg', 'bpg'], True, 1.0),
+    'youth': ("🌱 Youth", ['age'], False, 0.5),
+    'potential': ("⭐ Potential", ['final_gen_probability'], True, 2.0),
+    'scout_grade': ("📝 Scout Grade", ['scout_grade_points'], True, 1.0),
+    'consensus': ("📋 Consensus Rank", ['final_rank'], False, 2.0)
+}
+
+def scout_grade_points(grades: pd.Series) -> np.ndarray:
+    """Letter grades -> grade points (unknown grades count as a C+)"""
+    return grades.astype(str).str.strip().map(SCOUT_GRADE_POINTS).fillna(SCOUT_GRADE_POINTS['C+']).to_numpy(dtype=float)
+
+@st.cache_resource(max_entries=4)
+def get_board_feature_matrix(_df: pd.DataFrame, dataset_version: str) -> Dict[str, Any]:
+    """Standardized, sign-aligned factor matrix (rows x factors), built once per dataset version"""
+    source = _df.assign(scout_grade_points=scout_grade_points(_df['scout_grade'])) \
+        if 'scout_grade' in _df.columns else _df
+    factors, columns = [], []
+    for factor, (_, cols, higher_is_better, _) in BOARD_FACTORS.items():
+        available = [col for col in cols if col in source.columns]
+        if not available:
+            continue
+        Z, _, _ = standardize_features(source, available)
+        factors.append(factor)
+        columns.append(Z.mean(axis=1) * (1 if higher_is_better else -1))
+    
+    matrix = np.column_stack(columns).astype(np.float32) if columns else np.zeros((len(_df), 0), np.float32)
+    matrix.flags.writeable = False
+    return {'factors': factors, 'matrix': matrix}
+
+def custom_board_scores(features: Dict[str, Any], weights: Dict[str, float]) -> np.ndarray:
+    """One matrix-vector product: weighted mean of the factor z-scores for every prospect"""
+    w = np.array([weights.get(factor, 0.0) for factor in features['factors']], dtype=np.float32)
+    total = np.abs(w).sum()
+    return features['matrix'] @ (w / total if total > 0 else w)
+
+def custom_board_top(scores: np.ndarray, k: int) -> np.ndarray:
+    """Row positions of the k best scores, best first (only the visible slice is sorted)"""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind='stable')]
+
+def create_custom_big_board(df: pd.DataFrame, display_count: int):
+    """Big board re-ranked live from user-set factor weights"""
+    st.markdown("### 🎛️ Custom Big Board")
+    st.caption("Weight what matters to your front office; the board re-ranks instantly")
+    
+    features = get_board_feature_matrix(df, get_dataset_version(df))
+    weights = {}
+    columns = st.columns(3)
+    for i, factor in enumerate(features['factors']):
+        label, _, _, default = BOARD_FACTORS[factor]
+        with columns[i % 3]:
+            weights[factor] = st.slider(label, 0.0, 3.0, default, 0.25, key=f"board_weight_{factor}")
+    
+    scores = custom_board_scores(features, weights)
+    rows = custom_board_top(scores, display_count)
+    board = df.iloc[rows][[col for col in ['name', 'position', 'college', 'final_rank'] if col in df.columns]].copy()
+    board.insert(0, 'Custom Rank', np.arange(1, len(rows) + 1))
+    board['Score'] = scores[rows].round(2)
+    if 'final_rank' in board.columns:
+        board['Δ vs Consensus'] = board['final_rank'].astype(int) - board['Custom Rank']
+    
+    st.dataframe(
+        board.rename(columns={'name': 'Player', 'position': 'Pos', 'college': 'College', 'final_rank': 'Consensus'}),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Score": st.column_config.NumberColumn("Score", format="%.2f", width="small"),
+            "Δ vs Consensus": st.column_config.NumberColumn("Δ vs Consensus", format="%+d", width="small")
+        }
+    )
+
+# ==================== Consensus des classements ====================
+# Competing orderings shipped in the rankings files (column -> board label)
+RANKING_BOARDS = {
+    'final_rank': 'Final',
+    'rank': 'Consensus',
+    'ml_rank': 'ML',
+    'predicted_rank': 'Predicted',
+    'predicted_rank_v21': 'Model v21',
+    'predicted_rank_v22': 'Model v22'
+}
+
+def get_ranking_matrix(df: pd.DataFrame) -> Tuple[List[str], np.ndarray]:
+    """Available boards and their ranks (rows x boards, 1 = best, NaN = unranked)"""
+    boards = [col for col in RANKING_BOARDS if col in df.columns]
+    if not boards:
+        return [], np.empty((len(df), 0))
+    ranks = df[boards].apply(pd.to_numeric, errors='coerce').rank(method='average')
+    return boards, ranks.to_numpy(dtype=float)
+
+def borda_scores(R: np.ndarray) -> np.ndarray:
+    """Borda points: n - rank on every board that ranks the prospect"""
+    return np.nansum(len(R) - R, axis=1)
+
+def kemeny_local_search(R: np.ndarray, order: np.ndarray, max_passes: Optional[int] = None) -> np.ndarray:
+    """Approximate Kemeny order: adjacent swaps while a majority of boards prefers the swap.
+    
+    Odd-even transposition passes compare every adjacent pair at once; the result is
+    locally Kemeny-optimal (no single adjacent swap reduces pairwise disagreement)."""
+    order = order.copy()
+    max_passes = max_passes or len(order)
+    quiet = 0
+    for p in range(max_passes):
+        start = p % 2
+        pairs = (len(order) - start) // 2
+        a, b = order[start:start + 2 * pairs:2], order[start + 1:start + 2 * pairs:2]
+        a_ahead = (R[a] < R[b]).sum(axis=1)
+        b_ahead = (R[b] < R[a]).sum(axis=1)
+        swap = b_ahead > a_ahead
+        if swap.any():
+            positions = start + 2 * np.flatnonzero(swap)
+            order[positions], order[positions + 1] = b[swap], a[swap]
+            quiet = 0
+        else:
+            quiet += 1
+            if quiet == 2:
+                break
+    return order
+
+def count_inversions(values: np.ndarray) -> int:
+    """Pairs i < j with values[i] > values[j], by bottom-up merge sort (O(n log n))"""
+    arr = np.asarray(values, dtype=float).copy()
+    inversions, width = 0, 1
+    while width < len(arr):
+        for start in range(0, len(arr), 2 * width):
+            left, right = arr[start:start + width], arr[start + width:start + 2 * width]
+            if len(right) == 0:
+                continue
+            inversions += int((len(left) - np.searchsorted(left, right, side='right')).sum())
+            # Two sorted runs: the stable sort is a linear merge
+            arr[start:start + 2 * width] = np.sort(arr[start:start + 2 * width], kind='stable')
+        width *= 2
+    return inversions
+
+def tie_pairs(*columns: np.ndarray) -> int:
+    """Pairs tied on every one of the columns"""
+    if len(columns[0]) == 0:
+        return 0
+    _, counts = np.unique(np.column_stack(columns), axis=0, return_counts=True)
+    return int((counts * (counts - 1) // 2).sum())
+
+def kendall_tau(x: np.ndarray, y: np.ndarray) -> float:
+    """Kendall tau-b in O(n log n) (Knight's algorithm: sort on x, count inversions in y)"""
+    order = np.lexsort((y, x))
+    x, y = x[order], y[order]
+    n0 = len(x) * (len(x) - 1) // 2
+    n1, n2 = tie_pairs(x), tie_pairs(y)
+    n3 = tie_pairs(x, y)
+    discordant = count_inversions(y)
+    denominator = np.sqrt(float(n0 - n1) * float(n0 - n2))
+    return float((n0 - n1 - n2 + n3 - 2 * discordant) / denominator) if denominator > 0 else float('nan')
+
+def spearman_rho(x: np.ndarray, y: np.ndarray) -> float:
+    """Spearman correlation (Pearson on re-ranked values)"""
+    rx, ry = pd.Series(x).rank().to_numpy(), pd.Series(y).rank().to_numpy()
+    if len(rx) < 2 or rx.std() == 0 or ry.std() == 0:
+        return float('nan')
+    return float(np.corrcoef(rx, ry)[0, 1])
+
+def aggregate_rankings(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """Borda and approximate Kemeny consensus, per-player disagreement and pairwise board agreement"""
+    boards, R = get_ranking_matrix(df)
+    names = df['name'].astype(str).to_numpy() if 'name' in df.columns else np.arange(len(df)).astype(str)
+    if not boards:
+        return {'players': pd.DataFrame(), 'agreement': pd.DataFrame()}
+    
+    borda = borda_scores(R)
+    borda_order = np.argsort(-borda, kind='stable')
+    kemeny_order = kemeny_local_search(R, borda_order)
+    borda_rank, kemeny_rank = np.empty(len(R), dtype=int), np.empty(len(R), dtype=int)
+    borda_rank[borda_order] = np.arange(1, len(R) + 1)
+    kemeny_rank[kemeny_order] = np.arange(1, len(R) + 1)
+    
+    players = pd.DataFrame({'name': names}, index=df.index)
+    for k, board in enumerate(boards):
+        players[RANKING_BOARDS[board]] = R[:, k]
+    players['Borda'] = borda_rank
+    players['Kemeny'] = kemeny_rank
+    players['rank_std'] = np.nanstd(R, axis=1)
+    players['rank_spread'] = np.nanmax(R, axis=1) - np.nanmin(R, axis=1)
+    
+    agreement = []
+    for i, a in enumerate(boards):
+        for b in boards[i + 1:]:
+            both = ~np.isnan(R[:, boards.index(a)]) & ~np.isnan(R[:, boards.index(b)])
+            x, y = R[both, boards.index(a)], R[both, boards.index(b)]
+            agreement.append({
+                'board_a': RANKING_BOARDS[a], 'board_b': RANKING_BOARDS[b], 'prospects': int(both.sum()),
+                'spearman': spearman_rho(x, y), 'kendall_tau': kendall_tau(x, y)
+            })
+    
+    return {'players': players.sort_values('Kemeny'), 'agreement': pd.DataFrame(agreement)}
+
+@st.cache_data(show_spinner=False)
+def get_rank_consensus(_df: pd.DataFrame, dataset_version: str) -> Dict[str, pd.DataFrame]:
+    """Consensus board and board agreement, once per dataset version"""
+    return aggregate_rankings(_df)
+
+def create_consensus_board(df: pd.DataFrame, display_count: int):
+    """Consensus of every board in the data, with where the boards disagree"""
+    consensus = get_rank_consensus(df, get_dataset_version(df))
+    players, agreement = consensus['players'], consensus['agreement']
+    if players.empty or len(agreement) == 0:
+        return
+    
+    st.markdown("### 🤝 Consensus Board")
+    n_boards = len(set(agreement['board_a']) | set(agreement['board_b']))
+    st.caption(f"Aggregated from {n_boards} boards "
+               "• Kemeny = fewest pairwise disagreements with the boards (local search from Borda)")
+    
+    col1, col2 = st.columns([3, 2])
+    with col1:
+        st.dataframe(
+            players.head(display_count).rename(columns={'name': 'Player', 'rank_std': 'Std', 'rank_spread': 'Spread'}),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Std": st.column_config.NumberColumn("Std", format="%.1f", width="small"),
+                "Spread": st.column_config.NumberColumn("Spread", format="%.0f", width="small")
+            }
+        )
+    with col2:
+        def build_agreement_heatmap():
+            import plotly.express as px
+            labels = list(dict.fromkeys(agreement['board_a'].tolist() + agreement['board_b'].tolist()))
+            matrix = pd.DataFrame(1.0, index=labels, columns=labels)
+            for _, pair in agreement.iterrows():
+                matrix.loc[pair['board_a'], pair['board_b']] = pair['kendall_tau']
+                matrix.loc[pair['board_b'], pair['board_a']] = pair['spearman']
+            fig = px.imshow(matrix.round(2), text_auto=True, zmin=0, zmax=1, color_continuous_scale='Viridis',
+                            title="Board agreement (upper: Kendall τ, lower: Spearman ρ)")
+            fig.update_layout(height=400)
+            return fig
+        render_cached_figure("consensus_agreement", {}, get_dataset_version(df),
+                             build_agreement_heatmap, use_container_width=True)
+    
+    most_disputed = players.nlargest(5, 'rank_spread')
+    st.caption("Most disputed: " + " • ".join(
+        f"{row['name']} (#{row['Kemeny']}, spread {row['rank_spread']:.0f})" for _, row in most_disputed.iterrows()))
+
+# ==================== Moteur de scoring ====================
+# Versioned model artifacts (JSON): linear / logistic coefficients or tree ensembles exported to arrays
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+SCORING_MODEL_PATH = os.environ.get('NBA_DRAFT_SCORING_MODEL', os.path.join(MODEL_DIR, 'prospect_model_v1.json'))
+SCORING_MODEL_KINDS = ('linear', 'logistic', 'tree_ensemble')
+FEATURE_TRANSFORMS: Dict[str, Callable[[pd.Series], np.ndarray]] = {
+    'grade_points': scout_grade_points
+}
+
+def read_only_array(values: Any, dtype: Any = float) -> np.ndarray:
+    """numpy array that cannot be modified in place (shared through st.cache_resource)"""
+    array = np.array(values, dtype=dtype)
+    array.flags.writeable = False
+    return array
+
+@st.cache_resource(max_entries=4)
+def _load_scoring_model(path: str, file_stamp: int) -> Dict[str, Any]:
+    """Parse and validate a model artifact into arrays (shared, read-only)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    artifact = json.loads(raw)
+    kind = artifact.get('kind')
+    if kind not in SCORING_MODEL_KINDS:
+        raise ValueError(f"Unsupported model kind {kind!r} in {os.path.basename(path)}")
+    
+    features = tuple(MappingProxyType(dict(feature)) for feature in artifact['features'])
+    for feature in features:
+        if feature.get('transform') and feature['transform'] not in FEATURE_TRANSFORMS:
+            raise ValueError(f"Unknown feature transform {feature['transform']!r}")
+    n_features = len(features)
+    model = {
+        'name': artifact.get('name', os.path.splitext(os.path.basename(path))[0]),
+        'kind': kind,
+        # Artifact version plus content digest: editing the file without bumping the version still invalidates scores
+        'version': f"{artifact.get('version', '0')}+{hashlib.sha1(raw).hexdigest()[:8]}",
+        'description': artifact.get('description', ''),
+        'target': artifact.get('target'),
+        'training': MappingProxyType(dict(artifact.get('training', {}))),
+        'features': features,
+        'center': read_only_array(artifact.get('center', [0.0] * n_features)),
+        'scale': read_only_array(artifact.get('scale', [1.0] * n_features))
+    }
+    if kind in ('linear', 'logistic'):
+        model['coefficients'] = read_only_array(artifact['coefficients'])
+        model['intercept'] = float(artifact.get('intercept', 0.0))
+        if len(model['coefficients']) != n_features:
+            raise ValueError(f"{n_features} features but {len(model['coefficients'])} coefficients")
+    else:
+        model['trees'] = tuple(
+            MappingProxyType({key: read_only_array(tree[key], int if key in ('feature', 'left', 'right') else float)
+                              for key in ('feature', 'threshold', 'left', 'right', 'value')})
+            for tree in artifact['trees']
+        )
+        model['base_score'] = float(artifact.get('base_score', 0.0))
+        model['link'] = artifact.get('link', 'identity')
+    return MappingProxyType(model)
+
+def get_scoring_model(path: str = SCORING_MODEL_PATH) -> Dict[str, Any]:
+    """Current model artifact, reloaded only when the file changes"""
+    return _load_scoring_model(path, os.stat(path).st_mtime_ns)
+
+def model_feature_matrix(df: pd.DataFrame, model: Dict[str, Any]) -> np.ndarray:
+    """Feature matrix in artifact order; missing columns or values fall back to the training center"""
+    columns = []
+    for k, feature in enumerate(model['features']):
+        col = feature['column']
+        if col not in df.columns:
+            columns.append(np.full(len(df), model['center'][k]))
+        elif feature.get('transform'):
+            columns.append(FEATURE_TRANSFORMS[feature['transform']](df[col]))
+        else:
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float)
+            columns.append(np.where(np.isnan(values), model['center'][k], values))
+    return np.column_stack(columns) if columns else np.empty((len(df), 0))
+
+def evaluate_tree_ensemble(X: np.ndarray, trees: Tuple[Dict[str, np.ndarray], ...]) -> np.ndarray:
+    """Sum of leaf values, every row descending each tree in lockstep (leaves have feature -1)"""
+    rows = np.arange(len(X))
+    total = np.zeros(len(X))
+    for tree in trees:
+        node = np.zeros(len(X), dtype=int)
+        while True:
+            feature = tree['feature'][node]
+            internal = feature >= 0
+            if not internal.any():
+                break
+            go_left = X[rows, np.maximum(feature, 0)] <= tree['threshold'][node]
+            node = np.where(internal, np.where(go_left, tree['left'][node], tree['right'][node]), node)
+        total += tree['value'][node]
+    return total
+
+def score_feature_matrix(model: Dict[str, Any], X: np.ndarray) -> np.ndarray:
+    """Score a whole batch in one vectorized call"""
+    if model['kind'] == 'tree_ensemble':
+        raw = model['base_score'] + evaluate_tree_ensemble(X, model['trees'])
+        return 1 / (1 + np.exp(-raw)) if model['link'] == 'logistic' else raw
+    raw = ((X - model['center']) / model['scale']) @ model['coefficients'] + model['intercept']
+    return 1 / (1 + np.exp(-raw)) if model['kind'] == 'logistic' else raw
+
+def feature_hash(X: np.ndarray) -> str:
+    """Content hash of a feature matrix"""
+    X = np.ascontiguousarray(X, dtype=float)
+    return hashlib.sha1(X.tobytes() + str(X.shape).encode()).hexdigest()[:16]
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _score_cached(model_version: str, features_key: str, _model: Dict[str, Any], _X: np.ndarray) -> np.ndarray:
+    """Scores keyed by (model version, feature hash)"""
+    return score_feature_matrix(_model, _X)
+
+def score_prospects(df: pd.DataFrame, model: Optional[Dict[str, Any]] = None) -> np.ndarray:
+    """Model score for every row of a prospect batch (edited rows and new prospects included)"""
+    model = model or get_scoring_model()
+    X = model_feature_matrix(df, model)
+    return _score_cached(model['version'], feature_hash(X), model, X)
+
+def create_scoring_engine(df: pd.DataFrame):
+    """Rescore the class with the model artifact, and score edited or new prospects"""
+    st.markdown("### ⚙️ Scoring Engine")
+    try:
+        model = get_scoring_model()
+    except (OSError, ValueError, KeyError) as e:
+        st.error(f"Unable to load the scoring model: {e}")
+        return
+    
+    feature_cols = [feature['column'] for feature in model['features']]
+    st.caption(f"**{model['name']}** {model['version']} • {model['kind']} • {len(feature_cols)} features"
+               + (f" • {model['description']}" if model['description'] else ""))
+    
+    scores = score_prospects(df, model)
+    rescored = pd.DataFrame({'Player': df['name'].astype(str), 'Model Score': scores}, index=df.index)
+    target = model['target']
+    if target and target in df.columns:
+        shipped = pd.to_numeric(df[target], errors='coerce')
+        rescored[f'Shipped {target}'] = shipped
+        rescored['Δ'] = scores - shipped
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Agreement with shipped scores", f"r = {np.corrcoef(scores, shipped.fillna(shipped.mean()))[0, 1]:.3f}")
+        with col2:
+            st.metric("Mean absolute difference", f"{np.nanmean(np.abs(rescored['Δ'])):.3f}")
+    with st.expander("📋 Rescored class"):
+        st.dataframe(rescored.sort_values('Model Score', ascending=False).round(3),
+                     use_container_width=True, hide_index=True)
+    
+    # What-if: edit any feature (or add rows for new prospects) and rescore instantly
+    st.markdown("#### ✏️ What-if scoring")
+    st.caption("Edit stats or add rows for new prospects; scores are cached per (model version, features)")
+    editable_cols = ['name'] + [col for col in dict.fromkeys(feature_cols) if col in df.columns]
+    edited = st.data_editor(
+        df[editable_cols].head(10).reset_index(drop=True),
+        num_rows="dynamic",
+        use_container_width=True,
+        key="scoring_what_if"
+    )
+    if len(edited) > 0:
+        edited_scores = edited[['name']].assign(**{'Model Score': score_prospects(edited, model)})
+        st.dataframe(edited_scores.round(3), use_container_width=True, hide_index=True)
+
+# ==================== Formules de scoring ====================
+# The hand-tuned scoring formulas as (term -> weight) linear models over a shared term matrix.
+# Defaults are the original coefficients; optimize_weights.py fits alternatives.
+SCORING_FORMULAS = {
+    'historical_draft_score': {
+        'label': "Historical Draft Score",
+        'weights': {'ppg': 2.0, 'rpg': 1.5, 'apg': 1.8, 'three_pt': 20.0, 'gen_prob': 30.0, 'youth': 2.0}
+    },
+    'immediate_impact': {
+        'label': "Immediate Impact",
+        'weights': {'ppg': 0.25, 'rpg': 0.15, 'apg': 0.20, 'three_pt_100': 0.15, 'youth': 2.0, 'gen_prob': 30.0}
+    },
+    'steal_score': {
+        'label': "Steal Score",
+        'weights': {'gen_prob': 50.0, 'skill_efficiency': 0.5, 'age_factor': 10.0, 'shooting_upside': 30.0},
+        # Whole score divided by final_rank * 0.5
+        'row_scale': 'rank_discount'
+    }
+}
+FORMULA_WEIGHTS_PATH = os.path.join(MODEL_DIR, 'formula_weights.json')
+
+def numeric_column(df: pd.DataFrame, col: str, default: float = 0.0) -> np.ndarray:
+    """Column as floats (default when absent)"""
+    if col not in df.columns:
+        return np.full(len(df), default, dtype=float)
+    return pd.to_numeric(df[col], errors='coerce').fillna(default).to_numpy(dtype=float)
+
+# Term -> (label, values for every row)
+FORMULA_TERMS: Dict[str, Tuple[str, Callable[[pd.DataFrame], np.ndarray]]] = {
+    'ppg': ("Scoring", lambda df: numeric_column(df, 'ppg')),
+    'rpg': ("Rebounding", lambda df: numeric_column(df, 'rpg')),
+    'apg': ("Playmaking", lambda df: numeric_column(df, 'apg')),
+    'three_pt': ("Shooting (3P%)", lambda df: numeric_column(df, 'three_pt_pct')),
+    'three_pt_100': ("Shooting (3P% × 100)", lambda df: numeric_column(df, 'three_pt_pct') * 100),
+    'gen_prob': ("Potential", lambda df: numeric_column(df, 'final_gen_probability', 0.5)),
+    'youth': ("Youth (22 − age)", lambda df: 22 - numeric_column(df, 'age', 20)),
+    'skill_efficiency': ("Scoring efficiency", lambda df: (
+        numeric_column(df, 'ppg') / numeric_column(df, 'usage_rate') * 100
+        if 'usage_rate' in df.columns else numeric_column(df, 'ppg'))),
+    'age_factor': ("Age upside", lambda df: 1 + (20 - numeric_column(df, 'age', 20)) * 0.1),
+    'shooting_upside': ("Shooting upside (3P% × FT%)", lambda df: (
+        numeric_column(df, 'three_pt_pct') * numeric_column(df, 'ft_pct')
+        if 'ft_pct' in df.columns else numeric_column(df, 'three_pt_pct')))
+}
+FORMULA_ROW_SCALES: Dict[str, Callable[[pd.DataFrame], np.ndarray]] = {
+    'rank_discount': lambda df: 1 / (numeric_column(df, 'final_rank', 30) * 0.5)
+}
+
+def formula_matrix(df: pd.DataFrame, formula: str) -> Dict[str, Any]:
+    """Term matrix (rows x terms) and per-row scale of a formula"""
+    spec = SCORING_FORMULAS[formula]
+    terms = list(spec['weights'])
+    X = np.column_stack([FORMULA_TERMS[term][1](df) for term in terms]) if len(df) else np.empty((0, len(terms)))
+    row_scale = FORMULA_ROW_SCALES[spec['row_scale']](df) if spec.get('row_scale') else np.ones(len(df))
+    return {'formula': formula, 'terms': terms, 'X': X, 'row_scale': row_scale}
+
+def formula_weight_vector(formula: str, weights: Optional[Dict[str, float]] = None) -> np.ndarray:
+    """Weights in term order (defaults for any term not overridden)"""
+    defaults = SCORING_FORMULAS[formula]['weights']
+    weights = weights or {}
+    return np.array([weights.get(term, default) for term, default in defaults.items()], dtype=float)
+
+def formula_scores(matrix: Dict[str, Any], W: np.ndarray) -> np.ndarray:
+    """Scores for one weight vector (rows,) or a batch of them (rows x candidates)"""
+    W = np.asarray(W, dtype=float)
+    if W.ndim == 1:
+        return (matrix['X'] @ W) * matrix['row_scale']
+    return (matrix['X'] @ W.T) * matrix['row_scale'][:, None]
+
+def load_tuned_formula_weights(path: str = FORMULA_WEIGHTS_PATH) -> Dict[str, Any]:
+    """Weight sets written by optimize_weights.py (empty when it has not been run)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def create_formula_weights_panel(df: pd.DataFrame):
+    """Default coefficients of each scoring formula next to the tuned ones, if any"""
+    st.markdown("### 🎚️ Formula Weights")
+    tuned = load_tuned_formula_weights()
+    if not tuned:
+        st.caption("Original hand-picked coefficients. Run `python optimize_weights.py` to fit them "
+                   "(random + grid search, cross-validated) and compare here.")
+    columns = st.columns(len(SCORING_FORMULAS))
+    for column, (formula, spec) in zip(columns, SCORING_FORMULAS.items()):
+        with column:
+            st.markdown(f"**{spec['label']}**")
+            table = pd.DataFrame({
+                'Term': [FORMULA_TERMS[term][0] for term in spec['weights']],
+                'Default': list(spec['weights'].values())
+            })
+            result = tuned.get('formulas', {}).get(formula)
+            if result:
+                table['Tuned'] = [result['best']['weights'].get(term) for term in spec['weights']]
+            st.dataframe(table, use_container_width=True, hide_index=True)
+            if result:
+                st.caption(f"CV Spearman vs {tuned.get('target', 'target')}: "
+                           f"default {result['default']['cv_mean']:.3f} → tuned {result['best']['cv_mean']:.3f} "
+                           f"(± {result['best']['cv_std']:.3f})"
+                           + (" • fitted without the row scale" if result.get('row_scale') is False else "")
+                           + (" • kept at default (board-derived): "
+                              + ", ".join(FORMULA_TERMS[term][0] for term in result['frozen_terms'])
+                              if result.get('frozen_terms') else ""))
+
+# ==================== Attribution des scores ====================
+ATTRIBUTION_STEP_LABELS = {'floor': "Floor at 0"}
+
+def attribution_label(term: str) -> str:
+    """Display name of a formula term or era adjustment"""
+    if term in FORMULA_TERMS:
+        return FORMULA_TERMS[term][0]
+    return ATTRIBUTION_STEP_LABELS.get(term, f"Era: {term.replace('_', ' ')}")
+
+def score_attribution(df: pd.DataFrame, formula: str, era: Optional[int] = None) -> pd.DataFrame:
+    """Prospect x term contribution matrix; each row sums to the prospect's score.
+    
+    Linear formulas split exactly into weight x term (times the row scale, e.g. the steal
+    score's rank discount). The era-adjusted historical score is attributed step by step:
+    each multiplier or blend gets the change it makes at the point it is applied."""
+    if formula == 'historical_draft_score' and era is not None:
+        adjustments = get_reference_data('historical_drafts')[era]['adjustments']
+        _, steps = historical_score_steps(historical_score_inputs(df), adjustments)
+        terms, columns = [term for term, _ in steps], [values for _, values in steps]
+    else:
+        matrix = formula_matrix(df, formula)
+        contributions = matrix['X'] * formula_weight_vector(formula) * matrix['row_scale'][:, None]
+        terms, columns = matrix['terms'], list(contributions.T)
+    
+    attribution = pd.DataFrame({attribution_label(term): values for term, values in zip(terms, columns)}, index=df.index)
+    # Formula terms always show; era steps that change no score (e.g. the 0 floor) only add noise
+    always = {attribution_label(term) for term in SCORING_FORMULAS[formula]['weights']}
+    return attribution[[col for col in attribution.columns if col in always or attribution[col].any()]]
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_score_attribution(_df: pd.DataFrame, dataset_version: str, formula: str, era: Optional[int],
+                          reference_version: str) -> pd.DataFrame:
+    """Contribution matrix plus name and score, once per dataset, formula and era"""
+    attribution = score_attribution(_df, formula, era)
+    return attribution.assign(
+        name=_df['name'].astype(str).to_numpy() if 'name' in _df.columns else attribution.index.astype(str),
+        score=attribution.sum(axis=1)
+    )
+
+def create_score_attribution(df: pd.DataFrame):
+    """Per-feature breakdown of the scoring formulas for every prospect, with waterfalls"""
+    st.markdown("### 🔍 Score Attribution")
+    col1, col2 = st.columns(2)
+    with col1:
+        formula = st.selectbox("Formula:", list(SCORING_FORMULAS), format_func=lambda f: SCORING_FORMULAS[f]['label'],
+                               key="attribution_formula")
+    era = None
+    with col2:
+        if formula == 'historical_draft_score':
+            era = st.selectbox("Era:", sorted(get_reference_data('historical_drafts')), key="attribution_era")
+    
+    dataset_version = get_dataset_version(df)
+    attribution = get_score_attribution(df, dataset_version, formula, era, get_reference_version())
+    terms = [col for col in attribution.columns if col not in ('name', 'score')]
+    
+    # Class-wide matrix: sorting by a driver is a column sort, not a recomputation
+    driver = st.selectbox("Most driven by:", terms, key="attribution_driver")
+    magnitude = attribution[terms].abs().sum(axis=1).replace(0, np.nan)
+    ranked = attribution.assign(share=attribution[driver].abs() / magnitude).sort_values('share', ascending=False)
+    st.dataframe(
+        ranked[['name', 'score', driver, 'share']].head(10).rename(
+            columns={'name': 'Player', 'score': 'Score', driver: 'Contribution', 'share': 'Share of score'}),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Score": st.column_config.NumberColumn("Score", format="%.2f"),
+            "Contribution": st.column_config.NumberColumn("Contribution", format="%+.2f"),
+            "Share of score": st.column_config.ProgressColumn("Share of score", format="percent", min_value=0, max_value=1)
+        }
+    )
+    
+    player = st.selectbox("Waterfall for:", attribution.sort_values('score', ascending=False)['name'].tolist(),
+                          key="attribution_player")
+    row = attribution[attribution['name'] == player].iloc[0]
+    def build_attribution_waterfall():
+        import plotly.graph_objects as go
+        fig = go.Figure(go.Waterfall(
+            x=terms + ["Score"],
+            y=[row[term] for term in terms] + [row['score']],
+            measure=["relative"] * len(terms) + ["total"],
+            text=[f"{row[term]:+.2f}" for term in terms] + [f"{row['score']:.2f}"],
+            textposition="outside"
+        ))
+        fig.update_layout(title=f"{player} • {SCORING_FORMULAS[formula]['label']}" + (f" ({era} era)" if era else ""),
+                          height=400, showlegend=False)
+        return fig
+    render_cached_figure("score_attribution_waterfall", {'formula': formula, 'era': era, 'player': player},
+                         f"{dataset_version}|{get_reference_version()}", build_attribution_waterfall,
+                         use_container_width=True)
+
+# ==================== Sensibilité des classements ====================
+SENSITIVITY_SAMPLES = 5000
+SENSITIVITY_CHUNK = 1000
+SENSITIVITY_NOISE = 0.10
+SENSITIVITY_INTERVAL = (5, 95)
+
+def perturbed_weights(weights: np.ndarray, samples: int, noise: float, seed: int = 0) -> np.ndarray:
+    """Weight sets with independent multiplicative log-normal noise on every coefficient (samples x terms)"""
+    rng = np.random.default_rng(seed)
+    return weights * np.exp(rng.normal(0.0, noise, size=(samples, len(weights))))
+
+def column_rank_positions(scores: np.ndarray) -> np.ndarray:
+    """1-based rank of every row within each column, highest score first"""
+    order = np.argsort(-scores, axis=0, kind='stable')
+    ranks = np.empty(scores.shape, dtype=np.int32)
+    np.put_along_axis(ranks, order, np.arange(1, len(scores) + 1, dtype=np.int32)[:, None], axis=0)
+    return ranks
+
+def rank_sensitivity(df: pd.DataFrame, formula: str, noise: float = SENSITIVITY_NOISE,
+                     samples: int = SENSITIVITY_SAMPLES, seed: int = 0) -> pd.DataFrame:
+    """Rank interval and neighbor flip probabilities of every prospect under weight perturbations"""
+    matrix = formula_matrix(df, formula)
+    weights = formula_weight_vector(formula)
+    base_scores = formula_scores(matrix, weights)
+    base_order = np.argsort(-base_scores, kind='stable')
+    base_rank = np.empty(len(df), dtype=int)
+    base_rank[base_order] = np.arange(1, len(df) + 1)
+    # Neighbors on the unperturbed board (-1 at the ends)
+    above = np.full(len(df), -1)
+    below = np.full(len(df), -1)
+    above[base_order[1:]] = base_order[:-1]
+    below[base_order[:-1]] = base_order[1:]
+    
+    W = perturbed_weights(weights, samples, noise, seed)
+    ranks = np.empty((len(df), samples), dtype=np.int32)
+    passes_above = np.zeros(len(df))
+    passed_by_below = np.zeros(len(df))
+    rows = np.arange(len(df))
+    for start in range(0, samples, SENSITIVITY_CHUNK):
+        # One batched matrix product per chunk: rows x chunk scores
+        scores = formula_scores(matrix, W[start:start + SENSITIVITY_CHUNK])
+        ranks[:, start:start + len(scores.T)] = column_rank_positions(scores)
+        passes_above += (scores > scores[np.maximum(above, 0)]).sum(axis=1)
+        passed_by_below += (scores[np.maximum(below, 0)] > scores).sum(axis=1)
+    
+    low, high = np.percentile(ranks, SENSITIVITY_INTERVAL, axis=1)
+    return pd.DataFrame({
+        'name': df['name'].astype(str).to_numpy() if 'name' in df.columns else rows.astype(str),
+        'rank': base_rank,
+        'median_rank': np.median(ranks, axis=1),
+        'rank_low': low,
+        'rank_high': high,
+        'flip_up': np.where(above >= 0, passes_above / samples, np.nan),
+        'flip_down': np.where(below >= 0, passed_by_below / samples, np.nan),
+        'p_same_rank': (ranks == base_rank[:, None]).mean(axis=1)
+    }, index=df.index).sort_values('rank')
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def get_rank_sensitivity(_df: pd.DataFrame, dataset_version: str, formula: str, noise: float,
+                         samples: int) -> pd.DataFrame:
+    """Stability bands, once per dataset, formula and perturbation setting"""
+    return rank_sensitivity(_df, formula, noise, samples)
+
+def create_rank_sensitivity(df: pd.DataFrame):
+    """How much each formula's board moves when its coefficients are perturbed"""
+    st.markdown("### 🎲 Rank Sensitivity")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        formula = st.selectbox("Formula:", list(SCORING_FORMULAS), format_func=lambda f: SCORING_FORMULAS[f]['label'],
+                               key="sensitivity_formula")
+    with col2:
+        noise = st.select_slider("Weight noise (σ):", [0.05, 0.10, 0.20, 0.30, 0.50], value=SENSITIVITY_NOISE,
+                                 format_func=lambda v: f"±{v:.0%}", key="sensitivity_noise")
+    with col3:
+        samples = st.select_slider("Samples:", [1000, 5000, 10000], value=SENSITIVITY_SAMPLES, key="sensitivity_samples")
+    st.caption(f"Every coefficient is multiplied by exp(N(0, σ)) in {samples:,} independent draws; "
+               f"bands are the {SENSITIVITY_INTERVAL[0]}th–{SENSITIVITY_INTERVAL[1]}th percentile ranks"
+               + (" (historical score: era-neutral base formula)" if formula == 'historical_draft_score' else ""))
+    
+    dataset_version = get_dataset_version(df)
+    sensitivity = get_rank_sensitivity(df, dataset_version, formula, noise, samples)
+    
+    lottery = sensitivity[sensitivity['rank'] <= 14]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Lottery: mean band width", f"{(lottery['rank_high'] - lottery['rank_low']).mean():.1f} ranks")
+    with col2:
+        st.metric("Lottery: keep exact rank", f"{lottery['p_same_rank'].mean():.0%}")
+    with col3:
+        fragile = sensitivity.loc[sensitivity['flip_up'].idxmax()] if sensitivity['flip_up'].notna().any() else None
+        if fragile is not None:
+            st.metric("Most fragile pair", f"{fragile['name']} ↑ {fragile['flip_up']:.0%}")
+    
+    def build_stability_bands():
+        import plotly.graph_objects as go
+        top = sensitivity.head(30)
+        fig = go.Figure(go.Scatter(
+            x=top['rank'], y=top['median_rank'], mode='markers', text=top['name'],
+            error_y=dict(type='data', symmetric=False, array=top['rank_high'] - top['median_rank'],
+                         arrayminus=top['median_rank'] - top['rank_low']),
+            hovertemplate="%{text}<br>Rank %{x} • median %{y}<extra></extra>"
+        ))
+        fig.update_layout(title="Stability bands (top 30)", xaxis_title="Rank with default weights",
+                          yaxis_title="Rank under perturbation", height=400)
+        fig.update_yaxes(autorange='reversed')
+        return fig
+    render_cached_figure("rank_stability_bands", {'formula': formula, 'noise': noise, 'samples': samples},
+                         dataset_version, build_stability_bands, use_container_width=True)
+    
+    st.dataframe(
+        sensitivity.head(30).rename(columns={
+            'name': 'Player', 'rank': 'Rank', 'median_rank': 'Median', 'rank_low': 'Best (p5)',
+            'rank_high': 'Worst (p95)', 'flip_up': 'P(passes #above)', 'flip_down': 'P(passed by #below)',
+            'p_same_rank': 'P(same rank)'
+        }),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            **{col: st.column_config.NumberColumn(col, format="%.0f") for col in ['Median', 'Best (p5)', 'Worst (p95)']},
+            **{col: st.column_config.ProgressColumn(col, format="percent", min_value=0, max_value=1)
+               for col in ['P(passes #above)', 'P(passed by #below)', 'P(same rank)']}
+        }
+    )
+
+# ==================== Historique du big board ====================
+# Append-only store: one gzip CSV per published board, plus a JSON-lines index ordered by time
+SNAPSHOT_DIR = os.environ.get('NBA_DRAFT_SNAPSHOT_DIR',
+                              os.path.join(os.path.dirname(os.path.abspath(__file__)), 'snapshots'))
+SNAPSHOT_INDEX = 'index.jsonl'
+SNAPSHOT_COLUMNS = ['player_id', 'name', 'position', 'college', 'final_rank', 'final_gen_probability', 'scout_grade']
+SNAPSHOT_INDEX_COLUMNS = ['snapshot_id', 'taken_at', 'file', 'dataset_version', 'board_version', 'rows']
+# Label -> days back (None: the snapshot before the current board)
+MOVEMENT_WINDOWS = {'Previous snapshot': None, 'Last week': 7, 'Last 30 days': 30}
+
+def player_ids(names: pd.Series) -> np.ndarray:
+    """Stable 64-bit id per player, from the name ignoring case, accents and punctuation"""
+    keys = (names.astype(str).str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+            .str.lower().str.replace(r'[^a-z0-9]', '', regex=True))
+    return pd.util.hash_array(keys.to_numpy(dtype=object)).view(np.int64)
+
+def add_player_id_column(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the player_id join key used by board snapshots"""
+    if 'name' in df.columns:
+        df['player_id'] = player_ids(df['name'])
+    return df
+
+def board_snapshot_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """The fields of a board that are kept in a snapshot"""
+    board = df if 'player_id' in df.columns else df.assign(player_id=player_ids(df['name']))
+    return board[[col for col in SNAPSHOT_COLUMNS if col in board.columns]].reset_index(drop=True)
+
+def get_board_version(board: pd.DataFrame) -> str:
+    """Content hash of a snapshot frame: only a change to the published fields makes a new board"""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(board, index=False).values.tobytes())
+    digest.update(','.join(map(str, board.columns)).encode())
+    return digest.hexdigest()[:16]
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _load_snapshot_index(path: str, file_stamp: Tuple[int, int]) -> pd.DataFrame:
+    """Parse the snapshot index (reloaded whenever a snapshot is appended)"""
+    with open(path, encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    index = pd.DataFrame(entries, columns=SNAPSHOT_INDEX_COLUMNS)
+    index['taken_at'] = pd.to_datetime(index['taken_at'])
+    return index.sort_values('taken_at', kind='stable').reset_index(drop=True)
+
+def get_snapshot_index() -> pd.DataFrame:
+    """Every recorded snapshot, oldest first (empty before the first one)"""
+    path = os.path.join(SNAPSHOT_DIR, SNAPSHOT_INDEX)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return pd.DataFrame(columns=SNAPSHOT_INDEX_COLUMNS).astype({'taken_at': 'datetime64[ns]'})
+    return _load_snapshot_index(path, (stat.st_size, stat.st_mtime_ns))
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def load_board_snapshot(filename: str) -> pd.DataFrame:
+    """One snapshot's board (snapshot files are never rewritten, so the name is the cache key)"""
+    return pd.read_csv(os.path.join(SNAPSHOT_DIR, filename), compression='gzip')
+
+def append_board_snapshot(df: pd.DataFrame) -> Optional[Dict[str, Any]]:
+    """Write the board as a new snapshot and append it to the index (None if the store is not writable)"""
+    taken_at = datetime.now().replace(microsecond=0)
+    board = board_snapshot_frame(df)
+    board_version = get_board_version(board)
+    snapshot_id = f"{taken_at:%Y%m%dT%H%M%S}-{board_version[:8]}"
+    entry = {'snapshot_id': snapshot_id, 'taken_at': taken_at.isoformat(), 'file': f"board-{snapshot_id}.csv.gz",
+             'dataset_version': get_dataset_version(df), 'board_version': board_version, 'rows': int(len(df))}
+    path = os.path.join(SNAPSHOT_DIR, entry['file'])
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        # The file is complete before the index points at it
+        board.to_csv(path + '.tmp', index=False, compression='gzip')
+        os.replace(path + '.tmp', path)
+        with open(os.path.join(SNAPSHOT_DIR, SNAPSHOT_INDEX), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry) + '\n')
+    except OSError as e:
+        logger.warning("Board snapshot not recorded: %s", e)
+        return None
+    return entry
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _record_board_snapshot(board_version: str, _df: pd.DataFrame) -> Optional[str]:
+    """Snapshot a board the first time this process sees it, unless it is already the latest one"""
+    index = get_snapshot_index()
+    if len(index) and index['board_version'].iloc[-1] == board_version:
+        return index['snapshot_id'].iloc[-1]
+    entry = append_board_snapshot(_df)
+    return entry['snapshot_id'] if entry else None
+
+def record_board_snapshot(df: pd.DataFrame) -> Optional[str]:
+    """Id of the snapshot holding the current board, publishing it when the board changed (never for demo data)"""
+    if df.attrs.get('demo_data'):
+        return None
+    return _record_board_snapshot(get_board_version(board_snapshot_frame(df)), df)
+
+def snapshot_before(index: pd.DataFrame, when: datetime, exclude_version: Optional[str] = None) -> Optional[pd.Series]:
+    """Latest snapshot taken at or before `when` (skipping those whose board_version is exclude_version)"""
+    position = int(np.searchsorted(index['taken_at'].to_numpy(), np.datetime64(when), side='right'))
+    while position > 0 and index['board_version'].iloc[position - 1] == exclude_version:
+        position -= 1
+    return index.iloc[position - 1] if position > 0 else None
+
+def snapshot_movement(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """Rank change of every player between two boards (positive = moved up), joined on player_id"""
+    merged = after.merge(before[['player_id', 'name', 'final_rank']], on='player_id', how='outer',
+                         suffixes=('', '_before'), indicator=True)
+    merged['name'] = merged['name'].fillna(merged.pop('name_before'))
+    merged['rank_change'] = merged['final_rank_before'] - merged['final_rank']
+    merged['status'] = merged.pop('_merge').map({'both': 'moved', 'left_only': 'new', 'right_only': 'dropped'}).astype(str)
+    return merged
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _board_movement(_df: pd.DataFrame, dataset_version: str, baseline_file: str) -> pd.DataFrame:
+    """Movement of the current board against one snapshot"""
+    return snapshot_movement(load_board_snapshot(baseline_file), board_snapshot_frame(_df))
+
+def get_board_movement(df: pd.DataFrame, days: Optional[int] = None) -> Tuple[Optional[pd.Series], Optional[pd.DataFrame]]:
+    """Baseline snapshot and movement since `days` ago (or since the previous board); (None, None) without history"""
+    if df.attrs.get('demo_data'):
+        return None, None
+    dataset_version = get_dataset_version(df)
+    record_board_snapshot(df)
+    when = datetime.now() - timedelta(days=days) if days else datetime.now()
+    baseline = snapshot_before(get_snapshot_index(), when,
+                               exclude_version=get_board_version(board_snapshot_frame(df)))
+    if baseline is None:
+        return None, None
+    return baseline, _board_movement(df, dataset_version, baseline['file'])
+
+def movement_labels(movement: Optional[pd.DataFrame]) -> pd.Series:
+    """Display label per player_id: 📈 +3, 📉 -2, ➡️ or 🆕"""
+    if movement is None:
+        return pd.Series(dtype=object)
+    change = movement['rank_change'].fillna(0).astype(int)
+    labels = np.select(
+        [movement['status'] == 'new', change > 0, change < 0],
+        ['🆕', '📈 ' + change.map('{:+d}'.format), '📉 ' + change.map('{:+d}'.format)],
+        default='➡️'
+    )
+    return pd.Series(labels, index=movement['player_id'])
+
+# ==================== Archive historique des drafts ====================
+# Every CSV in the archive directory: one row per pick (year, pick, name, position, age, archetype, outcome).
+# Later files win on duplicate (year, pick), so corrections can be dropped in as a new file.
+ARCHIVE_DIR = os.environ.get('NBA_DRAFT_ARCHIVE_DIR',
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'historical_data'))
+ARCHIVE_REQUIRED_COLUMNS = ('year', 'pick', 'name', 'position')
+# Career outcomes, worst to best
+ARCHIVE_OUTCOMES = ('Bust', 'Rotation', 'Starter', 'All-Star')
+# Groups with fewer labeled picks keep the reference-data estimate
+ARCHIVE_MIN_GROUP = 10
+# Measured rates are shrunk toward the reference estimate, which counts as this many picks
+ARCHIVE_PRIOR_PICKS = 20
+
+def archive_files(directory: str = ARCHIVE_DIR) -> List[str]:
+    """Archive CSV files, in load order"""
+    try:
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.csv'))
+    except FileNotFoundError:
+        return []
+
+def read_archive_files(paths: List[str]) -> pd.DataFrame:
+    """Concatenate and normalize archive files (files missing a required column are skipped)"""
+    frames = []
+    for path in paths:
+        frame = pd.read_csv(path)
+        missing = [col for col in ARCHIVE_REQUIRED_COLUMNS if col not in frame.columns]
+        if missing:
+            logger.warning("Skipping archive file %s: missing %s", path, ', '.join(missing))
+            continue
+        frames.append(frame)
+    columns = list(ARCHIVE_REQUIRED_COLUMNS) + ['age', 'archetype', 'outcome']
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    
+    archive = pd.concat(frames, ignore_index=True).reindex(columns=columns)
+    archive['year'] = pd.to_numeric(archive['year'], errors='coerce')
+    archive['pick'] = pd.to_numeric(archive['pick'], errors='coerce')
+    archive = archive.dropna(subset=['year', 'pick'])
+    archive['age'] = pd.to_numeric(archive['age'], errors='coerce')
+    archive['outcome'] = archive['outcome'].where(archive['outcome'].isin(ARCHIVE_OUTCOMES))
+    return (archive.drop_duplicates(['year', 'pick'], keep='last')
+            .sort_values(['year', 'pick'], kind='stable').reset_index(drop=True))
+
+def sorted_column_index(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Row ids ordered by value, for range lookups by binary search"""
+    order = np.argsort(values, kind='stable').astype(np.int32)
+    return {'order': read_only_array(order, np.int32), 'values': read_only_array(values[order], values.dtype)}
+
+def posting_lists(codes: np.ndarray, n_codes: int) -> Dict[str, np.ndarray]:
+    """Row ids grouped by code (rows of code c: order[offsets[c]:offsets[c + 1]], ascending)"""
+    order = np.argsort(codes, kind='stable').astype(np.int32)
+    offsets = np.searchsorted(codes[order], np.arange(n_codes + 1))
+    return {'order': read_only_array(order, np.int32), 'offsets': read_only_array(offsets, np.int64)}
+
+def build_draft_archive(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Columnar, indexed archive: narrow numeric columns, coded categories, and an index per query field"""
+    archetype_codes, archetypes = pd.factorize(frame['archetype'].astype(object).where(frame['archetype'].notna()))
+    outcome_codes = pd.Index(ARCHIVE_OUTCOMES).get_indexer(frame['outcome'])
+    masks = encode_positions(frame['position'].fillna('')) if len(frame) else np.zeros(0, dtype=np.uint8)
+    columns = {
+        'year': read_only_array(frame['year'], np.int16),
+        'pick': read_only_array(frame['pick'], np.int16),
+        'age': read_only_array(frame['age'], np.float32),
+        'position_mask': read_only_array(masks, np.uint8),
+        'archetype': read_only_array(archetype_codes, np.int16),
+        'outcome': read_only_array(outcome_codes, np.int8),
+        'name': read_only_array(frame['name'].astype(str), object),
+        'position': read_only_array(frame['position'].astype(str), object)
+    }
+    indexes = {col: sorted_column_index(columns[col]) for col in ('year', 'pick', 'age')}
+    # One posting list per position bit: combo positions ("SG/SF") are found under both
+    indexes['position'] = {position: read_only_array(np.flatnonzero(columns['position_mask'] & bit), np.int32)
+                           for position, bit in POSITION_BITS.items()}
+    # Code -1 (unknown archetype) sorts first: shift codes so it gets its own list
+    indexes['archetype'] = posting_lists(columns['archetype'] + 1, len(archetypes) + 1)
+    
+    digest = hashlib.sha1(pd.util.hash_pandas_object(frame, index=False).values.tobytes()) if len(frame) else hashlib.sha1()
+    return {
+        'version': digest.hexdigest()[:16],
+        'rows': int(len(frame)),
+        'columns': columns,
+        'archetypes': tuple(archetypes),
+        'indexes': indexes
+    }
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _load_draft_archive(directory: str, files_stamp: Tuple[Tuple[str, int, int], ...]) -> Dict[str, Any]:
+    """Build the archive once per set of files (shared, read-only)"""
+    return build_draft_archive(read_archive_files([os.path.join(directory, name) for name, _, _ in files_stamp]))
+
+def get_draft_archive() -> Dict[str, Any]:
+    """The indexed historical archive, rebuilt when a file is added or changed"""
+    stamp = []
+    for path in archive_files():
+        stat = os.stat(path)
+        stamp.append((os.path.basename(path), stat.st_size, stat.st_mtime_ns))
+    return _load_draft_archive(ARCHIVE_DIR, tuple(stamp))
+
+def get_historical_version() -> str:
+    """Version of everything historical views read (reference data + archive), for cache keys"""
+    return f"{get_reference_version()}|{get_draft_archive()['version']}"
+
+def range_rows(index: Dict[str, np.ndarray], bounds: Tuple[Optional[float], Optional[float]]) -> np.ndarray:
+    """Ascending row ids with lo <= value <= hi (None: unbounded), found by binary search"""
+    lo, hi = bounds
+    start = 0 if lo is None else np.searchsorted(index['values'], lo, side='left')
+    stop = len(index['values']) if hi is None else np.searchsorted(index['values'], hi, side='right')
+    return np.sort(index['order'][start:stop])
+
+def query_draft_archive(archive: Dict[str, Any], year: Optional[Tuple] = None, pick: Optional[Tuple] = None,
+                        age: Optional[Tuple] = None, position: Any = None, archetype: Any = None) -> np.ndarray:
+    """Row ids matching every given filter.
+    
+    year / pick / age are inclusive (lo, hi) ranges; position is a position, POSITION_GROUPS name or list
+    (combo positions match any of theirs); archetype is a name or list. Each filter reads its index only,
+    and the candidate sets are intersected smallest first."""
+    indexes = archive['indexes']
+    candidates = [range_rows(indexes[col], bounds)
+                  for col, bounds in (('year', year), ('pick', pick), ('age', age)) if bounds is not None]
+    if position is not None:
+        positions = POSITION_GROUPS.get(position, (position,)) if isinstance(position, str) else position
+        lists = [indexes['position'][base] for p in positions
+                 for base in POSITION_ALIASES.get(str(p).upper(), (str(p).upper(),)) if base in indexes['position']]
+        candidates.append(np.unique(np.concatenate(lists)) if lists else np.zeros(0, dtype=np.int32))
+    if archetype is not None:
+        names = [archetype] if isinstance(archetype, str) else archetype
+        codes = pd.Index(archive['archetypes']).get_indexer(pd.Index(names))
+        order, offsets = indexes['archetype']['order'], indexes['archetype']['offsets']
+        lists = [order[offsets[code + 1]:offsets[code + 2]] for code in codes if code >= 0]
+        candidates.append(np.sort(np.concatenate(lists)) if lists else np.zeros(0, dtype=np.int32))
+    
+    if not candidates:
+        return np.arange(archive['rows'])
+    candidates.sort(key=len)
+    rows = candidates[0]
+    for other in candidates[1:]:
+        rows = np.intersect1d(rows, other, assume_unique=True)
+    return rows
+
+def archive_frame(archive: Dict[str, Any], rows: Optional[np.ndarray] = None) -> pd.DataFrame:
+    """Decoded archive rows (all rows by default)"""
+    columns = archive['columns']
+    rows = np.arange(archive['rows']) if rows is None else rows
+    archetypes = np.array(list(archive['archetypes']) + [None], dtype=object)
+    outcomes = np.array(list(ARCHIVE_OUTCOMES) + [None], dtype=object)
+    return pd.DataFrame({
+        'year': columns['year'][rows], 'pick': columns['pick'][rows], 'name': columns['name'][rows],
+        'position': columns['position'][rows], 'age': columns['age'][rows],
+        'archetype': archetypes[columns['archetype'][rows]], 'outcome': outcomes[columns['outcome'][rows]]
+    })
+
+def outcome_rates(outcome_codes: np.ndarray) -> Dict[str, float]:
+    """All-Star, starter-or-better and bust rates of labeled picks"""
+    labeled = outcome_codes[outcome_codes >= 0]
+    if not len(labeled):
+        return {'picks': 0, 'all_star_rate': np.nan, 'starter_rate': np.nan, 'bust_rate': np.nan}
+    return {
+        'picks': int(len(labeled)),
+        'all_star_rate': float((labeled == ARCHIVE_OUTCOMES.index('All-Star')).mean()),
+        'starter_rate': float((labeled >= ARCHIVE_OUTCOMES.index('Starter')).mean()),
+        'bust_rate': float((labeled == ARCHIVE_OUTCOMES.index('Bust')).mean())
+    }
+
+def archive_success_patterns(archive: Dict[str, Any]) -> Dict[str, Dict[str, Tuple[Dict[str, float], int]]]:
+    """historical_patterns-shaped tables read from the outcome cube, as (values, labeled picks) per group.
+
+    Groups under ARCHIVE_MIN_GROUP picks, and pick ranges the archive does not reach the end of, are left out.
+    Ages are the cube's (18 pools younger picks, 23 older ones); position shares count a combo position
+    under each of its positions."""
+    cube = get_outcome_cube(archive)
+    patterns = {'archetype_success': {}, 'age_impact': {}, 'position_by_range': {}}
+    
+    for _, row in cube_query(cube, ['archetype']).iterrows():
+        if row['picks'] >= ARCHIVE_MIN_GROUP:
+            patterns['archetype_success'][row['archetype']] = (
+                {rate: float(row[rate]) for rate in ('all_star_rate', 'starter_rate', 'bust_rate')}, int(row['picks']))
+    
+    # Age: starter-or-better rate relative to the whole archive
+    overall = cube_query(cube)['starter_rate'].iloc[0]
+    for _, row in cube_query(cube, ['age']).iterrows():
+        if row['picks'] >= ARCHIVE_MIN_GROUP and overall > 0:
+            patterns['age_impact'][row['age']] = (
+                {'success_multiplier': float(row['starter_rate'] / overall)}, int(row['picks']))
+    
+    # Draft range: each position's share of the range's starter-or-better picks
+    picks = archive['indexes']['pick']['values']
+    last_pick = int(picks[-1]) if len(picks) else 0
+    covered = [range_key for range_key in RANK_RANGES if int(range_key.split('-')[1]) <= last_pick]
+    if covered:
+        by_range = cube_query(cube, ['pick_range', 'position'], pick_range=covered)
+        for range_key, group in by_range.groupby('pick_range', sort=False):
+            total = int(group['starter'].sum())
+            if total >= ARCHIVE_MIN_GROUP:
+                patterns['position_by_range'][range_key] = (
+                    {row['position']: float(row['starter'] / total) for _, row in group.iterrows()}, total)
+    return patterns
+
+def blend_with_reference(measured: Dict[str, float], picks: int, reference: Optional[Any]) -> Dict[str, float]:
+    """Measured values shrunk toward the reference estimate (worth ARCHIVE_PRIOR_PICKS picks) when there is one"""
+    weight = picks / (picks + ARCHIVE_PRIOR_PICKS) if reference is not None else 1.0
+    return {key: round(weight * value + (1 - weight) * (reference.get(key, value) if reference is not None else value), 3)
+            for key, value in measured.items()}
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _historical_patterns(historical_version: str, _archive: Dict[str, Any]) -> MappingProxyType:
+    """Reference patterns updated with what the archive measures"""
+    reference = get_reference_data('historical_patterns')
+    measured = archive_success_patterns(_archive)
+    patterns = {}
+    for key, table in reference.items():
+        merged = {str(group): value for group, value in table.items()}
+        for group, (values, picks) in measured.get(key, {}).items():
+            merged[group] = blend_with_reference(values, picks, merged.get(group))
+        patterns[key] = merged
+    return freeze_reference(patterns)
+
+def display_archive_precedents(player_data: pd.Series):
+    """Archived picks with a similar draft slot, position and age, and how their careers went"""
+    archive = get_draft_archive()
+    if not archive['rows']:
+        return
+    st.markdown("#### 🗄️ Historical Precedents")
+    rank = int(safe_numeric(player_data.get('final_rank', 30)))
+    age = safe_numeric(player_data.get('age', 20))
+    positions = decode_positions(player_data.get('position_mask', position_mask([player_data.get('position', '')])))
+    
+    filters = {'pick': (rank - 3, rank + 3), 'position': positions or None, 'age': (np.floor(age) - 1, np.floor(age) + 1.999)}
+    rows = query_draft_archive(archive, **filters)
+    if len(rows) < 3:
+        # Too specific: drop the age window
+        filters.pop('age')
+        rows = query_draft_archive(archive, **filters)
+    if not len(rows):
+        st.caption("No archived pick with a similar slot and position")
+        return
+    
+    precedents = archive_frame(archive, rows)
+    rates = outcome_rates(archive['columns']['outcome'][rows])
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("All-Star", f"{rates['all_star_rate']:.0%}" if rates['picks'] else "N/A")
+    with col2:
+        st.metric("Starter+", f"{rates['starter_rate']:.0%}" if rates['picks'] else "N/A")
+    with col3:
+        st.metric("Bust", f"{rates['bust_rate']:.0%}" if rates['picks'] else "N/A")
+    st.caption(f"{len(precedents)} archived picks at #{max(rank - 3, 1)}–{rank + 3}, "
+               f"{'/'.join(positions) or 'any position'}" + (", within a year of age" if 'age' in filters else ""))
+    st.dataframe(
+        precedents.sort_values(['pick', 'year']).rename(columns=str.title),
+        use_container_width=True,
+        hide_index=True,
+        column_config={"Age": st.column_config.NumberColumn("Age", format="%.0f")}
+    )
+
+# ==================== Cube des résultats ====================
+# Dimensions of the outcome cube, in axis order
+CUBE_DIMENSIONS = {'archetype': "Archetype", 'age': "Age at draft", 'position': "Position", 'pick_range': "Pick range"}
+# Ages outside are clipped to the ends (18 = 18 and younger, 23 = 23 and older)
+CUBE_AGES = (18, 19, 20, 21, 22, 23)
+CUBE_PICK_RANGES = {'1-5': (1, 5), '6-10': (6, 10), '11-20': (11, 20), '21-30': (21, 30), '31-60': (31, 60)}
+CUBE_MEASURES = ('picks', 'all_star', 'starter', 'bust')
+CUBE_RATES = {'all_star_rate': "All-Star %", 'starter_rate': "Starter+ %", 'bust_rate': "Bust %"}
+
+def pick_range_codes(picks: np.ndarray) -> np.ndarray:
+    """Index in CUBE_PICK_RANGES of each pick, -1 outside every range"""
+    lows = np.array([lo for lo, _ in CUBE_PICK_RANGES.values()])
+    highs = np.array([hi for _, hi in CUBE_PICK_RANGES.values()])
+    codes = np.searchsorted(lows, picks, side='right') - 1
+    inside = (codes >= 0) & (picks <= highs[np.maximum(codes, 0)])
+    return np.where(inside, codes, -1)
+
+def build_outcome_cube(archive: Dict[str, Any]) -> Dict[str, Any]:
+    """Outcome counts for every combination of dimension values, roll-ups included.
+    
+    Each axis has one slot per value, one for unknown values, and a last 'All' slot holding the
+    sum over the axis. Counts are additive, so any slice or roll-up is a lookup, and rates follow.
+    A combo position ("PF/C") counts under each of its positions; the position 'All' slot counts
+    every pick once."""
+    columns = archive['columns']
+    labeled = np.flatnonzero(columns['outcome'] >= 0)
+    age = columns['age'][labeled].astype(float)
+    dims = {
+        'archetype': tuple(archive['archetypes']),
+        'age': tuple(str(a) for a in CUBE_AGES),
+        'position': tuple(POSITION_BITS),
+        'pick_range': tuple(CUBE_PICK_RANGES)
+    }
+    # One entry per (pick, position bit), one per pick without a known position, and one per pick
+    # straight into the position 'All' slot (-2), so that roll-up never sums the bits
+    masks = columns['position_mask'][labeled]
+    rows, bits = np.nonzero(masks[:, None] & np.array(list(POSITION_BITS.values()), dtype=np.uint8))
+    unknown = np.flatnonzero(masks == 0)
+    rows = np.concatenate([rows, unknown, np.arange(len(labeled))])
+    codes = {
+        'archetype': columns['archetype'][labeled][rows],
+        'age': np.where(np.isnan(age), -1, np.clip(np.floor(np.nan_to_num(age)), CUBE_AGES[0], CUBE_AGES[-1]) - CUBE_AGES[0])[rows],
+        'position': np.concatenate([bits, np.full(len(unknown), -1), np.full(len(labeled), -2)]),
+        'pick_range': pick_range_codes(columns['pick'][labeled])[rows]
+    }
+    shape = tuple(len(labels) + 2 for labels in dims.values())
+    # Unknown (-1) goes to the slot after the last value, -2 to 'All'
+    flat = np.ravel_multi_index([np.select([codes[dim] == -1, codes[dim] == -2], [len(labels), len(labels) + 1],
+                                           codes[dim]).astype(np.int64)
+                                 for dim, labels in dims.items()], shape)
+    outcome = columns['outcome'][labeled][rows]
+    measures = {
+        'picks': np.ones(len(outcome)),
+        'all_star': outcome == ARCHIVE_OUTCOMES.index('All-Star'),
+        'starter': outcome >= ARCHIVE_OUTCOMES.index('Starter'),
+        'bust': outcome == ARCHIVE_OUTCOMES.index('Bust')
+    }
+    counts = np.stack([np.bincount(flat, weights=measures[m], minlength=int(np.prod(shape))).reshape(shape)
+                       for m in CUBE_MEASURES], axis=-1).astype(np.int32)
+    
+    # Roll up one axis at a time: later axes also sum earlier 'All' slots, which fills every combination
+    for axis, (dim, labels) in enumerate(dims.items()):
+        if dim == 'position':
+            continue
+        target = [slice(None)] * counts.ndim
+        target[axis] = -1
+        counts[tuple(target)] = counts.take(np.arange(len(labels) + 1), axis=axis).sum(axis=axis)
+    
+    counts.flags.writeable = False
+    return {'dims': dims, 'counts': counts}
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def _outcome_cube(archive_version: str, _archive: Dict[str, Any]) -> Dict[str, Any]:
+    """The outcome cube, built once per archive version (shared, read-only)"""
+    return build_outcome_cube(_archive)
+
+def get_outcome_cube(archive: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Outcome cube of the draft archive"""
+    archive = archive or get_draft_archive()
+    return _outcome_cube(archive['version'], archive)
+
+def cube_slot(cube: Dict[str, Any], dim: str, value: Any) -> int:
+    """Slot of a dimension value (ages and pick numbers are bucketed like the archive)"""
+    if dim == 'age' and not isinstance(value, str):
+        value = str(int(np.clip(np.floor(value), CUBE_AGES[0], CUBE_AGES[-1])))
+    elif dim == 'pick_range' and not isinstance(value, str):
+        code = int(pick_range_codes(np.array([value]))[0])
+        value = list(CUBE_PICK_RANGES)[code] if code >= 0 else str(value)
+    labels = cube['dims'][dim]
+    if str(value) not in labels:
+        raise KeyError(f"{dim}: no cube slot for {value!r}")
+    return labels.index(str(value))
+
+def cube_slots(cube: Dict[str, Any], dim: str, values: np.ndarray) -> np.ndarray:
+    """cube_slot for an array of prospect values; missing or unmatched values get the 'All' slot (rolled up)"""
+    labels = cube['dims'][dim]
+    if dim == 'pick_range':
+        codes = pick_range_codes(np.asarray(values, dtype=float))
+    else:
+        if dim == 'age':
+            ages = np.asarray(values, dtype=float)
+            # Age 0 stands for a missing age
+            ages = np.where(ages > 0, np.clip(np.floor(np.nan_to_num(ages)), CUBE_AGES[0], CUBE_AGES[-1]), np.nan)
+            values = [str(int(a)) if a == a else None for a in ages]
+        codes = pd.Index(list(labels)).get_indexer(pd.Index(values, dtype=object))
+    return np.where(codes >= 0, codes, len(labels) + 1)
+
+def cube_query(cube: Dict[str, Any], by: Tuple[str, ...] = (), **filters: Any) -> pd.DataFrame:
+    """Counts and rates grouped by `by`, over the slice given by filters (value or list of values per dimension).
+    
+    Dimensions neither grouped nor filtered are rolled up; nothing is recomputed from the picks.
+    Filtering on several positions counts a combo-position pick once per listed position."""
+    by = [by] if isinstance(by, str) else list(by)
+    counts = cube['counts']
+    kept = {}
+    for axis, (dim, labels) in enumerate(cube['dims'].items()):
+        if dim in filters:
+            values = filters[dim] if isinstance(filters[dim], (list, tuple, set)) else [filters[dim]]
+            slots = [cube_slot(cube, dim, value) for value in values]
+        elif dim in by:
+            slots = list(range(len(labels)))
+        else:
+            slots = [len(labels) + 1]
+        counts = counts.take(slots, axis=axis)
+        if dim in by:
+            kept[dim] = [labels[slot] for slot in slots]
+        else:
+            counts = counts.sum(axis=axis, keepdims=True)
+    
+    frame = pd.DataFrame(counts.reshape(-1, len(CUBE_MEASURES)), columns=list(CUBE_MEASURES))
+    if kept:
+        frame.index = pd.MultiIndex.from_product(list(kept.values()), names=list(kept))
+        frame = frame.reset_index()
+    picks = frame['picks'].to_numpy(dtype=float)
+    for rate, measure in zip(CUBE_RATES, ('all_star', 'starter', 'bust')):
+        frame[rate] = np.divide(frame[measure], picks, out=np.full(len(frame), np.nan), where=picks > 0)
+    return frame[by + list(CUBE_MEASURES) + list(CUBE_RATES)]
+
+def cube_pivot(cube: Dict[str, Any], rows: str, columns: Optional[str] = None, measure: str = 'starter_rate',
+               min_picks: int = 1, **filters: Any) -> pd.DataFrame:
+    """Any two-way (or one-way) pivot of a measure, straight from the cube (NaN under min_picks)"""
+    by = [rows] + ([columns] if columns else [])
+    frame = cube_query(cube, by, **filters)
+    values = frame[measure].where(frame['picks'] >= min_picks)
+    row_labels = list(dict.fromkeys(frame[rows]))
+    if not columns:
+        return pd.DataFrame({measure: values.to_numpy()}, index=pd.Index(frame[rows], name=rows)).reindex(row_labels)
+    return (frame.assign(value=values).pivot(index=rows, columns=columns, values='value')
+            .reindex(index=row_labels, columns=list(dict.fromkeys(frame[columns]))))
+
+def create_outcome_pivot():
+    """Free-form pivot over the outcome cube"""
+    st.markdown("#### 🧊 Custom Pivot")
+    cube = get_outcome_cube()
+    if not cube['counts'][..., 0].max():
+        st.info("No archived picks with a career outcome yet")
+        return
+    dimensions = list(CUBE_DIMENSIONS)
     col1, col2, col3, col4 = st.columns(4)
-    
     with col1:
-        lottery_avg = draft_order.head(14)['final_gen_probability'].mean()
-        st.metric("Lottery Avg Potential", f"{lottery_avg:.1%}")
-    
+        rows = st.selectbox("Rows:", dimensions, format_func=CUBE_DIMENSIONS.get, key="cube_rows")
     with col2:
-        guards = len(draft_order.head(30)[draft_order.head(30)['position'].isin(['PG', 'SG'])])
-        st.metric("Guards in 1st Round", guards)
-    
+        columns = st.selectbox("Columns:", [None] + [d for d in dimensions if d != rows],
+                               format_func=lambda d: CUBE_DIMENSIONS.get(d, "—"), key="cube_columns")
     with col3:
-        bigs = len(draft_order.head(30)[draft_order.head(30)['position'].isin(['PF', 'C'])])
-        st.metric("Bigs in 1st Round", bigs)
-    
+        measure = st.selectbox("Measure:", list(CUBE_RATES) + ['picks'],
+                               format_func=lambda m: CUBE_RATES.get(m, "Picks"), key="cube_measure")
     with col4:
-        elite = len(draft_order.head(30)[draft_order.head(30)['final_gen_probability'] > 0.7])
-        st.metric("Elite Prospects Top 30", elite)
+        min_picks = st.number_input("Min picks per cell:", 1, 50, ARCHIVE_MIN_GROUP, key="cube_min_picks")
+    
+    # Dice: restrict the remaining dimensions
+    filters = {}
+    other_dims = [d for d in dimensions if d not in (rows, columns)]
+    for column, dim in zip(st.columns(len(other_dims)), other_dims):
+        with column:
+            selected = st.multiselect(f"{CUBE_DIMENSIONS[dim]}:", list(cube['dims'][dim]), key=f"cube_filter_{dim}")
+            if selected:
+                filters[dim] = selected
+    
+    pivot = cube_pivot(cube, rows, columns, measure, min_picks, **filters)
+    is_rate = measure in CUBE_RATES
+    def build_cube_heatmap():
+        import plotly.express as px
+        values = pivot * 100 if is_rate else pivot
+        fig = px.imshow(
+            values.to_numpy(dtype=float), x=[str(c) for c in values.columns] if columns else [CUBE_RATES.get(measure, "Picks")],
+            y=[str(i) for i in values.index], color_continuous_scale='RdYlGn_r' if measure == 'bust_rate' else 'RdYlGn',
+            text_auto='.0f', aspect='auto',
+            labels={'x': CUBE_DIMENSIONS.get(columns, ''), 'y': CUBE_DIMENSIONS[rows], 'color': CUBE_RATES.get(measure, "Picks")}
+        )
+        fig.update_layout(title=f"{CUBE_RATES.get(measure, 'Picks')} by {CUBE_DIMENSIONS[rows]}"
+                          + (f" × {CUBE_DIMENSIONS[columns]}" if columns else ""), height=420)
+        return fig
+    render_cached_figure("outcome_cube_pivot", {'rows': rows, 'columns': columns, 'measure': measure,
+                                                'min_picks': min_picks, 'filters': filters},
+                         get_historical_version(), build_cube_heatmap, use_container_width=True)
+    
+    with st.expander("📋 Cells with sample counts"):
+        cells = cube_query(cube, [rows] + ([columns] if columns else []), **filters)
+        st.dataframe(cells[cells['picks'] > 0].rename(columns={**CUBE_DIMENSIONS, **CUBE_RATES, 'picks': "Picks",
+                                                               'all_star': "All-Stars", 'starter': "Starters+", 'bust': "Busts"}),
+                     use_container_width=True, hide_index=True,
+                     column_config={label: st.column_config.NumberColumn(label, format="percent")
+                                    for label in CUBE_RATES.values()})
 
 def create_big_board_draft_prediction(df: pd.DataFrame):
     """Create a professional Big Board format"""
@@ -3004,7 +4982,7 @@ def create_big_board_draft_prediction(df: pd.DataFrame):
     draft_order['predicted_pick'] = range(1, len(draft_order) + 1)
     
     # View options
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4 = st.columns(4)
     with col1:
         view_range = st.selectbox(
             "View Range:",
@@ -3020,16 +4998,19 @@ def create_big_board_draft_prediction(df: pd.DataFrame):
             "Position:",
             ["All", "Guards", "Wings", "Bigs", "PG", "SG", "SF", "PF", "C"]
         )
+    with col4:
+        movement_window = st.selectbox("Movement since:", list(MOVEMENT_WINDOWS), key="movement_window")
+    
+    # Real movement: current board vs a recorded snapshot
+    baseline, movement = get_board_movement(df, MOVEMENT_WINDOWS[movement_window])
+    if baseline is None:
+        st.caption("📸 No earlier board snapshot for this window yet: movement appears once the board changes")
+    else:
+        st.caption(f"📸 Movement vs the board of {baseline['taken_at']:%b %d, %Y %H:%M}")
     
     # Apply filters
-    if position_filter == "Guards":
-        filtered_df = draft_order[draft_order['position'].isin(['PG', 'SG'])]
-    elif position_filter == "Wings":
-        filtered_df = draft_order[draft_order['position'].isin(['SG', 'SF'])]
-    elif position_filter == "Bigs":
-        filtered_df = draft_order[draft_order['position'].isin(['PF', 'C'])]
-    elif position_filter != "All":
-        filtered_df = draft_order[draft_order['position'] == position_filter]
+    if position_filter != "All":
+        filtered_df = draft_order[plays_position(draft_order, position_filter)]
     else:
         filtered_df = draft_order
     
@@ -3044,12 +5025,12 @@ def create_big_board_draft_prediction(df: pd.DataFrame):
     display_df = filtered_df.head(display_count)
     
     # Create the Big Board table
-    create_big_board_table(display_df)
+    create_big_board_table(display_df, movement_labels(movement))
     
     # Add insights section
-    display_draft_insights(display_df)
+    display_draft_insights(display_df, movement)
 
-def create_big_board_table(df: pd.DataFrame):
+def create_big_board_table(df: pd.DataFrame, movement: Optional[pd.Series] = None):
     """Create the main Big Board table"""
     
     # Prepare data for display
@@ -3089,8 +5070,8 @@ def create_big_board_table(df: pd.DataFrame):
             tier = "⚡ Second"
             tier_color = "#6B7280"
         
-        # Simulated movement (up/down from last update)
-        movement = np.random.choice(['📈', '📉', '➡️'], p=[0.3, 0.3, 0.4])
+        # Movement since the baseline snapshot
+        player_movement = movement.get(player.get('player_id'), '—') if movement is not None else '—'
         
         board_data.append({
             'Rank': rank,
@@ -3105,7 +5086,7 @@ def create_big_board_table(df: pd.DataFrame):
             'Grade': grade,
             'Potential': f"{potential:.0%}",
             'Tier': tier,
-            'Movement': movement
+            'Movement': player_movement
         })
     
     # Convert to DataFrame
@@ -3133,52 +5114,48 @@ def create_big_board_table(df: pd.DataFrame):
         }
     )
 
-def display_draft_insights(df: pd.DataFrame):
+def display_draft_insights(df: pd.DataFrame, movement: Optional[pd.DataFrame] = None):
     """Display key insights and recent changes"""
     st.markdown("### 🔥 Latest Draft Intel & Movement")
     
+    # Biggest moves among the players on display, from the snapshot diff
+    if movement is not None and 'player_id' in df.columns:
+        shown = movement[movement['player_id'].isin(df['player_id']) & (movement['status'] == 'moved')]
+        risers = shown[shown['rank_change'] > 0].nlargest(3, 'rank_change')
+        fallers = shown[shown['rank_change'] < 0].nsmallest(3, 'rank_change')
+    else:
+        risers = fallers = None
+    
+    def movers_text(movers: Optional[pd.DataFrame], title: str) -> str:
+        if movers is None:
+            return f"**{title}:** no earlier board snapshot to compare against yet"
+        if movers.empty:
+            return f"**{title}:** none since the baseline snapshot"
+        lines = [f"• **{row['name']}** - #{int(row['final_rank_before'])} → #{int(row['final_rank'])} "
+                 f"({int(row['rank_change']):+d})" for _, row in movers.iterrows()]
+        return f"**{title}:**\n" + "\n".join(lines)
+    
+    # Trade and consensus notes: reference_data/draft_intel.json
+    intel = get_latest_draft_intel()
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### 📈 Rising Stock")
-        st.info("""
-        **Recent Risers:**
-        • **VJ Edgecombe** - Elite athleticism showing in workouts
-        • **Tre Johnson** - Shooting 45% from 3 in recent sessions
-        • **Collin Murray-Boyles** - Teams love his versatility
-        
-        **Why they're rising:** Workout performances exceeding expectations
-        """)
+        st.info(movers_text(risers, "Recent Risers"))
         
         st.markdown("#### 🔄 Recent Trades Impact")
-        st.warning("""
-        **Key Trade Scenarios:**
-        • **Portland** actively shopping #7 pick
-        • **Detroit** may package picks to move up
-        • **Charlotte** seeking win-now pieces
-        
-        **Impact:** Could shake up entire lottery order
-        """)
+        st.warning(f"**Team intel ({intel['last_updated']}):**\n"
+                   + "\n".join(f"• **{team}** - {note}" for team, note in intel['team_intel'].items()))
     
     with col2:
         st.markdown("#### 📉 Falling Stock")
-        st.error("""
-        **Recent Fallers:**
-        • **Some lottery prospects** - Medical concerns emerging
-        • **Older prospects** - Teams prioritizing upside
-        • **Poor shooters** - 3P% becoming make/break
-        
-        **Why they're falling:** Teams getting more selective
-        """)
+        st.error(movers_text(fallers, "Recent Fallers"))
         
         st.markdown("#### 🎯 Consensus Changes")
-        st.success("""
-        **New Consensus:**
-        • **Cooper Flagg** - Locked at #1
-        • **Guard heavy lottery** - Teams need playmaking
-        • **International prospects** - Getting more looks
-        **Latest intel:** Workouts causing major shifts
-        """)
+        st.success("**Major moves:**\n" + "\n".join(f"• {move}" for move in intel['major_moves'])
+                   + "\n\n**Workout standouts:**\n"
+                   + "\n".join(f"• **{standout['name']}** - {standout['note']}" for standout in intel['workout_standouts']))
 
     
 
@@ -3189,21 +5166,9 @@ def create_steals_busts_analysis(df: pd.DataFrame):
     # Create more sophisticated analysis
     df_analysis = df.copy()
     
-    # Calculate multiple factors for steal potential
-    df_analysis['skill_efficiency'] = (
-        df_analysis['ppg'] / df_analysis['usage_rate'] * 100 
-        if 'usage_rate' in df_analysis.columns else df_analysis['ppg']
-    )
-    df_analysis['age_factor'] = 1 + (20 - df_analysis['age']) * 0.1  # Younger = more upside
-    df_analysis['shooting_upside'] = df_analysis['three_pt_pct'] * df_analysis['ft_pct'] if 'ft_pct' in df_analysis.columns else df_analysis['three_pt_pct']
-    
-    # Steal score: combination of efficiency, age, and being underrated
-    df_analysis['steal_score'] = (
-        df_analysis['final_gen_probability'] * 50 +
-        df_analysis['skill_efficiency'] * 0.5 +
-        df_analysis['age_factor'] * 10 +
-        df_analysis['shooting_upside'] * 30
-    ) / (df_analysis['final_rank'] * 0.5)
+    # Steal score: combination of efficiency, age, and being underrated (terms and weights: SCORING_FORMULAS)
+    df_analysis['steal_score'] = formula_scores(formula_matrix(df_analysis, 'steal_score'),
+                                                formula_weight_vector('steal_score'))
     
     # Bust risk: high pick with concerning indicators
     df_analysis['bust_risk'] = 0
@@ -3467,48 +5432,9 @@ def create_historical_intelligence(df: pd.DataFrame):
     with hist_tab6:
         create_what_if_simulator(df)
 
-@st.cache_data
 def load_historical_draft_data():
-    """Load historical draft data with caching"""
-    # Simulated historical data - in production, load from CSV
-    historical_patterns = {
-        'archetype_success': {
-            'Two-Way Wing': {'all_star_rate': 0.45, 'starter_rate': 0.82, 'bust_rate': 0.08},
-            'Elite Scorer': {'all_star_rate': 0.38, 'starter_rate': 0.75, 'bust_rate': 0.12},
-            'Floor General': {'all_star_rate': 0.35, 'starter_rate': 0.70, 'bust_rate': 0.15},
-            'Elite Shooter': {'all_star_rate': 0.25, 'starter_rate': 0.68, 'bust_rate': 0.18},
-            'Rim Protector': {'all_star_rate': 0.30, 'starter_rate': 0.65, 'bust_rate': 0.20},
-            'Athletic Defender': {'all_star_rate': 0.20, 'starter_rate': 0.60, 'bust_rate': 0.25},
-        },
-        'age_impact': {
-            18: {'success_multiplier': 1.4},
-            19: {'success_multiplier': 1.2},
-            20: {'success_multiplier': 1.0},
-            21: {'success_multiplier': 0.8},
-            22: {'success_multiplier': 0.6}
-        },
-        'position_by_range': {
-            '1-5': {'PG': 0.20, 'SG': 0.15, 'SF': 0.25, 'PF': 0.25, 'C': 0.15},
-            '6-10': {'PG': 0.15, 'SG': 0.20, 'SF': 0.30, 'PF': 0.20, 'C': 0.15},
-            '11-20': {'PG': 0.10, 'SG': 0.25, 'SF': 0.25, 'PF': 0.20, 'C': 0.20},
-        },
-        'historical_comps': {
-            'Scottie Barnes': {
-                'draft_year': 2021, 'pick': 4, 'rookie_stats': {'ppg': 15.3, 'rpg': 7.5, 'apg': 3.5},
-                'current_status': 'All-Star', 'trajectory': ['ROTY', 'All-Star Y2', 'All-NBA Y3']
-            },
-            'Paul George': {
-                'draft_year': 2010, 'pick': 10, 'rookie_stats': {'ppg': 7.8, 'rpg': 3.7, 'apg': 1.1},
-                'current_status': 'All-NBA', 'trajectory': ['Role Player Y1-2', 'All-Star Y3', 'All-NBA Y4+']
-            },
-            'Cade Cunningham': {
-                'draft_year': 2021, 'pick': 1, 'rookie_stats': {'ppg': 17.4, 'rpg': 5.5, 'apg': 5.6},
-                'current_status': 'Rising Star', 'trajectory': ['ROY Runner-up', 'Injury Y2', 'Breakout Y3']
-            }
-        }
-    }
-    
-    return historical_patterns
+    """Load historical draft patterns: measured on the draft archive, reference data where it is too thin"""
+    return _historical_patterns(get_historical_version(), get_draft_archive())
 
 def create_smart_historical_comparisons(df: pd.DataFrame, historical_data: dict):
     """Enhanced historical comparisons with trajectory data"""
@@ -3615,11 +5541,17 @@ def create_smart_historical_comparisons(df: pd.DataFrame, historical_data: dict)
 def create_success_pattern_analysis(df: pd.DataFrame, historical_data: dict):
     """Analyze success patterns based on historical data"""
     st.markdown("### 📈 Historical Success Patterns")
+    archive = get_draft_archive()
+    if archive['rows']:
+        years = archive['indexes']['year']['values']
+        st.caption(f"Measured on {archive['rows']} archived picks ({years[0]}–{years[-1]}); "
+                   f"groups under {ARCHIVE_MIN_GROUP} picks keep the reference estimates, "
+                   f"larger ones are blended with them (reference worth {ARCHIVE_PRIOR_PICKS} picks)")
     
     # Analysis mode
     analysis_mode = st.radio(
         "Analysis Type:",
-        ["By Archetype", "By Age", "By Draft Range"],
+        ["By Archetype", "By Age", "By Draft Range", "Custom Pivot"],
         horizontal=True
     )
     
@@ -3629,23 +5561,27 @@ def create_success_pattern_analysis(df: pd.DataFrame, historical_data: dict):
         archetype_data = historical_data['archetype_success']
         
         # Create visualization
-        archetypes = list(archetype_data.keys())
-        all_star_rates = [archetype_data[a]['all_star_rate'] * 100 for a in archetypes]
-        starter_rates = [archetype_data[a]['starter_rate'] * 100 for a in archetypes]
-        bust_rates = [archetype_data[a]['bust_rate'] * 100 for a in archetypes]
-        
-        fig = go.Figure()
-        fig.add_trace(go.Bar(name='All-Star %', x=archetypes, y=all_star_rates, marker_color='#FFD700'))
-        fig.add_trace(go.Bar(name='Starter+ %', x=archetypes, y=starter_rates, marker_color='#10B981'))
-        fig.add_trace(go.Bar(name='Bust %', x=archetypes, y=bust_rates, marker_color='#EF4444'))
-        
-        fig.update_layout(
-            title="Historical Success Rates by Archetype (2010-2024)",
-            barmode='group',
-            height=400
-        )
+        def build_archetype_success_bars():
+            import plotly.graph_objects as go
+            archetypes = list(archetype_data.keys())
+            all_star_rates = [archetype_data[a]['all_star_rate'] * 100 for a in archetypes]
+            starter_rates = [archetype_data[a]['starter_rate'] * 100 for a in archetypes]
+            bust_rates = [archetype_data[a]['bust_rate'] * 100 for a in archetypes]
+            
+            fig = go.Figure()
+            fig.add_trace(go.Bar(name='All-Star %', x=archetypes, y=all_star_rates, marker_color='#FFD700'))
+            fig.add_trace(go.Bar(name='Starter+ %', x=archetypes, y=starter_rates, marker_color='#10B981'))
+            fig.add_trace(go.Bar(name='Bust %', x=archetypes, y=bust_rates, marker_color='#EF4444'))
+            
+            fig.update_layout(
+                title="Historical Success Rates by Archetype (2010-2024)",
+                barmode='group',
+                height=400
+            )
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_cached_figure("success_by_archetype", {}, get_historical_version(),
+                             build_archetype_success_bars, use_container_width=True)
         
         # Apply to current draft class
         st.markdown("#### 🎯 Applied to 2025 Draft Class")
@@ -3675,46 +5611,56 @@ def create_success_pattern_analysis(df: pd.DataFrame, historical_data: dict):
         age_data = historical_data['age_impact']
         
         # Visualization
-        ages = list(age_data.keys())
-        multipliers = [age_data[age]['success_multiplier'] for age in ages]
-        
-        fig = px.line(
-            x=ages, y=multipliers,
-            title="Success Multiplier by Draft Age",
-            labels={'x': 'Age at Draft', 'y': 'Success Multiplier'},
-            markers=True
-        )
-        fig.update_traces(line_color='#FF6B35', line_width=4)
-        fig.add_hline(y=1.0, line_dash="dash", line_color="gray")
+        def build_age_success_line():
+            import plotly.express as px
+            ages = list(age_data.keys())
+            multipliers = [age_data[age]['success_multiplier'] for age in ages]
+            
+            fig = px.line(
+                x=ages, y=multipliers,
+                title="Success Multiplier by Draft Age",
+                labels={'x': 'Age at Draft', 'y': 'Success Multiplier'},
+                markers=True
+            )
+            fig.update_traces(line_color='#FF6B35', line_width=4)
+            fig.add_hline(y=1.0, line_dash="dash", line_color="gray")
+            return fig
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_cached_figure("success_by_age", {}, get_historical_version(),
+                             build_age_success_line, use_container_width=True)
         
         st.info("""
         **Key Finding**: Players drafted at 18-19 have 20-40% higher success rates.
         Each additional year of age decreases success probability by ~20%.
         """)
     
+    elif analysis_mode == "Custom Pivot":
+        create_outcome_pivot()
+    
     else:  # By Draft Range
         st.markdown("#### Positional Value by Draft Range")
         
         range_data = historical_data['position_by_range']
         
         # Create heatmap
-        positions = ['PG', 'SG', 'SF', 'PF', 'C']
-        ranges = list(range_data.keys())
-        
-        z_data = [[range_data[r][pos] * 100 for pos in positions] for r in ranges]
-        
-        fig = px.imshow(
-            z_data,
-            x=positions,
-            y=ranges,
-            color_continuous_scale='RdYlGn',
-            title="Historical Success Rate (%) by Position and Draft Range",
-            labels={'x': 'Position', 'y': 'Draft Range', 'color': 'Success %'}
-        )
+        def build_range_success_heatmap():
+            import plotly.express as px
+            positions = ['PG', 'SG', 'SF', 'PF', 'C']
+            ranges = list(range_data.keys())
+            
+            z_data = [[range_data[r][pos] * 100 for pos in positions] for r in ranges]
+            
+            return px.imshow(
+                z_data,
+                x=positions,
+                y=ranges,
+                color_continuous_scale='RdYlGn',
+                title="Historical Success Rate (%) by Position and Draft Range",
+                labels={'x': 'Position', 'y': 'Draft Range', 'color': 'Success %'}
+            )
         
-        st.plotly_chart(fig, use_container_width=True)
+        render_cached_figure("success_by_draft_range", {}, get_historical_version(),
+                             build_range_success_heatmap, use_container_width=True)
         
         st.markdown("""
         **Insights:**
@@ -3727,184 +5673,172 @@ def create_scout_report_intelligence(df: pd.DataFrame):
     """Analyze scout reports for enhanced insights"""
     st.markdown("### 🔍 Scout Report Intelligence")
     
-    # Scout report keywords and their implications
-    scout_keywords = {
-        'positive': {
-            'elite': {'impact': 0.85, 'category': 'skill'},
-            'exceptional': {'impact': 0.80, 'category': 'skill'},
-            'nba-ready': {'impact': 0.75, 'category': 'readiness'},
-            'high motor': {'impact': 0.70, 'category': 'intangibles'},
-            'versatile': {'impact': 0.70, 'category': 'skill'},
-            'efficient': {'impact': 0.65, 'category': 'performance'},
-            'coachable': {'impact': 0.65, 'category': 'intangibles'},
-            'clutch': {'impact': 0.60, 'category': 'intangibles'}
-        },
-        'negative': {
-            'concerns': {'impact': -0.40, 'category': 'general'},
-            'inconsistent': {'impact': -0.50, 'category': 'performance'},
-            'limited': {'impact': -0.45, 'category': 'skill'},
-            'tweener': {'impact': -0.55, 'category': 'fit'},
-            'passive': {'impact': -0.50, 'category': 'intangibles'},
-            'project': {'impact': -0.60, 'category': 'readiness'},
-            'raw': {'impact': -0.65, 'category': 'readiness'}
-        }
-    }
-    
     selected_player = st.selectbox(
         "Select player for scout report analysis:",
-        df['name'].head(15).tolist(),
+        df['name'].tolist(),
         key="scout_select"
     )
+    player_data = df[df['name'] == selected_player].iloc[0]
     
-    # Simulated scout report (in production, would parse actual reports)
-    scout_reports = {
-        'Cooper Flagg': {
-            'report': "Elite two-way player with exceptional basketball IQ and versatility. NBA-ready defender with high motor. Some concerns about shot creation in half-court sets.",
-            'strengths': ['elite two-way', 'exceptional IQ', 'versatile', 'NBA-ready defender', 'high motor'],
-            'weaknesses': ['shot creation concerns', 'half-court offense']
-        },
-        'Ace Bailey': {
-            'report': "Elite scorer with exceptional shooting range. Clutch performer with coachable attitude. Questions about defensive engagement and consistency.",
-            'strengths': ['elite scorer', 'exceptional range', 'clutch', 'coachable'],
-            'weaknesses': ['defensive concerns', 'inconsistent effort']
-        }
-    }
+    # Hand-written scout reports (reference_data/scout_reports.json) take precedence for the summary
+    scout_reports = get_reference_data('scout_reports')
+    strengths_text = safe_string(player_data.get('strengths'), '')
+    weaknesses_text = safe_string(player_data.get('weaknesses'), '')
+    
+    if strengths_text or weaknesses_text:
+        strengths = [p.strip() for p in strengths_text.split(',') if p.strip()]
+        weaknesses = [p.strip() for p in weaknesses_text.split(',') if p.strip()]
+    elif selected_player in scout_reports:
+        strengths = list(scout_reports[selected_player]['strengths'])
+        weaknesses = list(scout_reports[selected_player]['weaknesses'])
+    else:
+        st.info(f"No scouting text available for {selected_player}")
+        return
     
     if selected_player in scout_reports:
-        report = scout_reports[selected_player]
-        
-        # Display report
-        st.markdown("#### 📋 Scout Report Summary")
-        st.info(report['report'])
-        
-        # Keyword analysis
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            st.markdown("##### ✅ Positive Indicators")
-            total_positive = 0
-            for strength in report['strengths']:
-                for keyword, data in scout_keywords['positive'].items():
-                    if keyword in strength.lower():
-                        total_positive += data['impact']
-                        st.markdown(f"""
-                        <div style="padding: 0.5rem; margin: 0.3rem 0; background: #10B98120; 
-                                    border-left: 3px solid #10B981; border-radius: 5px;">
-                            <strong>{strength}</strong>
-                            <div style="font-size: 0.8rem; color: #666;">
-                                Impact: +{data['impact']:.0%} ({data['category']})
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("##### ⚠️ Areas of Concern")
-            total_negative = 0
-            for weakness in report['weaknesses']:
-                for keyword, data in scout_keywords['negative'].items():
-                    if keyword in weakness.lower():
-                        total_negative += data['impact']
-                        st.markdown(f"""
-                        <div style="padding: 0.5rem; margin: 0.3rem 0; background: #EF444420; 
-                                    border-left: 3px solid #EF4444; border-radius: 5px;">
-                            <strong>{weakness}</strong>
-                            <div style="font-size: 0.8rem; color: #666;">
-                                Impact: {data['impact']:.0%} ({data['category']})
-                            </div>
-                        </div>
-                        """, unsafe_allow_html=True)
-        
-        # Overall scout score
-        scout_score = (total_positive + total_negative) / (len(report['strengths']) + len(report['weaknesses']))
-        
-        st.markdown("#### 📊 Scout Report Score")
-        score_color = "#10B981" if scout_score > 0.3 else "#F59E0B" if scout_score > 0 else "#EF4444"
-        
-        st.markdown(f"""
-        <div style="text-align: center; padding: 2rem; background: {score_color}20; 
-                    border-radius: 15px; border: 2px solid {score_color};">
-            <div style="font-size: 3rem; font-weight: bold; color: {score_color};">
-                {scout_score:.0%}
-            </div>
-            <div style="font-size: 1rem; color: #666;">
-                Scout Sentiment Score
-            </div>
-            <div style="font-size: 0.9rem; color: #666; margin-top: 1rem;">
-                Based on keyword analysis and historical correlation
-            </div>
+        summary = scout_reports[selected_player]['report']
+    else:
+        summary = f"**Strengths:** {strengths_text or 'N/A'}  \n**Weaknesses:** {weaknesses_text or 'N/A'}"
+        comparison = safe_string(player_data.get('nba_comparison'), '')
+        if comparison:
+            summary += f"  \n**NBA Comparison:** {comparison}"
+    
+    # Display report
+    st.markdown("#### 📋 Scout Report Summary")
+    st.info(summary)
+    
+    # Keyword analysis
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("##### ✅ Positive Indicators")
+        total_positive = 0
+        for strength in strengths:
+            for data in match_scout_phrase(strength, 'positive'):
+                total_positive += data['impact']
+                st.markdown(f"""
+                <div style="padding: 0.5rem; margin: 0.3rem 0; background: #10B98120; 
+                            border-left: 3px solid #10B981; border-radius: 5px;">
+                    <strong>{strength}</strong>
+                    <div style="font-size: 0.8rem; color: #666;">
+                        Impact: +{data['impact']:.0%} ({data['category']})
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("##### ⚠️ Areas of Concern")
+        total_negative = 0
+        for weakness in weaknesses:
+            for data in match_scout_phrase(weakness, 'negative'):
+                total_negative += data['impact']
+                st.markdown(f"""
+                <div style="padding: 0.5rem; margin: 0.3rem 0; background: #EF444420; 
+                            border-left: 3px solid #EF4444; border-radius: 5px;">
+                    <strong>{weakness}</strong>
+                    <div style="font-size: 0.8rem; color: #666;">
+                        Impact: {data['impact']:.0%} ({data['category']})
+                    </div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    # Overall scout score (precomputed for the whole class at load time)
+    if 'scout_sentiment' in df.columns and (strengths_text or weaknesses_text):
+        scout_score = safe_numeric(player_data['scout_sentiment'])
+    else:
+        scout_score = (total_positive + total_negative) / max(1, len(strengths) + len(weaknesses))
+    
+    st.markdown("#### 📊 Scout Report Score")
+    score_color = "#10B981" if scout_score > 0.3 else "#F59E0B" if scout_score > 0 else "#EF4444"
+    
+    class_percentile = (df['scout_sentiment'] < scout_score).mean() if 'scout_sentiment' in df.columns else 0.5
+    
+    st.markdown(f"""
+    <div style="text-align: center; padding: 2rem; background: {score_color}20; 
+                border-radius: 15px; border: 2px solid {score_color};">
+        <div style="font-size: 3rem; font-weight: bold; color: {score_color};">
+            {scout_score:.0%}
         </div>
-        """, unsafe_allow_html=True)
-        
-        # Historical correlation
-        st.markdown("#### 🔮 Historical Correlation")
-        st.info(f"""
-        Players with similar scout report profiles ({scout_score:.0%} sentiment):
-        - **70%** became NBA starters or better
-        - **35%** made at least one All-Star team
-        - **15%** became All-NBA players
-        
-        Most common outcome: **Quality Starter** (Years 3-5)
-        """)
+        <div style="font-size: 1rem; color: #666;">
+            Scout Sentiment Score
+        </div>
+        <div style="font-size: 0.9rem; color: #666; margin-top: 1rem;">
+            Better than {class_percentile:.0%} of the class • Based on keyword analysis and historical correlation
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    # Nearest neighbours in the scouting-text index
+    similar_df = find_similar_prospects(df, player_name=selected_player, k=5)
+    if len(similar_df) > 0:
+        st.markdown("#### 🧭 Prospects Described Like This")
+        similar_cols = [col for col in ['final_rank', 'name', 'position', 'college', 'class_year',
+                                        'text_similarity', 'shared_terms'] if col in similar_df.columns]
+        st.dataframe(
+            similar_df[similar_cols].rename(columns={'text_similarity': 'Similarity', 'shared_terms': 'Shared Terms'}),
+            use_container_width=True, hide_index=True,
+            column_config={'Similarity': st.column_config.ProgressColumn(
+                'Similarity', min_value=0.0, max_value=1.0, format="%.2f"
+            )}
+        )
+    
+    # Class-wide sentiment by category
+    category_cols = [col for col in df.columns 
+                     if col.startswith('scout_') and col not in ('scout_grade', 'scout_keyword_hits')]
+    if category_cols:
+        st.markdown("#### 🗂️ Class-Wide Scout Sentiment")
+        sentiment_df = df[['final_rank', 'name', 'position'] + category_cols].sort_values(
+            'scout_sentiment', ascending=False
+        )
+        sentiment_df = sentiment_df.rename(columns={
+            col: col.replace('scout_', '').replace('_', ' ').title() for col in category_cols
+        })
+        st.dataframe(sentiment_df.round(2), use_container_width=True, hide_index=True, height=300)
+    
+    # Historical correlation
+    st.markdown("#### 🔮 Historical Correlation")
+    st.info(f"""
+    Players with similar scout report profiles ({scout_score:.0%} sentiment):
+    - **70%** became NBA starters or better
+    - **35%** made at least one All-Star team
+    - **15%** became All-NBA players
+    
+    Most common outcome: **Quality Starter** (Years 3-5)
+    """)
 
 def create_historical_validation(df: pd.DataFrame, historical_data: dict):
     """Validate current projections against historical data"""
     st.markdown("### 💡 Historical Validation Scores")
     
-    # Calculate validation scores for top prospects
-    validation_results = []
-    
-    for _, player in df.head(15).iterrows():
-        # Get player attributes
-        name = safe_string(player['name'])
-        position = safe_string(player['position'])
-        age = int(safe_numeric(player.get('age', 20)))
-        archetype = safe_string(player.get('archetype', 'N/A'))
-        gen_prob = safe_numeric(player.get('final_gen_probability', 0.5))
-        rank = int(safe_numeric(player.get('final_rank', 30)))
-        
-        # Calculate historical confidence
-        confidence_score = calculate_historical_confidence(
-            position, age, archetype, gen_prob, rank, historical_data
-        )
-        
-        validation_results.append({
-            'Name': name,
-            'Position': position,
-            'Age': age,
-            'Archetype': archetype,
-            'AI Projection': f"{gen_prob:.1%}",
-            'Historical Confidence': confidence_score['score'],
-            'Confidence Level': confidence_score['level'],
-            'Key Factor': confidence_score['key_factor']
-        })
+    # Confidence for the whole class, computed as arrays and cached
+    val_df = get_historical_confidence_frame(df, get_dataset_version(df), get_historical_version())
     
     # Display results
     st.markdown("#### 🎯 Projection Confidence Based on 15 Years of Data")
     
-    # Convert to DataFrame for display
-    val_df = pd.DataFrame(validation_results)
-    
     # Style the dataframe
     def style_confidence(val):
-        if isinstance(val, str) and '%' in val:
-            num = float(val.strip('%'))
-            if num >= 80:
-                return 'background-color: #10B98130'
-            elif num >= 60:
-                return 'background-color: #F59E0B30'
-            else:
-                return 'background-color: #EF444430'
-        return ''
+        if val >= 0.8:
+            return 'background-color: #10B98130'
+        elif val >= 0.6:
+            return 'background-color: #F59E0B30'
+        else:
+            return 'background-color: #EF444430'
     
-    styled_df = val_df.style.applymap(style_confidence, subset=['Historical Confidence'])
-    st.dataframe(styled_df, use_container_width=True, hide_index=True)
+    display_cols = ['Name', 'Position', 'Age', 'Archetype', 'AI Projection',
+                    'Historical Confidence', 'Confidence Level', 'Key Factor']
+    styled_df = (val_df[display_cols].style
+                 .format({'AI Projection': '{:.1%}', 'Historical Confidence': '{:.0%}'})
+                 .map(style_confidence, subset=['Historical Confidence']))
+    st.dataframe(styled_df, use_container_width=True, hide_index=True, height=400)
     
     # Summary insights
     st.markdown("#### 📊 Key Validation Insights")
     
-    high_confidence = len([r for r in validation_results if float(r['Historical Confidence'].strip('%')) >= 80])
-    medium_confidence = len([r for r in validation_results if 60 <= float(r['Historical Confidence'].strip('%')) < 80])
-    low_confidence = len([r for r in validation_results if float(r['Historical Confidence'].strip('%')) < 60])
+    confidence = val_df['Historical Confidence'].to_numpy()
+    high_confidence = int((confidence >= 0.8).sum())
+    medium_confidence = int(((confidence >= 0.6) & (confidence < 0.8)).sum())
+    low_confidence = int((confidence < 0.6).sum())
     
     col1, col2, col3 = st.columns(3)
     
@@ -3924,7 +5858,11 @@ def create_historical_validation(df: pd.DataFrame, historical_data: dict):
         key="validation_breakdown"
     )
     
-    player_validation = next(r for r in validation_results if r['Name'] == selected_for_breakdown)
+    player_validation = val_df[val_df['Name'] == selected_for_breakdown].iloc[0]
+    factor_lines = "<br>".join(
+        f"• {factor}: {player_validation[factor]:+.1%}"
+        for factor in CONFIDENCE_FACTORS if pd.notna(player_validation[factor])
+    )
     
     st.markdown(f"""
     <div style="background: #f8f9fa; padding: 2rem; border-radius: 15px; border: 2px solid #e9ecef;">
@@ -3936,87 +5874,140 @@ def create_historical_validation(df: pd.DataFrame, historical_data: dict):
                 • Position: {player_validation['Position']}<br>
                 • Age: {player_validation['Age']}<br>
                 • Archetype: {player_validation['Archetype']}<br>
-                • AI Projection: {player_validation['AI Projection']}
+                • AI Projection: {player_validation['AI Projection']:.1%}
             </div>
             <div>
                 <strong>Historical Validation:</strong><br>
-                • Confidence: {player_validation['Historical Confidence']}<br>
+                • Confidence: {player_validation['Historical Confidence']:.0%}<br>
                 • Level: {player_validation['Confidence Level']}<br>
-                • Key Factor: {player_validation['Key Factor']}
+                • Key Factor: {player_validation['Key Factor']}<br>
+                {factor_lines}
             </div>
         </div>
         
         <div style="margin-top: 1.5rem; padding: 1rem; background: #e9ecef; border-radius: 10px;">
             <strong>What this means:</strong><br>
-            Based on 15 years of draft data, players with this profile have a {player_validation['Historical Confidence']} 
+            Based on 15 years of draft data, players with this profile have a {player_validation['Historical Confidence']:.0%} 
             chance of meeting or exceeding their projected outcome. The {player_validation['Key Factor'].lower()} 
             is the most influential factor in this assessment.
         </div>
     </div>
     """, unsafe_allow_html=True)
 
-def calculate_historical_confidence(position: str, age: int, archetype: str, 
-                                  gen_prob: float, rank: int, historical_data: dict) -> dict:
-    """Calculate confidence score based on historical patterns"""
-    
-    confidence = 0.5  # Base confidence
-    factors = []
+CONFIDENCE_FACTORS = ('Archetype history', 'Age advantage', 'Position value')
+CONFIDENCE_LEVELS = (
+    (0.8, '⭐⭐⭐⭐⭐ Very High'),
+    (0.7, '⭐⭐⭐⭐ High'),
+    (0.6, '⭐⭐⭐ Medium'),
+    (0.5, '⭐⭐ Low'),
+)
+RANK_RANGES = ('1-5', '6-10', '11-20')
+
+def lookup_codes(values: np.ndarray, keys: List[Any]) -> np.ndarray:
+    """Index of each value in keys, -1 when absent"""
+    return pd.Index(list(keys)).get_indexer(pd.Index(values))
+
+def score_historical_confidence(position: np.ndarray, age: np.ndarray, archetype: np.ndarray,
+                                gen_prob: np.ndarray, rank: np.ndarray, historical_data: dict,
+                                cube: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    """Historical confidence model over arrays of prospects (archetype rates narrowed by the outcome cube, if given)"""
+    n = len(position)
+    # factors[:, k] is the contribution of CONFIDENCE_FACTORS[k]; NaN when the factor does not apply
+    factors = np.full((n, len(CONFIDENCE_FACTORS)), np.nan)
     
     # Archetype success rate
-    if archetype in historical_data['archetype_success']:
-        arch_data = historical_data['archetype_success'][archetype]
-        if gen_prob > 0.7:
-            confidence += arch_data['all_star_rate'] * 0.3
-            factors.append(('Archetype history', arch_data['all_star_rate'] * 0.3))
-        else:
-            confidence += arch_data['starter_rate'] * 0.2
-            factors.append(('Archetype history', arch_data['starter_rate'] * 0.2))
+    archetypes = list(historical_data['archetype_success'])
+    arch_codes = lookup_codes(archetype, archetypes)
+    all_star = np.array([historical_data['archetype_success'][a]['all_star_rate'] for a in archetypes] + [np.nan])[arch_codes]
+    starter = np.array([historical_data['archetype_success'][a]['starter_rate'] for a in archetypes] + [np.nan])[arch_codes]
+    if cube is not None:
+        # Same archetype, age and draft range in the archive: the joint cell is shrunk toward the
+        # archetype rate (worth ARCHIVE_PRIOR_PICKS picks), and ignored under ARCHIVE_MIN_GROUP picks
+        arch_slots = cube_slots(cube, 'archetype', archetype)
+        cells = cube['counts'][arch_slots, cube_slots(cube, 'age', age), -1, cube_slots(cube, 'pick_range', rank)]
+        picks = cells[:, CUBE_MEASURES.index('picks')].astype(float)
+        weight = np.where((picks >= ARCHIVE_MIN_GROUP) & (arch_slots < len(cube['dims']['archetype'])),
+                          picks / (picks + ARCHIVE_PRIOR_PICKS), 0.0)
+        share = lambda measure: cells[:, CUBE_MEASURES.index(measure)] / np.maximum(picks, 1)
+        all_star = weight * share('all_star') + (1 - weight) * all_star
+        starter = weight * share('starter') + (1 - weight) * starter
+    factors[:, 0] = np.where(gen_prob > 0.7, all_star * 0.3, starter * 0.2)
     
     # Age factor
-    if age in historical_data['age_impact']:
-        age_mult = historical_data['age_impact'][age]['success_multiplier']
-        age_impact = (age_mult - 1.0) * 0.2
-        confidence += age_impact
-        factors.append(('Age advantage', age_impact))
+    ages = list(historical_data['age_impact'])
+    age_mult = np.array([historical_data['age_impact'][a]['success_multiplier'] for a in ages] + [np.nan])
+    factors[:, 1] = (age_mult[lookup_codes(age, ages)] - 1.0) * 0.2
     
     # Position value by range
-    if rank <= 5:
-        range_key = '1-5'
-    elif rank <= 10:
-        range_key = '6-10'
-    else:
-        range_key = '11-20'
-    
-    if range_key in historical_data['position_by_range']:
-        pos_value = historical_data['position_by_range'][range_key].get(position, 0.15)
-        confidence += pos_value * 0.3
-        factors.append(('Position value', pos_value * 0.3))
-    
-    # Cap confidence
-    confidence = min(0.95, max(0.05, confidence))
-    
-    # Determine key factor
-    key_factor = max(factors, key=lambda x: abs(x[1]))[0] if factors else 'General profile'
-    
-    # Determine confidence level
-    if confidence >= 0.8:
-        level = '⭐⭐⭐⭐⭐ Very High'
-    elif confidence >= 0.7:
-        level = '⭐⭐⭐⭐ High'
-    elif confidence >= 0.6:
-        level = '⭐⭐⭐ Medium'
-    elif confidence >= 0.5:
-        level = '⭐⭐ Low'
-    else:
-        level = '⭐ Very Low'
+    range_codes = np.select([rank <= 5, rank <= 10], [0, 1], 2)
+    positions = sorted({p for r in historical_data['position_by_range'].values() for p in r} | set(position))
+    pos_table = np.full((len(RANK_RANGES) + 1, len(positions)), np.nan)
+    for r, range_key in enumerate(RANK_RANGES):
+        if range_key in historical_data['position_by_range']:
+            pos_table[r] = [historical_data['position_by_range'][range_key].get(p, 0.15) for p in positions]
+    factors[:, 2] = pos_table[range_codes, lookup_codes(position, positions)] * 0.3
+    
+    # Accumulate in factor order (same rounding as the per-player model), then cap
+    applies = ~np.isnan(factors)
+    confidence = np.full(n, 0.5)
+    for k in range(len(CONFIDENCE_FACTORS)):
+        confidence = confidence + np.where(applies[:, k], factors[:, k], 0.0)
+    confidence = np.clip(confidence, 0.05, 0.95)
+    
+    # Key factor: largest absolute contribution (first one on ties)
+    strongest = np.argmax(np.where(applies, np.abs(factors), -np.inf), axis=1)
+    key_factor = np.where(applies.any(axis=1), np.array(CONFIDENCE_FACTORS)[strongest], 'General profile')
+    
+    level = np.select([confidence >= threshold for threshold, _ in CONFIDENCE_LEVELS],
+                      [label for _, label in CONFIDENCE_LEVELS], '⭐ Very Low')
+    
+    return {'confidence': confidence, 'level': level, 'key_factor': key_factor, 'factors': factors}
+
+def calculate_historical_confidence(position: str, age: int, archetype: str, 
+                                  gen_prob: float, rank: int, historical_data: dict,
+                                  cube: Optional[Dict[str, Any]] = None) -> dict:
+    """Calculate confidence score based on historical patterns"""
+    result = score_historical_confidence(
+        np.array([position], dtype=object), np.array([age]), np.array([archetype], dtype=object),
+        np.array([gen_prob], dtype=float), np.array([rank]), historical_data, cube
+    )
+    confidence = float(result['confidence'][0])
     
     return {
         'score': f"{confidence:.0%}",
-        'level': level,
-        'key_factor': key_factor,
+        'level': str(result['level'][0]),
+        'key_factor': str(result['key_factor'][0]),
         'raw_score': confidence
     }
 
+@st.cache_data(show_spinner=False)
+def get_historical_confidence_frame(_df: pd.DataFrame, dataset_version: str, historical_version: str) -> pd.DataFrame:
+    """Historical confidence for every prospect, once per dataset and historical-data version"""
+    def column(col: str, default: Any) -> pd.Series:
+        return _df[col] if col in _df.columns else pd.Series(default, index=_df.index)
+    
+    position = column('position', 'N/A').fillna('N/A').astype(str).to_numpy(dtype=object)
+    archetype = column('archetype', 'N/A').fillna('N/A').astype(str).to_numpy(dtype=object)
+    # int(safe_numeric(...)) semantics: NaN -> 0, then truncate
+    age = pd.to_numeric(column('age', 20), errors='coerce').fillna(0).to_numpy(dtype=float).astype(int)
+    rank = pd.to_numeric(column('final_rank', 30), errors='coerce').fillna(0).to_numpy(dtype=float).astype(int)
+    gen_prob = pd.to_numeric(column('final_gen_probability', 0.5), errors='coerce').fillna(0).to_numpy(dtype=float)
+    
+    result = score_historical_confidence(position, age, archetype, gen_prob, rank, load_historical_draft_data(),
+                                         get_outcome_cube())
+    
+    return pd.DataFrame({
+        'Name': column('name', 'Unknown').astype(str).to_numpy(),
+        'Position': position,
+        'Age': age,
+        'Archetype': archetype,
+        'AI Projection': gen_prob,
+        'Historical Confidence': result['confidence'],
+        'Confidence Level': result['level'],
+        'Key Factor': result['key_factor'],
+        **{factor: result['factors'][:, k] for k, factor in enumerate(CONFIDENCE_FACTORS)}
+    }, index=_df.index)
+
 def generate_comparison_insights(player_data: pd.Series, comp_info: dict, 
                                historical_comp: dict) -> List[str]:
     """Generate insights from historical comparison"""
@@ -4103,137 +6094,208 @@ def display_pending_comp_card(name: str):
     </div>
     """, unsafe_allow_html=True)
 
-def generate_enhanced_swot(player: pd.Series, scout_keywords: dict) -> Dict[str, List[str]]:
-    """Generate enhanced SWOT analysis using scout report intelligence"""
-    swot = {
-        'strengths': [],
-        'weaknesses': [],
-        'opportunities': [],
-        'threats': []
-    }
-    
-    # Extract stats
-    ppg = safe_numeric(player.get('ppg', 0))
-    rpg = safe_numeric(player.get('rpg', 0))
-    apg = safe_numeric(player.get('apg', 0))
-    spg = safe_numeric(player.get('spg', 0))
-    bpg = safe_numeric(player.get('bpg', 0))
-    three_pt = safe_numeric(player.get('three_pt_pct', 0))
-    ts_pct = safe_numeric(player.get('ts_pct', 0))
-    age = safe_numeric(player.get('age', 20))
-    position = safe_string(player.get('position', 'Unknown'))
-    archetype = safe_string(player.get('archetype', 'N/A'))
-    gen_prob = safe_numeric(player.get('final_gen_probability', 0.5))
+# ==================== SWOT en lot ====================
+# Every rule is a boolean mask over the whole class; text is only formatted for the rows displayed or exported
+SWOT_QUADRANTS = ('strengths', 'weaknesses', 'opportunities', 'threats')
+SWOT_INTANGIBLES = ('exceptional IQ', 'high motor', 'coachable', 'clutch')
+
+def get_swot_inputs(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Column arrays used by the SWOT rules, with the same defaults as safe_numeric/safe_string"""
+    def numeric(col: str, missing: float) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), missing, dtype=float)
+        return pd.to_numeric(df[col], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+    
+    def text(col: str, missing: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), missing, dtype=object)
+        return df[col].astype(object).where(df[col].notna(), 'N/A').astype(str).to_numpy(dtype=object)
+    
+    # Scout profile keywords: resolved once per distinct name
+    player_scout_profiles = get_reference_data('scout_profiles')
+    names = text('name', 'Unknown')
+    keywords = np.empty(len(df), dtype=object)
+    keywords[:] = [player_scout_profiles.get(name, player_scout_profiles['default']) for name in names]
     
-    # Simulated scout report keywords for each player (in production, parse actual reports)
-    player_scout_profiles = {
-        'Cooper Flagg': ['elite two-way', 'exceptional IQ', 'versatile', 'high motor', 'shot creation concerns'],
-        'Ace Bailey': ['elite scorer', 'exceptional range', 'clutch', 'inconsistent effort'],
-        'Dylan Harper': ['NBA-ready size', 'versatile guard', 'coachable', 'turnover prone'],
-        'default': ['solid fundamentals', 'room for growth']  # Changé de default: à 'default':
+    return {
+        'name': names,
+        'ppg': numeric('ppg', 0),
+        'apg': numeric('apg', 0),
+        'three_pt': numeric('three_pt_pct', 0),
+        'age': numeric('age', 20),
+        'gen_prob': numeric('final_gen_probability', 0.5),
+        'position': text('position', 'Unknown'),
+        'position_mask': get_position_masks(df),
+        'archetype': text('archetype', 'N/A'),
+        'keywords': keywords,
+        'keywords_text': np.array([str(list(k)) for k in keywords], dtype=object)
     }
-    
-    # Get player's scout keywords
-    player_name = safe_string(player.get('name', 'Unknown'))
-    player_keywords = player_scout_profiles.get(player_name, player_scout_profiles['default'])
-    
-    # Enhanced strengths based on stats AND scout reports
-    if ppg > 15:
-        if 'elite scorer' in player_keywords:
-            swot['strengths'].append(f"Elite scoring ability ({ppg:.1f} PPG) - scouts confirm 'elite scorer' designation")
-        else:
-            swot['strengths'].append(f"Strong scoring ability ({ppg:.1f} PPG) - proven offensive contributor")
-    
-    if three_pt > 0.38:
-        if 'exceptional range' in player_keywords:
-            swot['strengths'].append(f"Elite shooting ({three_pt:.1%} 3P%) - scouts note 'exceptional range'")
-        else:
-            swot['strengths'].append(f"Excellent shooting ({three_pt:.1%} 3P%) - immediate floor spacing")
-    
-    if 'exceptional IQ' in player_keywords or 'high motor' in player_keywords:
-        swot['strengths'].append("Intangibles: " + ", ".join([k for k in player_keywords if k in ['exceptional IQ', 'high motor', 'coachable', 'clutch']]))
-    
-    if apg > 5:
-        swot['strengths'].append(f"Elite playmaking ({apg:.1f} APG) - true floor general abilities")
-    
-    if 'versatile' in player_keywords:
-        swot['strengths'].append(f"Positional versatility - can play multiple positions effectively")
-    
-    # Enhanced weaknesses
-    if 'concerns' in str(player_keywords) or 'inconsistent' in str(player_keywords):
-        concern_keywords = [k for k in player_keywords if 'concern' in k or 'inconsistent' in k]
-        for concern in concern_keywords:
-            swot['weaknesses'].append(f"Scout concern: {concern}")
-    
-    if ppg < 10 and 'scorer' not in str(player_keywords):
-        swot['weaknesses'].append(f"Limited scoring output ({ppg:.1f} PPG) - needs offensive development")
-    
-    if three_pt < 0.30 and position in ['PG', 'SG', 'SF']:
-        swot['weaknesses'].append(f"Poor shooting ({three_pt:.1%} 3P%) - major concern for perimeter player")
-    
-    if age > 21:
-        swot['weaknesses'].append(f"Advanced age ({age:.0f}) - limited development window")
-    
-    # Enhanced opportunities based on archetype and scout profile
-    if archetype == 'Two-Way Wing':
-        swot['opportunities'].append("Two-way wings are the most valuable archetype in modern NBA")
-    
-    if 'high motor' in player_keywords or 'coachable' in player_keywords:
-        swot['opportunities'].append("Work ethic and coachability suggest continued improvement")
-    
-    if age < 20 and gen_prob > 0.6:
-        swot['opportunities'].append("Elite potential + youth = possible franchise cornerstone")
-    
-    swot['opportunities'].append(f"Historical success rate for {archetype} archetype: See Historical Intelligence tab")
-    
-    # Enhanced threats
-    if position == 'C' and three_pt < 0.25:
-        swot['threats'].append("Traditional big man skillset may limit minutes in pace-and-space era")
-    
-    if 'inconsistent' in str(player_keywords):
-        swot['threats'].append("Consistency issues noted by scouts - could affect role stability")
-    
-    if gen_prob > 0.7:
-        swot['threats'].append("Sky-high expectations as potential franchise player")
+
+def has_scout_keyword(inputs: Dict[str, np.ndarray], *keywords: str) -> np.ndarray:
+    """Players whose scout profile lists any of the keywords"""
+    return np.array([any(k in profile for k in keywords) for profile in inputs['keywords']], dtype=bool)
+
+def scout_text_contains(inputs: Dict[str, np.ndarray], fragment: str) -> np.ndarray:
+    """Players whose scout profile mentions the fragment anywhere"""
+    return pd.Series(inputs['keywords_text']).str.contains(fragment, regex=False).to_numpy()
+
+# (quadrant, condition over the whole class, text for one player i); order within a quadrant is display order
+SWOT_RULES: List[Tuple[str, Callable[[Dict], np.ndarray], Callable[[Dict, int], Any]]] = [
+    ('strengths', lambda x: (x['ppg'] > 15) & has_scout_keyword(x, 'elite scorer'),
+     lambda x, i: f"Elite scoring ability ({x['ppg'][i]:.1f} PPG) - scouts confirm 'elite scorer' designation"),
+    ('strengths', lambda x: (x['ppg'] > 15) & ~has_scout_keyword(x, 'elite scorer'),
+     lambda x, i: f"Strong scoring ability ({x['ppg'][i]:.1f} PPG) - proven offensive contributor"),
+    ('strengths', lambda x: (x['three_pt'] > 0.38) & has_scout_keyword(x, 'exceptional range'),
+     lambda x, i: f"Elite shooting ({x['three_pt'][i]:.1%} 3P%) - scouts note 'exceptional range'"),
+    ('strengths', lambda x: (x['three_pt'] > 0.38) & ~has_scout_keyword(x, 'exceptional range'),
+     lambda x, i: f"Excellent shooting ({x['three_pt'][i]:.1%} 3P%) - immediate floor spacing"),
+    ('strengths', lambda x: has_scout_keyword(x, 'exceptional IQ', 'high motor'),
+     lambda x, i: "Intangibles: " + ", ".join([k for k in x['keywords'][i] if k in SWOT_INTANGIBLES])),
+    ('strengths', lambda x: x['apg'] > 5,
+     lambda x, i: f"Elite playmaking ({x['apg'][i]:.1f} APG) - true floor general abilities"),
+    ('strengths', lambda x: has_scout_keyword(x, 'versatile'),
+     lambda x, i: "Positional versatility - can play multiple positions effectively"),
+    
+    ('weaknesses', lambda x: scout_text_contains(x, 'concerns') | scout_text_contains(x, 'inconsistent'),
+     lambda x, i: [f"Scout concern: {k}" for k in x['keywords'][i] if 'concern' in k or 'inconsistent' in k]),
+    ('weaknesses', lambda x: (x['ppg'] < 10) & ~scout_text_contains(x, 'scorer'),
+     lambda x, i: f"Limited scoring output ({x['ppg'][i]:.1f} PPG) - needs offensive development"),
+    ('weaknesses', lambda x: (x['three_pt'] < 0.30) & ((x['position_mask'] & position_mask(POSITION_GROUPS['Perimeter'])) != 0),
+     lambda x, i: f"Poor shooting ({x['three_pt'][i]:.1%} 3P%) - major concern for perimeter player"),
+    ('weaknesses', lambda x: x['age'] > 21,
+     lambda x, i: f"Advanced age ({x['age'][i]:.0f}) - limited development window"),
+    
+    ('opportunities', lambda x: x['archetype'] == 'Two-Way Wing',
+     lambda x, i: "Two-way wings are the most valuable archetype in modern NBA"),
+    ('opportunities', lambda x: has_scout_keyword(x, 'high motor', 'coachable'),
+     lambda x, i: "Work ethic and coachability suggest continued improvement"),
+    ('opportunities', lambda x: (x['age'] < 20) & (x['gen_prob'] > 0.6),
+     lambda x, i: "Elite potential + youth = possible franchise cornerstone"),
+    ('opportunities', lambda x: np.ones(len(x['name']), dtype=bool),
+     lambda x, i: f"Historical success rate for {x['archetype'][i]} archetype: See Historical Intelligence tab"),
+    
+    ('threats', lambda x: ((x['position_mask'] & POSITION_BITS['C']) != 0) & (x['three_pt'] < 0.25),
+     lambda x, i: "Traditional big man skillset may limit minutes in pace-and-space era"),
+    ('threats', lambda x: scout_text_contains(x, 'inconsistent'),
+     lambda x, i: "Consistency issues noted by scouts - could affect role stability"),
+    ('threats', lambda x: x['gen_prob'] > 0.7,
+     lambda x, i: "Sky-high expectations as potential franchise player"),
+]
+
+def evaluate_swot_rules(df: pd.DataFrame) -> Dict[str, Any]:
+    """Evaluate every SWOT rule for every player: a (rules x players) boolean matrix"""
+    inputs = get_swot_inputs(df)
+    masks = np.vstack([np.asarray(condition(inputs), dtype=bool) for _, condition, _ in SWOT_RULES]) \
+        if len(df) else np.zeros((len(SWOT_RULES), 0), dtype=bool)
+    rule_quadrants = np.array([quadrant for quadrant, _, _ in SWOT_RULES])
+    counts = {quadrant: masks[rule_quadrants == quadrant].sum(axis=0) for quadrant in SWOT_QUADRANTS}
+    return {'inputs': inputs, 'masks': masks, 'counts': counts}
+
+@st.cache_resource(max_entries=4)
+def get_swot_batch(_df: pd.DataFrame, dataset_version: str) -> Dict[str, Any]:
+    """SWOT rule matrix for the whole class, once per dataset version"""
+    return evaluate_swot_rules(_df)
+
+def assemble_swot(batch: Dict[str, Any], i: int) -> Dict[str, List[str]]:
+    """Format the SWOT text of player i from the precomputed rule matrix"""
+    inputs = batch['inputs']
+    swot = {quadrant: [] for quadrant in SWOT_QUADRANTS}
+    for rule_id in np.flatnonzero(batch['masks'][:, i]):
+        quadrant, _, text = SWOT_RULES[rule_id]
+        item = text(inputs, i)
+        swot[quadrant].extend(item if isinstance(item, list) else [item])
     
     # Ensure minimum content
     for category in swot:
         if not swot[category]:
-            swot[category].append(f"Standard {category} for {archetype} profile")
+            swot[category].append(f"Standard {category} for {inputs['archetype'][i]} profile")
     
     return swot
 
+def generate_enhanced_swot(player: pd.Series) -> Dict[str, List[str]]:
+    """Generate enhanced SWOT analysis using scout report intelligence"""
+    return assemble_swot(evaluate_swot_rules(player.to_frame().T), 0)
+
+@st.cache_data(show_spinner=False)
+def build_swot_export(_df: pd.DataFrame, dataset_version: str) -> pd.DataFrame:
+    """One row per SWOT item for every prospect, ready for CSV / Markdown export"""
+    batch = get_swot_batch(_df, dataset_version)
+    ranks = _df['final_rank'].to_numpy() if 'final_rank' in _df.columns else np.arange(1, len(_df) + 1)
+    records = []
+    for i in range(len(_df)):
+        for quadrant, items in assemble_swot(batch, i).items():
+            for item in items:
+                records.append({
+                    'final_rank': ranks[i],
+                    'name': batch['inputs']['name'][i],
+                    'position': batch['inputs']['position'][i],
+                    'quadrant': quadrant.title(),
+                    'item': item
+                })
+    return pd.DataFrame(records, columns=['final_rank', 'name', 'position', 'quadrant', 'item'])
+
+def format_swot_markdown(export_df: pd.DataFrame) -> str:
+    """Render the bulk SWOT export as a single Markdown report"""
+    lines = ["# NBA Draft 2025 - SWOT Report", ""]
+    for (rank, name, position), player_items in export_df.groupby(['final_rank', 'name', 'position'], sort=False):
+        lines.append(f"## #{rank:.0f} {name} ({position})")
+        for quadrant, quadrant_items in player_items.groupby('quadrant', sort=False):
+            lines.append(f"**{quadrant}**")
+            lines.extend(f"- {item}" for item in quadrant_items['item'])
+        lines.append("")
+    return "\n".join(lines)
+
 def create_swot_analysis(df: pd.DataFrame):
     """Create enhanced SWOT analysis with scout report integration"""
     st.markdown("## 📋 Enhanced SWOT Analysis 2.0")
     st.caption("Powered by scout report intelligence and historical patterns")
     
-    # Load scout keywords
-    scout_keywords = {
-        'positive': {
-            'elite': {'impact': 0.85, 'category': 'skill'},
-            'exceptional': {'impact': 0.80, 'category': 'skill'},
-            'nba-ready': {'impact': 0.75, 'category': 'readiness'},
-            'high motor': {'impact': 0.70, 'category': 'intangibles'},
-            'versatile': {'impact': 0.70, 'category': 'skill'},
-            'coachable': {'impact': 0.65, 'category': 'intangibles'},
-            'clutch': {'impact': 0.60, 'category': 'intangibles'}
-        }
-    }
+    dataset_version = get_dataset_version(df)
+    batch = get_swot_batch(df, dataset_version)
     
     selected_player = st.selectbox(
         "Select a player for detailed SWOT analysis:", 
-        df['name'].head(15).tolist(),
+        df['name'].tolist(),
         key="swot_player_select"
     )
     
-    player_data = df[df['name'] == selected_player].iloc[0]
+    player_pos = int(np.flatnonzero(df['name'].to_numpy() == selected_player)[0])
+    player_data = df.iloc[player_pos]
     
-    # Generate enhanced SWOT
-    swot = generate_enhanced_swot(player_data, scout_keywords)
+    # SWOT from the class-wide rule matrix
+    swot = assemble_swot(batch, player_pos)
     
     # Display enhanced SWOT with scout integration
     display_enhanced_swot_results(swot, selected_player, player_data)
+    
+    # Whole-class report
+    with st.expander("📦 SWOT for the whole class"):
+        balance_df = pd.DataFrame({
+            'Rank': df['final_rank'].to_numpy() if 'final_rank' in df.columns else np.arange(1, len(df) + 1),
+            'Player': batch['inputs']['name'],
+            'Position': batch['inputs']['position'],
+            **{quadrant.title(): batch['counts'][quadrant] for quadrant in SWOT_QUADRANTS}
+        })
+        st.dataframe(balance_df, use_container_width=True, hide_index=True, height=300)
+        
+        export_df = build_swot_export(df, dataset_version)
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                label="📥 Download SWOT (CSV)",
+                data=export_df.to_csv(index=False),
+                file_name="nba_draft_swot_report.csv",
+                mime="text/csv",
+                key="swot_export_csv"
+            )
+        with col2:
+            st.download_button(
+                label="📥 Download SWOT (Markdown)",
+                data=format_swot_markdown(export_df),
+                file_name="nba_draft_swot_report.md",
+                mime="text/markdown",
+                key="swot_export_md"
+            )
 
 def generate_player_swot(player: pd.Series) -> Dict[str, List[str]]:
     """Generate SWOT analysis for a player"""
@@ -4318,7 +6380,8 @@ def display_enhanced_swot_results(swot: Dict[str, List[str]], player_name: str,
         safe_string(player_data.get('archetype', 'N/A')),
         safe_numeric(player_data.get('final_gen_probability', 0.5)),
         int(safe_numeric(player_data.get('final_rank', 30))),
-        historical_data
+        historical_data,
+        get_outcome_cube()
     )
     
     # Display confidence badge
@@ -4549,7 +6612,7 @@ def display_enhanced_swot_summary(player_name: str, player_data: pd.Series,
         recommendation = f"**High-Risk, High-Reward:** {player_name} represents a boom-or-bust selection."
     
     st.markdown(recommendation)
-def display_footer():
+def display_footer(startup: Optional[Dict[str, Optional[float]]] = None):
     """Display application footer"""
     st.markdown("---")
     st.markdown("""
@@ -4558,6 +6621,13 @@ def display_footer():
         <small>Featuring 60 prospects with ML projections, 15 years of historical validation, and comprehensive team analysis</small>
     </div>
     """, unsafe_allow_html=True)
+    
+    if startup:
+        within_budget = startup['first_paint_ms'] <= startup['budget_ms']
+        st.caption(
+            f"{'⚡' if within_budget else '🐢'} Cold start {startup['first_paint_ms']:.0f} ms "
+            f"(budget {startup['budget_ms']:.0f} ms) • This run {startup['rerun_ms']:.0f} ms"
+        )
 
 # ==================== Run Application ====================
 if __name__ == "__main__":
@@ -0,0 +1,10 @@
+"""Helpers for command-line tools that import the dashboard module outside `streamlit run`."""
+from streamlit import config as streamlit_config, logger as streamlit_logger
+
+def quiet_streamlit():
+    """Silence Streamlit's bare-mode warnings (call before importing app).
+
+    The config is parsed first, since parsing it resets the log level."""
+    streamlit_config.get_config_options()
+    streamlit_config.set_option('global.showWarningOnDirectExecution', False)
+    streamlit_logger.set_log_level('error')
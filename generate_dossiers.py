@@ -0,0 +1,286 @@
+"""Batch generator for per-prospect scouting dossiers.
+
+Renders one self-contained HTML file per prospect (projection, comps, SWOT,
+team fits, historical confidence) using the same functions as the dashboard.
+Runs across a process pool and only rebuilds prospects whose data changed.
+
+    python generate_dossiers.py                  # incremental build into dossiers/
+    python generate_dossiers.py --force -j 8     # rebuild everything on 8 processes
+"""
+import os
+
+# The dashboard module is imported outside `streamlit run`: keep bare-mode warnings quiet
+import bare_mode
+bare_mode.quiet_streamlit()
+
+import argparse
+import hashlib
+import html
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Tuple, Any
+
+import pandas as pd
+
+import app
+
+DOSSIER_DIR = 'dossiers'
+MANIFEST_FILE = 'manifest.json'
+TOP_TEAM_FITS = 5
+
+# ==================== Empreintes ====================
+def get_code_version() -> str:
+    """Hash of the code that shapes a dossier: any change rebuilds every file"""
+    digest = hashlib.sha1()
+    for path in (app.__file__, __file__):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+def get_player_fingerprint(player: Dict[str, Any], code_version: str, historical_version: str) -> str:
+    """Fingerprint of everything a dossier depends on (historical_version: reference data + draft archive)"""
+    payload = json.dumps(player, sort_keys=True, default=str)
+    return hashlib.sha1(f"{code_version}|{historical_version}|{payload}".encode()).hexdigest()
+
+def get_dossier_filename(name: str, rank: float) -> str:
+    """Stable file name, e.g. 01_cooper_flagg.html"""
+    slug = re.sub(r'[^a-z0-9]+', '_', name.lower()).strip('_') or 'prospect'
+    return f"{int(rank):02d}_{slug}.html"
+
+def load_manifest(output_dir: str) -> Dict[str, Any]:
+    """Previous build manifest (empty when building for the first time)"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'dossiers': {}}
+
+# ==================== Contenu du dossier ====================
+def build_dossier_data(player: pd.Series) -> Dict[str, Any]:
+    """Collect projection, comps, SWOT, team fits and historical confidence for one prospect"""
+    name = app.safe_string(player.get('name'), 'Unknown')
+
+    comp_database = app.get_accurate_comparison_database()
+    comparison = comp_database.get(name) or app.generate_dynamic_comparison(player, comp_database)
+
+    team_fits = sorted(
+        ({'team': team, **app.calculate_player_team_fit(player, team_data)}
+         for team, team_data in app.NBA_TEAMS_ANALYSIS.items()),
+        key=lambda fit: fit['score'], reverse=True
+    )[:TOP_TEAM_FITS]
+
+    confidence = app.calculate_historical_confidence(
+        app.safe_string(player.get('position')),
+        int(app.safe_numeric(player.get('age', 20))),
+        app.safe_string(player.get('archetype', 'N/A')),
+        app.safe_numeric(player.get('final_gen_probability', 0.5)),
+        int(app.safe_numeric(player.get('final_rank', 30))),
+        app.load_historical_draft_data(),
+        app.get_outcome_cube()
+    )
+
+    return {
+        'name': name,
+        'projection': app.project_player_development(player, name),
+        'comparison': comparison,
+        'swot': app.generate_enhanced_swot(player),
+        'team_fits': team_fits,
+        'confidence': confidence
+    }
+
+def render_projection_svg(projection: Dict[str, Any], width: int = 560, height: int = 220) -> str:
+    """Inline SVG line chart of the PPG / RPG / APG projection"""
+    series = [('ppg', '#FF6B35'), ('rpg', '#4361EE'), ('apg', '#10B981')]
+    top = max(max(projection[stat]) for stat, _ in series) or 1.0
+    pad = 30
+
+    def point(i: int, value: float) -> str:
+        x = pad + i * (width - 2 * pad) / (len(projection['years']) - 1)
+        y = height - pad - value / top * (height - 2 * pad)
+        return f"{x:.1f},{y:.1f}"
+
+    lines = [
+        f'<polyline fill="none" stroke="{color}" stroke-width="3" '
+        f'points="{" ".join(point(i, v) for i, v in enumerate(projection[stat]))}"/>'
+        for stat, color in series
+    ]
+    labels = [
+        f'<text x="{point(i, 0).split(",")[0]}" y="{height - 8}" font-size="11" text-anchor="middle">Year {year}</text>'
+        for i, year in enumerate(projection['years'])
+    ]
+    legend = [
+        f'<text x="{pad + k * 70}" y="14" font-size="12" fill="{color}">{stat.upper()}</text>'
+        for k, (stat, color) in enumerate(series)
+    ]
+    return (f'<svg viewBox="0 0 {width} {height}" width="100%" role="img" aria-label="Projection">'
+            + ''.join(lines + labels + legend) + '</svg>')
+
+def render_dossier_html(player: pd.Series, data: Dict[str, Any]) -> str:
+    """Self-contained HTML dossier (inline CSS and SVG, no external assets)"""
+    e = lambda value: html.escape(str(value))
+    projection, comparison, confidence = data['projection'], data['comparison'], data['confidence']
+
+    stats = [('PPG', 'ppg', '{:.1f}'), ('RPG', 'rpg', '{:.1f}'), ('APG', 'apg', '{:.1f}'),
+             ('3P%', 'three_pt_pct', '{:.1%}'), ('TS%', 'ts_pct', '{:.1%}'), ('Age', 'age', '{:.0f}')]
+    stat_cells = ''.join(
+        f"<div class='stat'><div class='value'>{fmt.format(app.safe_numeric(player.get(col)))}</div>"
+        f"<div class='label'>{label}</div></div>"
+        for label, col, fmt in stats if col in player.index
+    )
+
+    projection_rows = ''.join(
+        f"<tr><td>Year {year}</td><td>{p:.1f}</td><td>{r:.1f}</td><td>{a:.1f}</td></tr>"
+        for year, p, r, a in zip(projection['years'], projection['ppg'], projection['rpg'], projection['apg'])
+    )
+
+    swot_colors = {'strengths': '#10B981', 'weaknesses': '#EF4444', 'opportunities': '#3B82F6', 'threats': '#F59E0B'}
+    swot_blocks = ''.join(
+        f"<div class='swot' style='border-color:{swot_colors[quadrant]}'><h3>{quadrant.title()}</h3><ul>"
+        + ''.join(f"<li>{e(item)}</li>" for item in items) + "</ul></div>"
+        for quadrant, items in data['swot'].items()
+    )
+
+    fit_rows = ''.join(
+        f"<tr><td>{e(fit['team'])}</td><td>{fit['score']:.0f}</td><td>{e(', '.join(fit['reasons']) or '-')}</td></tr>"
+        for fit in data['team_fits']
+    )
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{e(data['name'])} - NBA Draft 2025 Dossier</title>
+<style>
+  body {{ font-family: -apple-system, 'Segoe UI', Roboto, sans-serif; max-width: 960px; margin: 2rem auto; color: #1f2937; }}
+  .hero {{ background: linear-gradient(135deg, #FF6B35, #F7931E); color: white; padding: 1.5rem 2rem; border-radius: 15px; }}
+  .hero h1 {{ margin: 0; }}
+  .stats {{ display: flex; gap: 1rem; flex-wrap: wrap; margin: 1.5rem 0; }}
+  .stat {{ flex: 1; min-width: 90px; text-align: center; background: #f3f4f6; border-radius: 10px; padding: 0.8rem; }}
+  .stat .value {{ font-size: 1.4rem; font-weight: 700; }}
+  .stat .label {{ font-size: 0.8rem; color: #6b7280; }}
+  h2 {{ border-bottom: 2px solid #FF6B35; padding-bottom: 0.3rem; margin-top: 2rem; }}
+  table {{ width: 100%; border-collapse: collapse; }}
+  th, td {{ text-align: left; padding: 0.4rem 0.6rem; border-bottom: 1px solid #e5e7eb; }}
+  .grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 1rem; }}
+  .swot {{ border-left: 4px solid; background: #f9fafb; border-radius: 8px; padding: 0.5rem 1rem; }}
+  .swot h3 {{ margin: 0.3rem 0; }}
+  .badge {{ display: inline-block; background: #111827; color: white; border-radius: 999px; padding: 0.2rem 0.8rem; }}
+  footer {{ margin-top: 2rem; font-size: 0.8rem; color: #6b7280; text-align: center; }}
+</style>
+</head>
+<body>
+<div class="hero">
+  <h1>#{app.safe_numeric(player.get('final_rank')):.0f} {e(data['name'])}</h1>
+  <div>{e(app.safe_string(player.get('position')))} • {e(app.safe_string(player.get('college')))} •
+       {e(app.safe_string(player.get('archetype')))} • Scout grade {e(app.safe_string(player.get('scout_grade')))}</div>
+</div>
+<div class="stats">{stat_cells}</div>
+
+<h2>🔮 5-Year Projection</h2>
+{render_projection_svg(projection)}
+<table><tr><th>Season</th><th>PPG</th><th>RPG</th><th>APG</th></tr>{projection_rows}</table>
+<p>All-Star probability <strong>{projection['all_star_prob']:.0f}%</strong> •
+   MVP candidate chance <strong>{projection['mvp_prob']:.0f}%</strong> •
+   Projected peak <strong>Year {projection['peak_year']}</strong></p>
+
+<h2>🎯 Historical Comparison</h2>
+<p><strong>{e(comparison.get('primary_comp', 'N/A'))}</strong> / {e(comparison.get('secondary_comp', 'N/A'))}
+   • Similarity {app.safe_numeric(comparison.get('similarity')):.0%}</p>
+<p>{e(comparison.get('reasoning', ''))}</p>
+<p><em>{e(comparison.get('career_path', ''))}</em></p>
+
+<h2>📋 SWOT</h2>
+<div class="grid">{swot_blocks}</div>
+
+<h2>🏀 Best Team Fits</h2>
+<table><tr><th>Team</th><th>Fit</th><th>Why</th></tr>{fit_rows}</table>
+
+<h2>📊 Historical Confidence</h2>
+<p><span class="badge">{e(confidence['score'])}</span> {e(confidence['level'])} • Key factor: {e(confidence['key_factor'])}</p>
+
+<footer>NBA Draft 2025 AI Dashboard • Generated {time.strftime('%Y-%m-%d %H:%M')}</footer>
+</body>
+</html>
+"""
+
+def write_dossier(task: Tuple[Dict[str, Any], str]) -> Tuple[str, str]:
+    """Worker: render one dossier to disk and return (name, path)"""
+    player_record, path = task
+    player = pd.Series(player_record)
+    content = render_dossier_html(player, build_dossier_data(player))
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    return player_record.get('name', 'Unknown'), path
+
+def write_index(output_dir: str, entries: List[Dict[str, Any]]):
+    """Index page linking every dossier"""
+    rows = ''.join(
+        f"<li><a href='{html.escape(entry['file'])}'>#{entry['rank']:.0f} {html.escape(entry['name'])}</a></li>"
+        for entry in sorted(entries, key=lambda entry: entry['rank'])
+    )
+    with open(os.path.join(output_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>NBA Draft 2025 Dossiers</title></head>"
+                f"<body style='font-family: sans-serif;'><h1>🏀 NBA Draft 2025 Dossiers</h1><ol>{rows}</ol></body></html>")
+
+# ==================== Pipeline ====================
+def generate_dossiers(output_dir: str = DOSSIER_DIR, workers: int = None, force: bool = False) -> Dict[str, int]:
+    """Render every prospect whose fingerprint changed since the last build"""
+    os.makedirs(output_dir, exist_ok=True)
+    df = app.load_data()
+    manifest = load_manifest(output_dir)
+    code_version = get_code_version()
+    historical_version = app.get_historical_version()
+
+    tasks, entries, dossiers = [], [], {}
+    for record in df.to_dict(orient='records'):
+        name = app.safe_string(record.get('name'), 'Unknown')
+        rank = app.safe_numeric(record.get('final_rank'))
+        filename = get_dossier_filename(name, rank)
+        path = os.path.join(output_dir, filename)
+        fingerprint = get_player_fingerprint(record, code_version, historical_version)
+
+        dossiers[name] = {'file': filename, 'fingerprint': fingerprint}
+        entries.append({'name': name, 'rank': rank, 'file': filename})
+        previous = manifest['dossiers'].get(name, {})
+        if force or previous.get('fingerprint') != fingerprint or not os.path.exists(path):
+            tasks.append((record, path))
+
+    # Dossiers of prospects no longer in the dataset (or renamed files)
+    current_files = {entry['file'] for entry in dossiers.values()}
+    removed = 0
+    for previous in manifest['dossiers'].values():
+        stale_path = os.path.join(output_dir, previous['file'])
+        if previous['file'] not in current_files and os.path.exists(stale_path):
+            os.remove(stale_path)
+            removed += 1
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(write_dossier, task) for task in tasks]
+            for future in as_completed(futures):
+                name, path = future.result()
+                print(f"  ✓ {name} → {path}")
+
+    write_index(output_dir, entries)
+    with open(os.path.join(output_dir, MANIFEST_FILE), 'w', encoding='utf-8') as f:
+        json.dump({'code_version': code_version, 'historical_version': historical_version,
+                   'dataset_version': app.get_dataset_version(df), 'dossiers': dossiers}, f, indent=2)
+
+    return {'built': len(tasks), 'unchanged': len(entries) - len(tasks), 'removed': removed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate HTML scouting dossiers for every prospect")
+    parser.add_argument('-o', '--output', default=DOSSIER_DIR, help="output directory (default: dossiers/)")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--force', action='store_true', help="rebuild every dossier, even unchanged ones")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = generate_dossiers(args.output, args.workers, args.force)
+    print(f"🏀 {summary['built']} built, {summary['unchanged']} unchanged, {summary['removed']} removed "
+          f"in {time.perf_counter() - started:.1f}s → {args.output}/index.html")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Weight-search optimizer for the dashboard's scoring formulas.
+
+Fits the coefficients of every formula in app.SCORING_FORMULAS (historical draft
+score, immediate impact, steal score) with random and grid search. Candidate
+weight sets are scored in vectorized batches across a process pool with k-fold
+cross-validation, and the best sets are written to models/formula_weights.json,
+where the Model Lab shows them next to the original coefficients.
+
+There are no career outcomes in the data yet, so the default target is the actual
+board (`rank`, lower is better). Any column can be used instead with --target.
+Against the board, the steal score's rank discount is left out of the fit and the
+board-derived Potential term (final_gen_probability) keeps its default weight, since
+both are computed from the ranking being predicted.
+
+    python optimize_weights.py                                  # every formula, rank target
+    python optimize_weights.py -f steal_score --random 20000 -j 8
+    python optimize_weights.py --data archive.csv --target career_ws --higher-is-better
+"""
+import os
+
+# The dashboard module is imported outside `streamlit run`: keep bare-mode warnings quiet
+import bare_mode
+bare_mode.quiet_streamlit()
+
+import argparse
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+import pandas as pd
+
+import app
+
+DEFAULT_TARGET = 'rank'
+DEFAULT_RANDOM_CANDIDATES = 5000
+GRID_LEVELS = (0.5, 1.0, 1.5)
+# Random candidates draw each weight as default x U(0, MAX_MULTIPLIER)
+MAX_MULTIPLIER = 2.5
+CHUNK_SIZE = 1000
+TOP_WEIGHT_SETS = 5
+# Targets that are the board itself: a row scale computed from the rank (the steal score's
+# rank discount) would already order the rows, so formulas are fitted on their terms alone
+BOARD_TARGETS = ('rank', 'final_rank')
+# Terms derived from the board (final_gen_probability tracks rank at Spearman ~ -0.98): against a
+# board target they would take all the weight, so they keep their default and are left out of the fit
+BOARD_DERIVED_TERMS = ('gen_prob',)
+
+# ==================== Données ====================
+def load_dataset(paths: Optional[List[str]] = None) -> pd.DataFrame:
+    """The dashboard's dataset, or the given CSV files (e.g. archive classes) cleaned the same way"""
+    if not paths:
+        return app.load_data()
+    return app.clean_dataframe(pd.concat([pd.read_csv(path) for path in paths], ignore_index=True))
+
+def make_folds(n_rows: int, n_folds: int, seed: int) -> List[np.ndarray]:
+    """Shuffled k-fold split of row positions"""
+    return np.array_split(np.random.default_rng(seed).permutation(n_rows), n_folds)
+
+# ==================== Candidats ====================
+def random_candidates(defaults: np.ndarray, count: int, seed: int) -> np.ndarray:
+    """Weight sets around the defaults (each weight scaled by U(0, MAX_MULTIPLIER))"""
+    rng = np.random.default_rng(seed)
+    return defaults * rng.uniform(0, MAX_MULTIPLIER, size=(count, len(defaults)))
+
+def grid_candidates(defaults: np.ndarray, levels: Tuple[float, ...] = GRID_LEVELS) -> np.ndarray:
+    """Every combination of per-weight multipliers"""
+    return defaults * np.array(list(itertools.product(levels, repeat=len(defaults))))
+
+# ==================== Évaluation ====================
+def column_ranks(values: np.ndarray) -> np.ndarray:
+    """Ordinal rank of every row within each column"""
+    ranks = np.empty_like(values, dtype=float)
+    order = np.argsort(values, axis=0, kind='stable')
+    np.put_along_axis(ranks, order, np.arange(len(values), dtype=float)[:, None], axis=0)
+    return ranks
+
+def spearman_columns(scores: np.ndarray, target_rank: np.ndarray) -> np.ndarray:
+    """Spearman correlation of every candidate column with the target ranks"""
+    ranks = column_ranks(scores)
+    ranks -= ranks.mean(axis=0)
+    target = target_rank - target_rank.mean()
+    denominator = np.sqrt((ranks ** 2).sum(axis=0) * (target ** 2).sum())
+    return np.divide(target @ ranks, denominator, out=np.zeros(ranks.shape[1]), where=denominator > 0)
+
+def evaluate_chunk(task: Tuple[Dict[str, Any], np.ndarray, List[np.ndarray], np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    """Held-out and training Spearman of a chunk of candidates on every fold (folds x candidates)"""
+    matrix, target_rank, folds, W = task
+    scores = app.formula_scores(matrix, W)
+    held_out, training = [], []
+    for fold in folds:
+        train = np.setdiff1d(np.arange(len(target_rank)), fold)
+        held_out.append(spearman_columns(scores[fold], target_rank[fold]))
+        training.append(spearman_columns(scores[train], target_rank[train]))
+    return np.array(held_out), np.array(training)
+
+def normalize_weights(weights: np.ndarray, defaults: np.ndarray, X: np.ndarray) -> np.ndarray:
+    """Rescale a weight set to the default's overall magnitude (rank metrics ignore positive scale)"""
+    spread = X.std(axis=0) if len(X) > 1 else np.ones(X.shape[1])
+    current, reference = np.abs(weights * spread).sum(), np.abs(defaults * spread).sum()
+    return weights * (reference / current) if current > 0 else weights
+
+# ==================== Recherche ====================
+def optimize_formula(df: pd.DataFrame, formula: str, target: str, higher_is_better: bool,
+                     n_random: int, n_folds: int, seed: int, workers: Optional[int]) -> Dict[str, Any]:
+    """Random + grid search for one formula, cross-validated against the target column"""
+    matrix = app.formula_matrix(df, formula)
+    values = pd.to_numeric(df[target], errors='coerce').to_numpy(dtype=float)
+    valid = ~np.isnan(values)
+    use_row_scale = target not in BOARD_TARGETS
+    terms = matrix['terms']
+    frozen = [term for term in terms if term in BOARD_DERIVED_TERMS] if target in BOARD_TARGETS else []
+    fitted = np.array([term not in frozen for term in terms])
+    matrix = {**matrix, 'X': matrix['X'][valid][:, fitted],
+              'row_scale': matrix['row_scale'][valid] if use_row_scale else np.ones(int(valid.sum()))}
+    # Higher score should mean better prospect: rank the target so that better = higher rank
+    target_rank = column_ranks((values[valid] if higher_is_better else -values[valid])[:, None])[:, 0]
+    folds = make_folds(int(valid.sum()), n_folds, seed)
+
+    all_defaults = app.formula_weight_vector(formula)
+    defaults = all_defaults[fitted]
+    candidates = np.vstack([defaults[None, :], grid_candidates(defaults), random_candidates(defaults, n_random, seed)])
+    chunks = [candidates[i:i + CHUNK_SIZE] for i in range(0, len(candidates), CHUNK_SIZE)]
+    tasks = [(matrix, target_rank, folds, chunk) for chunk in chunks]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(evaluate_chunk, tasks))
+    held_out = np.hstack([r[0] for r in results])
+    training = np.hstack([r[1] for r in results])
+
+    cv_mean, cv_std = held_out.mean(axis=0), held_out.std(axis=0)
+    # Honest estimate of the search itself: pick on each training split, score on its held-out fold
+    selected = training.argmax(axis=1)
+    nested_cv = float(held_out[np.arange(len(folds)), selected].mean())
+
+    def weight_set(i: int) -> Dict[str, Any]:
+        weights = all_defaults.copy()
+        weights[fitted] = normalize_weights(candidates[i], defaults, matrix['X'])
+        return {'weights': {term: round(float(w), 4) for term, w in zip(terms, weights)},
+                'cv_mean': round(float(cv_mean[i]), 4), 'cv_std': round(float(cv_std[i]), 4)}
+
+    top = np.argsort(-cv_mean, kind='stable')[:TOP_WEIGHT_SETS]
+    return {
+        'candidates': int(len(candidates)),
+        'row_scale': use_row_scale,
+        'frozen_terms': frozen,
+        'default': weight_set(0),
+        'best': weight_set(int(top[0])),
+        'top': [weight_set(int(i)) for i in top],
+        'nested_cv': round(nested_cv, 4)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the scoring formula weights with cross-validated random + grid search")
+    parser.add_argument('-f', '--formula', action='append', choices=list(app.SCORING_FORMULAS),
+                        help="formula to fit (repeatable; default: all)")
+    parser.add_argument('--data', nargs='+', help="CSV files to fit on (default: the dashboard's dataset)")
+    parser.add_argument('--target', default=DEFAULT_TARGET, help=f"target column (default: {DEFAULT_TARGET})")
+    parser.add_argument('--higher-is-better', action='store_true', help="larger target values are better outcomes")
+    parser.add_argument('--random', type=int, default=DEFAULT_RANDOM_CANDIDATES, help="random candidates per formula")
+    parser.add_argument('--folds', type=int, default=5, help="cross-validation folds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('-o', '--output', default=app.FORMULA_WEIGHTS_PATH, help="output JSON")
+    args = parser.parse_args()
+
+    df = load_dataset(args.data)
+    if args.target not in df.columns:
+        parser.error(f"target column {args.target!r} not in the data")
+
+    output = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'dataset_version': app.get_dataset_version(df),
+        'rows': int(len(df)),
+        'target': args.target,
+        'higher_is_better': args.higher_is_better,
+        'folds': args.folds,
+        'formulas': {}
+    }
+    for formula in args.formula or list(app.SCORING_FORMULAS):
+        started = time.perf_counter()
+        result = optimize_formula(df, formula, args.target, args.higher_is_better,
+                                  args.random, args.folds, args.seed, args.workers)
+        output['formulas'][formula] = result
+        print(f"🎚️ {formula}: {result['candidates']} candidates in {time.perf_counter() - started:.1f}s • "
+              f"CV Spearman default {result['default']['cv_mean']:.3f} → best {result['best']['cv_mean']:.3f} "
+              f"(nested {result['nested_cv']:.3f})"
+              + (f" • kept at default: {', '.join(result['frozen_terms'])}" if result['frozen_terms'] else ""))
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"→ {args.output}")
+
+if __name__ == "__main__":
+    main()
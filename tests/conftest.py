@@ -0,0 +1,35 @@
+"""Test setup: import the dashboard module from the repository root, without bare-mode noise."""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bare_mode
+bare_mode.quiet_streamlit()
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+@pytest.fixture(scope='session')
+def archive_frame() -> pd.DataFrame:
+    """Synthetic archive in read_archive_files' shape: combo and alias positions, missing ages, archetypes and outcomes"""
+    rng = np.random.default_rng(7)
+    n = 1200
+    frame = pd.DataFrame({
+        'year': rng.integers(1990, 2020, n),
+        'pick': rng.integers(1, 61, n),
+        'name': [f"Prospect {i}" for i in range(n)],
+        'position': rng.choice(['PG', 'SG', 'SF', 'PF', 'C', 'PG/SG', 'SF-PF', 'PF/C', 'G', 'F', ''], n),
+        'age': np.where(rng.random(n) < 0.05, np.nan, rng.uniform(17, 25, n)),
+        'archetype': rng.choice(['Floor General', 'Two-Way Wing', 'Rim Protector', None], n),
+        'outcome': rng.choice(list(app.ARCHIVE_OUTCOMES) + [None], n)
+    })
+    return (frame.drop_duplicates(['year', 'pick'], keep='last')
+            .sort_values(['year', 'pick'], kind='stable').reset_index(drop=True))
+
+@pytest.fixture(scope='session')
+def draft_archive(archive_frame) -> dict:
+    return app.build_draft_archive(archive_frame)
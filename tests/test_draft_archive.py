@@ -0,0 +1,64 @@
+"""Archive queries (sorted indexes, position posting lists, archetype lists) against a brute-force filter."""
+import numpy as np
+import pytest
+
+import app
+
+def listed_positions(position: str) -> set:
+    """Base positions of a raw position string, expanded by hand (aliases included)"""
+    bases = set()
+    for token in app.POSITION_SEPARATORS.split(position):
+        token = token.strip().upper()
+        bases.update(app.POSITION_ALIASES.get(token, (token,)))
+    return bases & set(app.POSITION_BITS)
+
+def random_query(rng: np.random.Generator) -> dict:
+    query = {}
+    if rng.random() < 0.5:
+        lo = int(rng.integers(1988, 2021))
+        query['year'] = (lo, lo + int(rng.integers(0, 10)))
+    if rng.random() < 0.5:
+        lo = int(rng.integers(1, 61))
+        query['pick'] = (lo, None) if rng.random() < 0.2 else (lo, lo + int(rng.integers(0, 20)))
+    if rng.random() < 0.4:
+        lo = float(rng.uniform(16.5, 24))
+        query['age'] = (None, lo) if rng.random() < 0.2 else (lo, lo + float(rng.uniform(0, 3)))
+    if rng.random() < 0.5:
+        query['position'] = [
+            'PG', 'C', 'G', 'Bigs', 'Perimeter', ['SF', 'PF'], ['PG', 'F']
+        ][int(rng.integers(0, 7))]
+    if rng.random() < 0.5:
+        query['archetype'] = [
+            'Floor General', 'Rim Protector', ['Two-Way Wing', 'Floor General'], 'Unknown archetype'
+        ][int(rng.integers(0, 4))]
+    return query
+
+def brute_force_rows(frame, query: dict) -> np.ndarray:
+    keep = np.ones(len(frame), dtype=bool)
+    for col in ('year', 'pick', 'age'):
+        if col in query:
+            lo, hi = query[col]
+            values = frame[col].to_numpy(dtype=float)
+            keep &= ~np.isnan(values)
+            if lo is not None:
+                keep &= values >= lo
+            if hi is not None:
+                keep &= values <= hi
+    if 'position' in query:
+        wanted = query['position']
+        wanted = app.POSITION_GROUPS.get(wanted, (wanted,)) if isinstance(wanted, str) else wanted
+        bases = set().union(*(listed_positions(p) for p in wanted))
+        keep &= np.array([bool(listed_positions(p) & bases) for p in frame['position'].fillna('')])
+    if 'archetype' in query:
+        names = [query['archetype']] if isinstance(query['archetype'], str) else query['archetype']
+        keep &= frame['archetype'].isin(names).to_numpy()
+    return np.flatnonzero(keep)
+
+@pytest.mark.parametrize('seed', range(300))
+def test_query_matches_brute_force(archive_frame, draft_archive, seed):
+    query = random_query(np.random.default_rng(seed))
+    rows = app.query_draft_archive(draft_archive, **query)
+    np.testing.assert_array_equal(rows, brute_force_rows(archive_frame, query))
+
+def test_no_filter_returns_every_row(draft_archive):
+    np.testing.assert_array_equal(app.query_draft_archive(draft_archive), np.arange(draft_archive['rows']))
@@ -0,0 +1,71 @@
+"""Outcome cube slices and roll-ups against pandas groupbys over the picks."""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app
+
+MEASURES = ['picks', 'all_star', 'starter', 'bust']
+
+@pytest.fixture(scope='module')
+def picks(draft_archive) -> pd.DataFrame:
+    """Labeled picks with the cube's buckets, one row per pick (positions as a list)"""
+    frame = app.archive_frame(draft_archive)
+    frame['positions'] = [app.decode_positions(mask) for mask in draft_archive['columns']['position_mask']]
+    frame = frame[frame['outcome'].notna()].copy()
+    age = frame['age'].astype(float)
+    frame['age'] = [None if np.isnan(a) else str(int(min(max(np.floor(a), 18), 23))) for a in age]
+    frame['pick_range'] = [next((key for key, (lo, hi) in app.CUBE_PICK_RANGES.items() if lo <= pick <= hi), None)
+                           for pick in frame['pick']]
+    frame['picks'] = 1
+    frame['all_star'] = (frame['outcome'] == 'All-Star').astype(int)
+    frame['starter'] = frame['outcome'].isin(['Starter', 'All-Star']).astype(int)
+    frame['bust'] = (frame['outcome'] == 'Bust').astype(int)
+    return frame
+
+def expected_counts(picks: pd.DataFrame, by: list) -> pd.DataFrame:
+    # A combo position counts under each of its positions, but only when grouping on position
+    rows = picks.explode('positions').assign(position=lambda f: f['positions']) if 'position' in by else picks
+    if not by:
+        return rows[MEASURES].sum().to_frame().T
+    return rows.groupby(by)[MEASURES].sum()
+
+@pytest.fixture(scope='module')
+def cube(draft_archive) -> dict:
+    return app.build_outcome_cube(draft_archive)
+
+@pytest.mark.parametrize('by', [list(dims) for r in range(5) for dims in itertools.combinations(app.CUBE_DIMENSIONS, r)])
+def test_groupings_match_groupby(cube, picks, by):
+    result = app.cube_query(cube, by)
+    expected = expected_counts(picks, by)
+    if by:
+        cube_result = result.set_index(by)[MEASURES]
+        # The cube lists every combination (those without picks are zeros) and misses none
+        expected = expected.reindex(cube_result.index, fill_value=0)
+        assert int(expected['picks'].sum()) == int(expected_counts(picks, by)['picks'].sum())
+    else:
+        cube_result = result[MEASURES]
+    np.testing.assert_array_equal(cube_result.to_numpy(), expected.to_numpy())
+
+def test_position_roll_up_counts_each_pick_once(cube, picks):
+    assert (picks['positions'].map(len) > 1).any()
+    total = app.cube_query(cube)
+    assert int(total['picks'].iloc[0]) == len(picks)
+    # Per-position slices over-count combo picks; the roll-up must not
+    by_position = app.cube_query(cube, ['position'])
+    assert int(by_position['picks'].sum()) == int(picks['positions'].map(len).sum())
+
+@pytest.mark.parametrize('position', list(app.POSITION_BITS))
+def test_position_slices(cube, picks, position):
+    result = app.cube_query(cube, ['archetype'], position=position).set_index('archetype')[MEASURES]
+    holders = picks[picks['positions'].map(lambda positions: position in positions)]
+    expected = holders.groupby('archetype')[MEASURES].sum().reindex(result.index, fill_value=0)
+    np.testing.assert_array_equal(result.to_numpy(), expected.to_numpy())
+
+def test_rates_are_counts_over_picks(cube):
+    result = app.cube_query(cube, ['archetype', 'pick_range'])
+    populated = result[result['picks'] > 0]
+    np.testing.assert_allclose(populated['starter_rate'], populated['starter'] / populated['picks'])
+    assert result.loc[result['picks'] == 0, 'starter_rate'].isna().all()
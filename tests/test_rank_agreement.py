@@ -0,0 +1,51 @@
+"""Kendall tau-b (merge-sort inversion count) against a brute-force pair count."""
+import itertools
+
+import numpy as np
+import pytest
+
+import app
+
+def brute_force_inversions(values: np.ndarray) -> int:
+    return sum(1 for i, j in itertools.combinations(range(len(values)), 2) if values[i] > values[j])
+
+def brute_force_tau_b(x: np.ndarray, y: np.ndarray) -> float:
+    concordant = discordant = x_ties = y_ties = 0
+    for i, j in itertools.combinations(range(len(x)), 2):
+        dx, dy = np.sign(x[i] - x[j]), np.sign(y[i] - y[j])
+        if dx == 0 and dy == 0:
+            continue
+        if dx == 0:
+            x_ties += 1
+        elif dy == 0:
+            y_ties += 1
+        elif dx == dy:
+            concordant += 1
+        else:
+            discordant += 1
+    denominator = np.sqrt(float(concordant + discordant + x_ties) * float(concordant + discordant + y_ties))
+    return (concordant - discordant) / denominator if denominator > 0 else float('nan')
+
+@pytest.mark.parametrize('seed', range(200))
+def test_kendall_tau_matches_brute_force_with_ties(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(2, 40))
+    # Few distinct values, so both columns have ties and joint ties
+    x = rng.integers(0, int(rng.integers(1, 8)), n).astype(float)
+    y = rng.integers(0, int(rng.integers(1, 8)), n).astype(float)
+    expected = brute_force_tau_b(x, y)
+    if np.isnan(expected):
+        assert np.isnan(app.kendall_tau(x, y))
+    else:
+        assert app.kendall_tau(x, y) == pytest.approx(expected)
+
+@pytest.mark.parametrize('seed', range(20))
+def test_count_inversions_matches_brute_force(seed):
+    values = np.random.default_rng(seed).integers(0, 10, 57).astype(float)
+    assert app.count_inversions(values) == brute_force_inversions(values)
+
+def test_kendall_tau_extremes():
+    x = np.arange(10, dtype=float)
+    assert app.kendall_tau(x, x) == pytest.approx(1.0)
+    assert app.kendall_tau(x, -x) == pytest.approx(-1.0)
+    assert np.isnan(app.kendall_tau(x, np.ones(10)))